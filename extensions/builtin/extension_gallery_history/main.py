@@ -10,6 +10,7 @@ from tts_webui.history_tab.collections_directories_atom import (
 from tts_webui.history_tab.delete_generation_cb import delete_generation_cb
 from tts_webui.history_tab.save_to_favorites import save_to_collection, save_to_favorites
 from tts_webui.utils.open_folder import open_folder
+from tts_webui.utils.output_watcher import refresh_on_output_change
 
 
 import glob
@@ -206,6 +207,13 @@ def history_content(directory, show_collections):
         outputs=[history_list_as_gallery],
     )
 
+    refresh_on_output_change(
+        fn=update_history_tab,
+        directory=directory_dropdown,
+        inputs=[directory_dropdown],
+        outputs=[history_list_as_gallery],
+    )
+
 
 def save_to_collection_ui(
     directory: str,
@@ -9,12 +9,18 @@ from tts_webui.history_tab.collections_directories_atom import (
     get_collections,
 )
 from tts_webui.history_tab.get_wav_files import get_wav_files
+from tts_webui.history_tab.history_index import (
+    DEFAULT_PAGE_SIZE,
+    SORT_ORDERS,
+    get_history_index,
+)
 from tts_webui.history_tab.delete_generation_cb import delete_generation_cb
 from tts_webui.history_tab.save_to_favorites import (
     save_to_collection,
     save_to_favorites,
 )
 from tts_webui.utils.open_folder import open_folder
+from tts_webui.utils.output_watcher import refresh_on_output_change
 
 
 def _get_row_index(evt: gr.SelectData):
@@ -107,6 +113,25 @@ def history_content(directory, history_tab, show_collections):
                 headers=headers,
                 max_height=800,
             )
+            with gr.Row():
+                history_sort = gr.Dropdown(
+                    choices=list(SORT_ORDERS),
+                    value=SORT_ORDERS[0],
+                    show_label=False,
+                    container=False,
+                    scale=2,
+                )
+                previous_page = gr.Button(value="Previous", size="sm", scale=1)
+                history_page = gr.Number(
+                    value=1,
+                    precision=0,
+                    minimum=1,
+                    show_label=False,
+                    container=False,
+                    scale=1,
+                )
+                next_page = gr.Button(value="Next", size="sm", scale=1)
+                history_page_info = gr.Markdown()
 
         with gr.Column():
             history_bundle_name = gr.Markdown(visible=True)
@@ -198,8 +223,20 @@ def history_content(directory, history_tab, show_collections):
         preprocess=False,
     )
 
-    def update_history_tab(directory: str):
-        return gr.Dataframe(value=get_wav_files(directory))
+    def update_history_tab(directory: str, page=1, sort=SORT_ORDERS[0], force=False):
+        index = get_history_index(directory)
+        if force:
+            index.refresh(force=True)
+        rows, pages = index.page(int(page or 1), DEFAULT_PAGE_SIZE, sort)
+        page = min(max(1, int(page or 1)), pages)
+        return [
+            gr.Dataframe(value=rows),
+            gr.Number(value=page, maximum=pages),
+            f"Page {page} of {pages} ({len(index)} generations)",
+        ]
+
+    page_inputs = [directory_dropdown, history_page, history_sort]
+    page_outputs = [history_list, history_page, history_page_info]
 
     delete_from_history.click(
         fn=clear_audio,
@@ -207,9 +244,9 @@ def history_content(directory, history_tab, show_collections):
     )
     delete_from_history.click(
         fn=delete_generation_cb(update_history_tab),
-        inputs=[folder_root, directory_dropdown],
+        inputs=[folder_root, *page_inputs],
         # outputs=[history_list, history_list_as_gallery],
-        outputs=[history_list],
+        outputs=page_outputs,
     )
     # API ONLY
     gr.Button(
@@ -222,19 +259,55 @@ def history_content(directory, history_tab, show_collections):
     )
     history_tab.select(
         fn=update_history_tab,
-        inputs=[directory_dropdown],
+        inputs=page_inputs,
         # outputs=[history_list, history_list_as_gallery],
-        outputs=[history_list],
+        outputs=page_outputs,
     )
 
     directory_dropdown.change(
-        fn=update_history_tab,
-        inputs=[directory_dropdown],
+        fn=lambda x, sort: update_history_tab(x, 1, sort),
+        inputs=[directory_dropdown, history_sort],
         # outputs=[history_list, history_list_as_gallery],
-        outputs=[history_list],
+        outputs=page_outputs,
+    )
+    history_sort.change(
+        fn=lambda x, sort: update_history_tab(x, 1, sort),
+        inputs=[directory_dropdown, history_sort],
+        outputs=page_outputs,
+    )
+    history_page.submit(
+        fn=update_history_tab,
+        inputs=page_inputs,
+        outputs=page_outputs,
+    )
+    previous_page.click(
+        fn=lambda x, page, sort: update_history_tab(x, (page or 1) - 1, sort),
+        inputs=page_inputs,
+        outputs=page_outputs,
+    )
+    next_page.click(
+        fn=lambda x, page, sort: update_history_tab(x, (page or 1) + 1, sort),
+        inputs=page_inputs,
+        outputs=page_outputs,
+    )
+
+    refresh_on_output_change(
+        fn=update_history_tab,
+        directory=directory_dropdown,
+        inputs=page_inputs,
+        outputs=page_outputs,
     )
 
     reload_button.click(
+        fn=lambda x, page, sort: update_history_tab(x, page, sort, force=True),
+        inputs=page_inputs,
+        outputs=page_outputs,
+    )
+    # API ONLY, returns every row
+    gr.Button(
+        value="Refresh (API ONLY)",
+        visible=False,
+    ).click(
         fn=lambda x: gr.Dataframe(value=get_wav_files(x)),
         inputs=[directory_dropdown],
         outputs=[history_list],
@@ -293,6 +366,12 @@ def create_collection_ui(directories_state):
 
 def outputs_tab():
     collections_directories_atom.render()
+    refresh_on_output_change(
+        fn=get_collections,
+        directory="collections",
+        inputs=[],
+        outputs=[collections_directories_atom],
+    )
     return history_tab("outputs")
 
 
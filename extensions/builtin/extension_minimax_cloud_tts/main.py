@@ -7,6 +7,9 @@ from datetime import datetime
 
 import gradio as gr
 
+from tts_webui.batch_jobs import register_batch_handler
+from tts_webui.scheduler import scheduled
+
 
 MINIMAX_API_URL = "https://api.minimax.io/v1/t2a_v2"
 
@@ -132,6 +135,20 @@ def generate_minimax_tts(
     return audio_path, metadata, folder_root
 
 
+@register_batch_handler("minimax_cloud_tts")
+# Queued in the batch priority class set by the batch runner
+@scheduled(model="minimax")
+def generate_minimax_tts_batch(
+    text: str,
+    model: str = "speech-2.8-hd",
+    voice_id: str = "English_Graceful_Lady",
+    **kwargs,
+) -> tuple:
+    # Batch parameters are stored in the database, so the key only comes
+    # from MINIMAX_API_KEY
+    return generate_minimax_tts(text, model, voice_id, "", **kwargs)
+
+
 def minimax_cloud_tts_tab():
     with gr.Column():
         gr.Markdown(
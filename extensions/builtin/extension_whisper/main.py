@@ -5,7 +5,14 @@ import os
 from typing import TYPE_CHECKING
 
 from tts_webui.utils.manage_model_state import manage_model_state
+from tts_webui.utils.micro_batch import micro_batch
+from tts_webui.utils.model_pool import manage_model_pool
+from tts_webui.utils.model_preload import register_warmup
+from tts_webui.scheduler import scheduled
+from tts_webui.batch_jobs import register_batch_handler
 from tts_webui.utils.list_dir_models import unload_model_button
+from tts_webui.workers import get_worker_pool
+from tts_webui.config.config_utils import get_config_value
 
 if TYPE_CHECKING:
     from transformers import Pipeline
@@ -84,22 +91,103 @@ def get_pipe(model_name, device="cuda:0") -> "Pipeline":
     )
 
 
+@manage_model_pool("whisper-pipe-cpu")
+def get_cpu_pipe(model_name) -> "Pipeline":
+    """CPU replicas, so concurrent transcriptions of small models use all cores."""
+    from transformers import pipeline
+
+    return pipeline(
+        "automatic-speech-recognition",
+        model=model_name,
+        torch_dtype=torch.float32,
+        model_kwargs={"cache_dir": local_cache_dir},
+        device="cpu",
+    )
+
+
+def _device():
+    return "cuda:0" if torch.cuda.is_available() else "cpu"
+
+
+def _use_pipe(model_name, device=None):
+    device = device or _device()
+    if device != "cpu":
+        return get_pipe.use(model_name, device=device)
+    return get_cpu_pipe(model_name)
+
+
+def _warmup(model_name, device):
+    import numpy as np
+
+    # One second of silence at Whisper's 16 kHz sampling rate
+    with _use_pipe(model_name, device) as pipe:
+        pipe(np.zeros(16000, dtype=np.float32))
+
+
+# Preload "whisper-pipe" on a GPU and "whisper-pipe-cpu" without one
+register_warmup("whisper-pipe")(lambda model_name: _warmup(model_name, "cuda:0"))
+register_warmup("whisper-pipe-cpu")(lambda model_name: _warmup(model_name, "cpu"))
+
+
+WHISPER_MAX_BATCH_SIZE = 8
+
+
+# Batched first, so a whole batch queues in the scheduler as one job
+@micro_batch("whisper-pipe", max_batch_size=WHISPER_MAX_BATCH_SIZE)
+def _transcribe_batch(model_name, batch, device=None):
+    if (device or _device()) == "cpu":
+        return _transcribe_on_cpu(model_name, batch)
+    return _transcribe_on_gpu(model_name, batch, device)
+
+
+@scheduled(model="whisper", queue="whisper-pipe")
+def _transcribe_on_gpu(model_name, batch, device=None):
+    return _run(model_name, batch, device)
+
+
+# The CPU pool's queue runs one batch per replica
+@scheduled(model="whisper", queue="whisper-pipe-cpu")
+def _transcribe_on_cpu(model_name, batch):
+    return _run(model_name, batch, "cpu")
+
+
+# "model_workers": {"whisper": n} transcribes in n worker processes, which
+# keep their own pipelines loaded
+WORKER_TARGET = f"{__name__}:_run_pipe"
+
+
+def _run(model_name, batch, device):
+    workers = get_config_value("model_workers", "whisper", 0)
+    if workers:
+        return get_worker_pool(WORKER_TARGET, workers).call(model_name, batch, device)
+    return _run_pipe(model_name, batch, device)
+
+
+def _run_pipe(model_name, batch, device):
+    with _use_pipe(model_name, device) as pipe:
+        results = pipe(
+            [x["inputs"] for x in batch],
+            batch_size=len(batch),
+            generate_kwargs=(
+                {"task": "transcribe"}
+                if model_name == "openai/whisper-large-v3"
+                else {}
+            ),
+            return_timestamps=True,
+        )
+    return [result["text"] for result in results]
+
+
+# A local batch handler, usable without any API key; the scheduled batch
+# calls queue in the batch priority class
+@register_batch_handler("whisper_transcribe")
 def transcribe(inputs, model_name="openai/whisper-large-v3"):
     if inputs is None:
         raise gr.Error(
             "No audio file submitted! Please record an audio before submitting your request."
         )
 
-    pipe = get_pipe(model_name)
-
-    result = pipe(
-        inputs,
-        generate_kwargs=(
-            {"task": "transcribe"} if model_name == "openai/whisper-large-v3" else {}
-        ),
-        return_timestamps=True,
-    )
-    return result["text"]
+    return _transcribe_batch(model_name, device=_device(), inputs=inputs)
 
 
 def transcribe_ui():
@@ -128,6 +216,8 @@ def transcribe_ui():
     with gr.Row():
         unload_model_button("whisper-pipe")
         unload_model_button("whisper")
+        if not torch.cuda.is_available():
+            unload_model_button("whisper-pipe-cpu")
 
         transcribe_button = gr.Button("Transcribe", variant="primary")
 
@@ -136,6 +226,7 @@ def transcribe_ui():
         inputs=[audio, model_dropdown],
         outputs=[text],
         api_name="whisper_transcribe",
+        concurrency_limit=WHISPER_MAX_BATCH_SIZE,
     )
 
 
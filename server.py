@@ -1,4 +1,10 @@
 import os
+import sys
+
+if "--profile-startup" in sys.argv:
+    from tts_webui.utils.startup_profiler import profiler
+
+    profiler.start()
 
 import tts_webui.dotenv_manager.init as dotenv_init
 from tts_webui.config.config import config
@@ -75,9 +81,20 @@ def start_gradio_server(gr_options, config):
 
     setup_gradio_proxy_tree(gr_options)
 
+    from tts_webui.utils.output_watcher import start_output_watcher
+
+    start_output_watcher()
+
     from tts_webui.gradio.blocks import main_block
+    from tts_webui.utils.startup_cache import startup_cache
+    from tts_webui.utils.startup_profiler import profiler
+
+    with profiler.phase("Gradio blocks", "blocks"):
+        demo = main_block(config=config)
+
+    from tts_webui.utils.model_preload import start_model_preload
 
-    demo = main_block(config=config)
+    start_model_preload()
 
     try:
         demo.queue().launch(
@@ -86,6 +103,8 @@ def start_gradio_server(gr_options, config):
             favicon_path="./react-ui/public/favicon.ico",
             prevent_thread_lock=True,
         )
+        profiler.finish()
+        startup_cache.save()
         if in_browser:
             import webbrowser
 
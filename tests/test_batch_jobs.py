@@ -0,0 +1,243 @@
+"""
+Tests for tts_webui.batch_jobs module.
+"""
+
+import time
+
+import pytest
+
+from tts_webui.batch_jobs import (
+    BatchJobRunner,
+    ManifestError,
+    parse_manifest,
+    register_batch_handler,
+)
+from tts_webui.database.connection import close_db, init_db
+from tts_webui.database.models import BatchJob, BatchJobItem
+
+
+@pytest.fixture
+def temp_db(temp_dir, monkeypatch):
+    """Point the database at a temporary file."""
+    close_db()
+    monkeypatch.setenv("TTS_WEBUI_DB_PATH", str(temp_dir / "webui.db"))
+    init_db()
+    yield temp_dir
+    close_db()
+
+
+def _wait_for_job(runner, job_id, timeout=5):
+    deadline = time.time() + timeout
+    while runner.is_active(job_id) and time.time() < deadline:
+        time.sleep(0.01)
+    return BatchJob.get_by_id(job_id)
+
+
+class TestManifest:
+    """Tests for manifest parsing."""
+
+    @pytest.mark.unit
+    def test_parse_manifest(self):
+        """Test that JSONL lines become parameter dicts."""
+        manifest = '{"text": "a"}\n\n# comment\n{"params": {"text": "b", "seed": 1}}\n'
+        assert parse_manifest(manifest) == [{"text": "a"}, {"text": "b", "seed": 1}]
+
+    @pytest.mark.unit
+    def test_parse_manifest_reports_line_number(self):
+        """Test that invalid lines raise ManifestError with their line number."""
+        with pytest.raises(ManifestError, match="Line 2"):
+            parse_manifest('{"text": "a"}\nnot json\n')
+
+    @pytest.mark.unit
+    def test_parse_manifest_rejects_non_objects(self):
+        """Test that non-object lines are rejected."""
+        with pytest.raises(ManifestError):
+            parse_manifest("[1, 2]")
+
+
+class TestBatchJobRunner:
+    """Tests for the BatchJobRunner class."""
+
+    @pytest.mark.integration
+    def test_job_processes_all_items(self, temp_db):
+        """Test that a submitted job completes and checkpoints results."""
+
+        @register_batch_handler("test_upper")
+        def upper(text):
+            return {"text": text.upper(), "audio_out": object()}
+
+        runner = BatchJobRunner()
+        job_id = runner.submit(
+            "test_upper", [{"text": "a"}, {"text": "b"}, {"text": "c"}], workers=2
+        )
+        job = _wait_for_job(runner, job_id)
+
+        assert job["status"] == "completed"
+        assert job["total_items"] == 3
+        assert job["completed_items"] == 3
+        items = BatchJobItem.list_for_job(job_id)
+        # Binary parts of the result (audio arrays) are not persisted
+        assert [i["result"] for i in items] == [
+            {"text": "A"},
+            {"text": "B"},
+            {"text": "C"},
+        ]
+
+    @pytest.mark.integration
+    def test_failed_items_are_recorded(self, temp_db):
+        """Test that a failing item does not stop the rest of the job."""
+
+        @register_batch_handler("test_fail_on_b")
+        def fail_on_b(text):
+            if text == "b":
+                raise RuntimeError("bad item")
+            return text
+
+        runner = BatchJobRunner()
+        job_id = runner.submit("test_fail_on_b", [{"text": "a"}, {"text": "b"}])
+        job = _wait_for_job(runner, job_id)
+
+        assert job["completed_items"] == 1
+        assert job["failed_items"] == 1
+        failed = BatchJobItem.list_for_job(job_id, status="failed")
+        assert failed[0]["error_message"] == "bad item"
+
+    @pytest.mark.integration
+    def test_interrupted_job_resumes_where_it_stopped(self, temp_db):
+        """Test that unfinished jobs resume without redoing completed items."""
+        calls = []
+
+        @register_batch_handler("test_record")
+        def record(text):
+            calls.append(text)
+            return text
+
+        # Simulate a crash: one item done, one mid-generation, one pending
+        job_id = BatchJob.create(handler="test_record")
+        BatchJobItem.create_many(job_id, [{"text": "a"}, {"text": "b"}, {"text": "c"}])
+        items = BatchJobItem.list_for_job(job_id)
+        BatchJobItem.mark_completed(items[0]["id"], "a")
+        BatchJobItem.mark_running(items[1]["id"])
+        BatchJob.set_status(job_id, "running")
+
+        runner = BatchJobRunner()
+        assert runner.resume_unfinished() == [job_id]
+        job = _wait_for_job(runner, job_id)
+
+        assert calls == ["b", "c"]
+        assert job["status"] == "completed"
+        assert job["completed_items"] == 3
+
+    @pytest.mark.integration
+    def test_job_waits_for_its_handler(self, temp_db, monkeypatch):
+        """Test that a job resumed before its extension loads starts once it does."""
+        from tts_webui.batch_jobs import runner as runner_module
+
+        runner = BatchJobRunner()
+        monkeypatch.setattr(runner_module, "_runner", runner)
+        job_id = BatchJob.create(handler="test_late")
+        BatchJobItem.create_many(job_id, [{"text": "a"}])
+        BatchJob.set_status(job_id, "running")
+
+        assert runner.resume_unfinished() == []
+        assert BatchJob.get_by_id(job_id)["status"] == "running"
+
+        @register_batch_handler("test_late")
+        def late(text):
+            return text
+
+        job = _wait_for_job(runner, job_id)
+        assert job["status"] == "completed"
+        assert job["completed_items"] == 1
+
+    @pytest.mark.integration
+    def test_api_keys_are_not_stored(self, temp_db):
+        """Test that secret parameters are dropped before items are saved."""
+        seen = []
+
+        @register_batch_handler("test_secret")
+        def secret(text, **kwargs):
+            seen.append(kwargs)
+            return text
+
+        runner = BatchJobRunner()
+        job_id = runner.submit("test_secret", [{"text": "a", "api_key": "sk-123"}])
+        _wait_for_job(runner, job_id)
+
+        (item,) = BatchJobItem.list_for_job(job_id)
+        assert item["params"] == {"text": "a"}
+        assert seen == [{}]
+
+    @pytest.mark.unit
+    def test_unknown_handler_is_rejected(self, temp_db):
+        """Test that submitting to an unregistered handler raises KeyError."""
+        with pytest.raises(KeyError):
+            BatchJobRunner().submit("does_not_exist", [{"text": "a"}])
+
+    @pytest.mark.integration
+    def test_finished_jobs_cannot_be_paused_or_cancelled(self, temp_db):
+        """Test that pause and cancel leave completed jobs alone."""
+
+        @register_batch_handler("test_done")
+        def done(text):
+            return text
+
+        runner = BatchJobRunner()
+        job_id = runner.submit("test_done", [{"text": "a"}])
+        _wait_for_job(runner, job_id)
+
+        assert runner.pause(job_id) is False
+        assert runner.cancel(job_id) is False
+        assert BatchJob.get_by_id(job_id)["status"] == "completed"
+
+    @pytest.mark.integration
+    def test_handlers_queue_as_batch_work(self, temp_db, monkeypatch):
+        """Test that scheduled handlers wait in the scheduler's batch class."""
+        import threading
+
+        from tts_webui.scheduler import JobScheduler, job_scheduler, scheduled
+
+        scheduler = JobScheduler()
+        monkeypatch.setattr(job_scheduler, "_scheduler", scheduler)
+        release = threading.Event()
+        blocker = threading.Thread(
+            target=scheduler.run,
+            args=(lambda: release.wait(timeout=5),),
+            kwargs={"queue": "test"},
+        )
+        blocker.start()
+
+        @register_batch_handler("test_scheduled")
+        @scheduled(queue="test")
+        def generate(text):
+            return text
+
+        runner = BatchJobRunner()
+        job_id = runner.submit("test_scheduled", [{"text": "a"}])
+        deadline = time.time() + 5
+        while not scheduler.stats()["queue_depth"] and time.time() < deadline:
+            time.sleep(0.01)
+
+        assert scheduler.stats()["queue_depth_by_priority"]["batch"] == 1
+        release.set()
+        blocker.join(timeout=5)
+        assert _wait_for_job(runner, job_id)["status"] == "completed"
+
+
+class TestBatchJobApi:
+    """Tests for batch job access control in the API server."""
+
+    @pytest.mark.integration
+    def test_other_users_jobs_are_not_found(self, temp_db):
+        """Test that only the owner or an admin can see a batch job."""
+        from fastapi import HTTPException
+
+        from tts_webui.database.api_server import AuthContext, get_own_batch_job
+
+        job_id = BatchJob.create(handler="test_upper", user_id=1)
+
+        assert get_own_batch_job(job_id, AuthContext(user_id=1, is_admin=False))
+        assert get_own_batch_job(job_id, AuthContext(user_id=2, is_admin=True))
+        with pytest.raises(HTTPException) as exc_info:
+            get_own_batch_job(job_id, AuthContext(user_id=2, is_admin=False))
+        assert exc_info.value.status_code == 404
@@ -0,0 +1,129 @@
+"""
+Unit tests for tts_webui.extensions_loader.extension_discovery module.
+"""
+
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from tts_webui.extensions_loader import extension_discovery
+from tts_webui.extensions_loader.extension_discovery import (
+    discover_extensions,
+    invalidate_extension_discovery,
+)
+from tts_webui.extensions_loader.extensions_data_loader import load_json_file
+from tts_webui.utils import pip_install
+
+
+@pytest.fixture(autouse=True)
+def clean_discovery():
+    invalidate_extension_discovery()
+    yield
+    invalidate_extension_discovery()
+
+
+class TestDiscoverExtensions:
+    """Tests for parallel extension discovery."""
+
+    @pytest.mark.unit
+    def test_resolves_installed_and_missing_packages(self):
+        """Test that installed packages get a version and missing ones are marked."""
+        result = discover_extensions(
+            [
+                {"package_name": "pytest"},
+                {"package_name": "tts_webui_missing_extension"},
+                {"package_name": "extension_builtin_example"},
+            ]
+        )
+
+        assert result["pytest"]["is_installed"]
+        assert result["pytest"]["version"].startswith("v")
+        assert result["tts_webui_missing_extension"] == {
+            "is_installed": False,
+            "version": "",
+        }
+
+    @pytest.mark.unit
+    def test_results_are_cached(self):
+        """Test that a second discovery does not resolve packages again."""
+        extensions = [{"package_name": "pytest"}]
+        discover_extensions(extensions)
+
+        with patch.object(extension_discovery, "resolve_extension") as resolve:
+            discover_extensions(extensions)
+            resolve.assert_not_called()
+
+    @pytest.mark.unit
+    def test_catalog_change_invalidates_cache(self):
+        """Test that a change to the catalog files re-runs discovery."""
+        extensions = [{"package_name": "pytest"}]
+        discover_extensions(extensions)
+
+        with (
+            patch.object(
+                extension_discovery, "get_catalog_files_key", return_value=("changed",)
+            ),
+            patch.object(
+                extension_discovery,
+                "resolve_extension",
+                return_value={"is_installed": True, "version": "v0"},
+            ) as resolve,
+        ):
+            assert discover_extensions(extensions)["pytest"]["version"] == "v0"
+            resolve.assert_called_once()
+
+    @pytest.mark.unit
+    def test_uninstalling_an_extension_invalidates_cache(self):
+        """Test that discovery runs again after an extension is uninstalled."""
+        extensions = [{"package_name": "pytest"}]
+        discover_extensions(extensions)
+
+        with (
+            patch.object(pip_install, "_pip_uninstall", return_value=iter(["done"])),
+            patch.object(pip_install, "write_log"),
+        ):
+            list(pip_install.pip_uninstall_wrapper("pytest", "Pytest")())
+
+        with patch.object(
+            extension_discovery,
+            "resolve_extension",
+            return_value={"is_installed": False, "version": ""},
+        ) as resolve:
+            assert not discover_extensions(extensions)["pytest"]["is_installed"]
+            resolve.assert_called_once()
+
+
+class TestLoadJsonFileCache:
+    """Tests for mtime-keyed JSON caching."""
+
+    @pytest.mark.unit
+    def test_unchanged_file_is_not_reparsed(self, temp_dir):
+        """Test that an unchanged file is served from the cache as a copy."""
+        path = str(temp_dir / "extensions.json")
+        with open(path, "w") as f:
+            json.dump({"tabs": [{"package_name": "a"}]}, f)
+
+        first = load_json_file(path)
+        first["tabs"].append("mutated")
+        with patch("json.load") as json_load:
+            second = load_json_file(path)
+            json_load.assert_not_called()
+
+        assert second == {"tabs": [{"package_name": "a"}]}
+
+    @pytest.mark.unit
+    def test_modified_file_is_reloaded(self, temp_dir):
+        """Test that changing the file invalidates the cached data."""
+        path = str(temp_dir / "extensions.json")
+        with open(path, "w") as f:
+            json.dump({"version": 1}, f)
+        load_json_file(path)
+
+        with open(path, "w") as f:
+            json.dump({"version": 22}, f)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert load_json_file(path) == {"version": 22}
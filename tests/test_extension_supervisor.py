@@ -0,0 +1,171 @@
+"""
+Unit tests for extension_supervisor module.
+"""
+
+import os
+import sys
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from tts_webui.config.config import config
+from tts_webui.extensions_loader.extension_supervisor import (
+    ExtensionProcess,
+    ExtensionSupervisor,
+    find_free_port,
+    get_idle_timeout,
+)
+
+SERVER_SCRIPT = (
+    "import http.server, os\n"
+    "http.server.HTTPServer(('127.0.0.1', int(os.environ['PORT'])),"
+    " http.server.SimpleHTTPRequestHandler).serve_forever()\n"
+)
+
+
+def make_process(name="test-extension", script=SERVER_SCRIPT, on_ready=None):
+    return ExtensionProcess(
+        name,
+        [sys.executable, "-c", script],
+        lambda port: {**os.environ, "PORT": str(port)},
+        on_ready=on_ready,
+    )
+
+
+def wait_for_state(process, state, timeout=30):
+    deadline = time.time() + timeout
+    while process.state != state and time.time() < deadline:
+        time.sleep(0.05)
+    return process.state == state
+
+
+class TestExtensionProcess:
+    """Tests for starting and stopping a supervised process."""
+
+    @pytest.mark.unit
+    def test_find_free_port(self):
+        """Test that a free port is returned."""
+        assert 0 < find_free_port() < 65536
+
+    @pytest.mark.integration
+    def test_start_waits_for_http(self):
+        """Test that start returns once the server answers and reports the port."""
+        ready_ports = []
+        process = make_process(on_ready=ready_ports.append)
+        try:
+            assert process.start(ready_timeout=30)
+            assert process.state == "running"
+            assert ready_ports == [process.port]
+
+            stats = process.stats()
+            assert stats["pid"] == process.process.pid
+            assert stats["uptime"] >= 0
+        finally:
+            process.stop()
+        assert process.state == "stopped"
+        assert not process.is_running()
+
+    @pytest.mark.unit
+    def test_start_fails_fast_when_process_exits(self):
+        """Test that a process exiting during startup is not waited on."""
+        process = make_process(script="raise SystemExit(1)")
+
+        start = time.time()
+        assert not process.start(ready_timeout=30)
+        assert time.time() - start < 10
+        assert process.state == "crashed"
+
+
+class TestExtensionSupervisor:
+    """Tests for crash restarts and idle stops."""
+
+    @pytest.mark.integration
+    def test_restarts_crashed_process(self):
+        """Test that a crashed process is restarted on a new port."""
+        supervisor = ExtensionSupervisor(max_restarts=2, ready_timeout=30)
+        process = supervisor.register(make_process())
+        try:
+            assert process.start(30)
+            process.process.kill()
+            process.process.wait()
+
+            supervisor.check()
+            assert process.state == "crashed"
+            process.next_restart_at = time.time()
+            supervisor.check()
+
+            # Restarts run in their own thread
+            assert wait_for_state(process, "running")
+            assert process.restarts == 1
+        finally:
+            supervisor.stop_all()
+
+    @pytest.mark.unit
+    def test_gives_up_after_max_restarts(self):
+        """Test that a process crashing too often is marked failed."""
+        supervisor = ExtensionSupervisor(max_restarts=0)
+        process = supervisor.register(make_process(script="raise SystemExit(1)"))
+        process.state = "running"
+
+        supervisor.check()
+
+        assert process.state == "failed"
+
+    @pytest.mark.integration
+    def test_idle_stop_and_wake(self):
+        """Test that idle extensions are stopped and woken by a request."""
+        supervisor = ExtensionSupervisor(idle_timeout=0.01, ready_timeout=30)
+        process = supervisor.register(make_process())
+        try:
+            assert process.start(30)
+            time.sleep(0.05)
+            supervisor.check()
+            assert process.state == "idle"
+            assert not process.is_running()
+
+            ready = supervisor.on_activity("test-extension", 1)
+            # A second request while starting waits for the same start
+            assert supervisor.on_activity("test-extension", 1) is ready
+            assert ready.result(timeout=30) is True
+            assert process.state == "running"
+            assert process.active_requests == 2
+        finally:
+            supervisor.stop_all()
+
+    @pytest.mark.unit
+    def test_busy_process_is_not_stopped_as_idle(self):
+        """Test that an in-flight request keeps an extension running."""
+        supervisor = ExtensionSupervisor(idle_timeout=0.01)
+        process = supervisor.register(make_process())
+        process.process = Mock(poll=Mock(return_value=None))
+        process.state = "running"
+        supervisor.on_activity("test-extension", 1)
+        process.last_activity = time.time() - 1
+
+        supervisor.check()
+
+        assert process.state == "running"
+
+    @pytest.mark.unit
+    def test_running_process_is_not_woken(self):
+        """Test that requests to a running extension are forwarded right away."""
+        supervisor = ExtensionSupervisor()
+        process = supervisor.register(make_process())
+        process.state = "running"
+
+        assert supervisor.on_activity("test-extension", 1) is None
+        assert supervisor.on_activity("test-extension", -1) is None
+        assert process.active_requests == 0
+
+    @pytest.mark.unit
+    def test_idle_stop_is_disabled_with_proxy_workers(self, monkeypatch):
+        """Test that idle stop is off when requests go through proxy workers."""
+        monkeypatch.setitem(
+            config, "extension_supervisor", {"idle_timeout_seconds": 600}
+        )
+        monkeypatch.setitem(config, "proxy_tree", {})
+        assert get_idle_timeout() == 600
+
+        monkeypatch.setitem(config, "proxy_tree", {"workers": 4})
+        assert get_idle_timeout() is None
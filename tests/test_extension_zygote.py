@@ -0,0 +1,104 @@
+"""
+Unit tests for extension_zygote module.
+"""
+
+import os
+import signal
+import sys
+import time
+
+import pytest
+
+from tts_webui.extensions_loader.extension_supervisor import ExtensionProcess
+from tts_webui.extensions_loader.extension_zygote import (
+    Zygote,
+    is_zygote_supported,
+)
+
+pytestmark = pytest.mark.skipif(
+    not is_zygote_supported(), reason="Zygotes need os.fork"
+)
+
+
+def serve():
+    """Forked child target: a plain HTTP server on $PORT."""
+    import http.server
+
+    http.server.HTTPServer(
+        ("127.0.0.1", int(os.environ["PORT"])), http.server.SimpleHTTPRequestHandler
+    ).serve_forever()
+
+
+def wait():
+    """Forked child target that runs until it is killed."""
+    import time
+
+    time.sleep(60)
+
+
+def fail():
+    """Forked child target that exits with an error."""
+    raise SystemExit(3)
+
+
+@pytest.fixture
+def zygote():
+    zygote = Zygote(sys.executable, preload=["http.server"], ready_timeout=30)
+    zygote.start()
+    yield zygote
+    zygote.stop()
+
+
+class TestZygote:
+    """Tests for forking extension processes from a warm interpreter."""
+
+    @pytest.mark.integration
+    def test_forked_child_serves_and_stops(self, zygote):
+        """Test that a forked child becomes ready and can be terminated."""
+        process = ExtensionProcess(
+            "forked",
+            [sys.executable, "-c", "raise SystemExit(1)"],
+            lambda port: {**os.environ, "PORT": str(port)},
+            spawn=lambda env: zygote.spawn(env, "tests.test_extension_zygote:serve"),
+        )
+        assert process.start(ready_timeout=30)
+        child = process.process
+        assert child.pid != zygote._process.pid
+        assert child.poll() is None
+
+        process.stop()
+
+        assert child.poll() == -15
+
+    @pytest.mark.integration
+    def test_exit_code_is_reported(self, zygote):
+        """Test that the zygote reports the exit code of its children."""
+        child = zygote.spawn(dict(os.environ), "tests.test_extension_zygote:fail")
+
+        assert child.wait(timeout=10) == 3
+
+    @pytest.mark.integration
+    def test_spawn_restarts_dead_zygote(self, zygote):
+        """Test that spawning after the zygote died starts a new one."""
+        zygote._process.kill()
+        zygote._process.wait()
+
+        child = zygote.spawn(dict(os.environ), "tests.test_extension_zygote:fail")
+
+        assert child.wait(timeout=10) == 3
+
+    @pytest.mark.integration
+    def test_children_outlive_a_restarted_zygote(self, zygote):
+        """Test that a child of the previous zygote is not reported by the new one."""
+        child = zygote.spawn(dict(os.environ), "tests.test_extension_zygote:wait")
+        zygote._process.kill()
+        zygote._process.wait()
+        zygote.spawn(dict(os.environ), "tests.test_extension_zygote:fail").wait(10)
+
+        assert child.poll() is None
+
+        os.kill(child.pid, signal.SIGKILL)
+        deadline = time.time() + 10
+        while child.poll() is None and time.time() < deadline:
+            time.sleep(0.05)
+        assert child.poll() == -1
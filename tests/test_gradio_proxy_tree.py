@@ -0,0 +1,704 @@
+"""
+Unit tests for gradio_proxy_tree module.
+"""
+
+import asyncio
+import http.server
+import threading
+import time
+from concurrent.futures import Future
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from tts_webui.extensions_loader.extension_supervisor import find_free_port
+from tts_webui.gradio_proxy_tree import GradioProxyTree
+from tts_webui.gradio_proxy_tree.asset_cache import AssetCache, CachedAsset
+from tts_webui.gradio_proxy_tree.balancer import UpstreamGroup
+from tts_webui.gradio_proxy_tree.clients import UpstreamClients
+from tts_webui.gradio_proxy_tree.routing import RouteTable
+from tts_webui.gradio_proxy_tree.websocket_relay import WebSocketOptions
+
+
+class _EchoHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self, body: bytes):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/slow":
+            # Like a queue's SSE stream, still going when the route changes
+            self.send_response(200)
+            self.send_header("Content-Length", "10")
+            self.end_headers()
+            self.wfile.write(b"first")
+            self.wfile.flush()
+            time.sleep(0.5)
+            self.wfile.write(b"-last")
+            return
+        if self.path.startswith(("/assets/", "/static/")):
+            self.server.asset_requests.append(self.path)
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.send_header("ETag", '"v1"')
+                self.end_headers()
+                return
+            body = b"console.log('asset');" * 100
+            self.send_response(200)
+            self.send_header("Content-Type", "application/javascript")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", '"v1"')
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        self._reply(self.path.encode())
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self._reply(str(len(self.rfile.read(length))).encode())
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def upstream():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _EchoHandler)
+    server.asset_requests = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture
+def second_upstream():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _EchoHandler)
+    server.asset_requests = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture
+def upstream_port(upstream):
+    return upstream.server_address[1]
+
+
+def request(tree, method, path, **kwargs):
+    return requests(tree, [(method, path, kwargs)])[0]
+
+
+def requests(tree, calls):
+    """Send several requests on one event loop, like a running server."""
+
+    async def run():
+        transport = httpx.ASGITransport(app=tree._dispatcher)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://proxy"
+        ) as client:
+            return [
+                await client.request(method, path, **kwargs)
+                for method, path, kwargs in calls
+            ]
+
+    return asyncio.run(run())
+
+
+class TestUpstreamClients:
+    """Tests for pooled upstream clients."""
+
+    @pytest.mark.unit
+    def test_requests_are_proxied(self, upstream_port):
+        """Test that the prefix is stripped and the response relayed."""
+        tree = GradioProxyTree(port=0)
+        tree.add_route("/ext", upstream_port)
+
+        response = request(tree, "GET", "/ext/file?x=1")
+
+        assert response.status_code == 200
+        assert response.text == "/file?x=1"
+
+    @pytest.mark.unit
+    def test_client_is_shared_per_upstream(self, upstream_port):
+        """Test that one client is created per target and reused."""
+        tree = GradioProxyTree(port=0)
+        tree.add_route("/a", upstream_port)
+        tree.add_route("/b", upstream_port)
+        clients = tree._dispatcher.clients
+
+        target = f"http://127.0.0.1:{upstream_port}"
+        assert list(clients._clients) == [target]
+        assert clients.get(target) is clients.get(target)
+
+    @pytest.mark.unit
+    def test_retired_client_outlives_its_requests(self):
+        """Test that a retired client is closed only after its last request."""
+
+        async def run():
+            clients = UpstreamClients()
+            clients.add("http://127.0.0.1:20001")
+            async with clients.use("http://127.0.0.1:20001") as client:
+                clients.remove("http://127.0.0.1:20001")
+                clients.get("http://127.0.0.1:20002")
+                await asyncio.sleep(0)
+                in_use_closed = client.is_closed
+            return in_use_closed, client.is_closed
+
+        assert asyncio.run(run()) == (False, True)
+
+    @pytest.mark.unit
+    def test_streaming_response_survives_route_change(
+        self, upstream_port, second_upstream
+    ):
+        """Test that moving a route does not cut off a response in progress."""
+        tree = GradioProxyTree(port=0)
+        tree.add_route("/ext", upstream_port)
+
+        async def run():
+            transport = httpx.ASGITransport(app=tree._dispatcher)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://proxy"
+            ) as client:
+                slow = asyncio.ensure_future(client.get("/ext/slow"))
+                await asyncio.sleep(0.2)
+                tree.add_route("/ext", second_upstream.server_address[1])
+                other = await client.get("/ext/other")
+                return await slow, other
+
+        slow, other = asyncio.run(run())
+
+        assert other.text == "/other"
+        assert slow.status_code == 200
+        assert slow.content == b"first-last"
+
+    @pytest.mark.unit
+    def test_replaced_target_is_retired(self):
+        """Test that a client is retired when its route moves to a new port."""
+        tree = GradioProxyTree(port=0)
+        tree.add_route("/ext", 20001)
+        tree.add_route("/ext", 20002)
+        clients = tree._dispatcher.clients
+
+        assert list(clients._clients) == ["http://127.0.0.1:20002"]
+        assert len(clients._retired) == 1
+
+        asyncio.run(clients.aclose())
+        assert clients._clients == {}
+        assert clients._retired == []
+
+
+class TestActivityListeners:
+    """Tests for request activity notifications."""
+
+    @pytest.mark.unit
+    def test_request_waits_for_woken_upstream(self, upstream_port):
+        """Test that a request is forwarded to the upstream a listener woke."""
+        tree = GradioProxyTree(port=0)
+        # Stopped upstream, it comes back on another port
+        tree.add_route("/ext", find_free_port())
+        deltas = []
+
+        def wake(prefix, delta):
+            deltas.append(delta)
+            if delta < 0:
+                return None
+            ready = Future()
+
+            def start():
+                time.sleep(0.2)
+                tree.add_route("/ext", upstream_port)
+                ready.set_result(True)
+
+            threading.Thread(target=start).start()
+            return ready
+
+        tree.add_activity_listener(wake)
+        response = request(tree, "GET", "/ext/file")
+
+        assert response.status_code == 200
+        assert response.text == "/file"
+        assert deltas == [1, -1]
+
+    @pytest.mark.unit
+    def test_wake_wait_is_bounded(self, upstream_port):
+        """Test that a request is forwarded after wake_timeout at the latest."""
+        tree = GradioProxyTree(port=0)
+        tree.add_route("/ext", upstream_port)
+        tree._dispatcher.wake_timeout = 0.1
+        tree.add_activity_listener(
+            lambda prefix, delta: Future() if delta > 0 else None
+        )
+
+        start = time.time()
+        response = request(tree, "GET", "/ext/file")
+
+        assert response.status_code == 200
+        assert time.time() - start < 5
+
+
+class TestRequestBodies:
+    """Tests for streamed request bodies."""
+
+    @pytest.mark.unit
+    def test_body_is_forwarded(self, upstream_port):
+        """Test that a request body reaches the upstream intact."""
+        tree = GradioProxyTree(port=0)
+        tree.add_route("/ext", upstream_port)
+
+        response = request(tree, "POST", "/ext/upload", content=b"x" * 300_000)
+
+        assert response.status_code == 200
+        assert response.text == "300000"
+
+    @pytest.mark.unit
+    def test_declared_length_over_limit(self, upstream_port):
+        """Test that a too large Content-Length is rejected before streaming."""
+        tree = GradioProxyTree(port=0, max_body_size=1000)
+        tree.add_route("/ext", upstream_port)
+
+        response = request(tree, "POST", "/ext/upload", content=b"x" * 1001)
+
+        assert response.status_code == 413
+
+    @pytest.mark.unit
+    def test_streamed_body_over_limit(self, upstream_port):
+        """Test that a chunked body is cut off once it exceeds the limit."""
+        tree = GradioProxyTree(port=0, max_body_size=1000)
+        tree.add_route("/ext", upstream_port)
+
+        async def chunks():
+            for _ in range(10):
+                yield b"x" * 500
+
+        response = request(tree, "POST", "/ext/upload", content=chunks())
+
+        assert response.status_code == 413
+
+
+class TestRouteTable:
+    """Tests for longest-prefix route matching."""
+
+    @pytest.mark.unit
+    def test_longest_prefix_wins(self):
+        """Test that the most specific route matches."""
+        table = RouteTable({"": "root", "/a": "a", "/a/b": "ab"})
+
+        assert table.match("/") == ("", "root")
+        assert table.match("/a") == ("/a", "a")
+        assert table.match("/a/") == ("/a", "a")
+        assert table.match("/a/b/c") == ("/a/b", "ab")
+        assert table.match("/ab") == ("", "root")
+
+    @pytest.mark.unit
+    def test_no_match(self):
+        """Test that unrouted paths do not match without a root route."""
+        table = RouteTable({"/mms": "mms"})
+
+        assert table.match("/mmsx") is None
+        assert table.match("/other/mms") is None
+
+    @pytest.mark.unit
+    def test_with_route_returns_new_table(self):
+        """Test that adding a route leaves the old table and its cache unchanged."""
+        table = RouteTable({"/a": "a"})
+        assert table.match("/a/x") == ("/a", "a")
+
+        updated = table.with_route("/a/x", "ax")
+
+        assert table.match("/a/x") == ("/a", "a")
+        assert updated.match("/a/x") == ("/a/x", "ax")
+
+
+class TestAssetCache:
+    """Tests for caching static assets in the proxy."""
+
+    @pytest.mark.unit
+    def test_hashed_assets_are_served_from_cache(self, upstream):
+        """Test that /assets/* is fetched from the upstream only once."""
+        tree = GradioProxyTree(port=0, asset_cache_size=1024 * 1024)
+        tree.add_route("/ext", upstream.server_address[1])
+
+        first, second = requests(
+            tree,
+            [("GET", "/ext/assets/index.js", {}), ("GET", "/ext/assets/index.js", {})],
+        )
+
+        assert first.content == second.content
+        assert second.headers["etag"] == '"v1"'
+        assert upstream.asset_requests == ["/assets/index.js"]
+        assert tree._dispatcher.asset_cache.stats()["hits"] == 1
+
+    @pytest.mark.unit
+    def test_static_files_are_revalidated(self, upstream):
+        """Test that /static/* is revalidated and a client ETag gets 304."""
+        tree = GradioProxyTree(port=0, asset_cache_size=1024 * 1024)
+        tree.add_route("/ext", upstream.server_address[1])
+
+        first, second, conditional = requests(
+            tree,
+            [
+                ("GET", "/ext/static/app.js", {}),
+                ("GET", "/ext/static/app.js", {}),
+                ("GET", "/ext/static/app.js", {"headers": {"If-None-Match": '"v1"'}}),
+            ],
+        )
+
+        assert second.content == first.content
+        assert conditional.status_code == 304
+        assert len(upstream.asset_requests) == 3
+        assert tree._dispatcher.asset_cache.stats()["revalidations"] == 2
+
+    @pytest.mark.unit
+    def test_gzip_compression(self, upstream):
+        """Test that compressible assets are gzipped when the client accepts it."""
+        tree = GradioProxyTree(
+            port=0, asset_cache_size=1024 * 1024, compress_assets=True
+        )
+        tree.add_route("/ext", upstream.server_address[1])
+
+        response = request(
+            tree, "GET", "/ext/assets/index.js", headers={"Accept-Encoding": "gzip"}
+        )
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.content == b"console.log('asset');" * 100
+
+    @pytest.mark.unit
+    def test_compression_runs_off_the_event_loop(self):
+        """Test that compressing an asset does not block other requests."""
+        from tts_webui.gradio_proxy_tree import asset_cache
+
+        threads = []
+
+        def compress(body, encoding):
+            threads.append(threading.get_ident())
+            return b"compressed"
+
+        async def run():
+            cache = AssetCache(compress=True)
+            entry = CachedAsset(b"x" * 2048, {"content-type": "text/css"}, True)
+            cache._store("style.css", entry)
+            encoding = await cache._encode(entry, "gzip")
+            return threading.get_ident(), encoding, entry.encoded, cache.bytes
+
+        with patch.object(asset_cache, "_compress", compress):
+            loop_thread, encoding, encoded, size = asyncio.run(run())
+
+        assert encoding == "gzip"
+        assert encoded == {"gzip": b"compressed"}
+        assert size == 2048 + len(b"compressed")
+        assert threads and threads[0] != loop_thread
+
+    @pytest.mark.unit
+    def test_byte_budget_evicts_oldest(self):
+        """Test that the LRU stays within its byte budget."""
+        cache = AssetCache(max_bytes=250)
+        cache._store("a", CachedAsset(b"x" * 100, {}, True))
+        cache._store("b", CachedAsset(b"x" * 100, {}, True))
+        cache._store("c", CachedAsset(b"x" * 100, {}, True))
+
+        assert list(cache._entries) == ["b", "c"]
+        assert cache.bytes == 200
+
+    @pytest.mark.unit
+    def test_storing_a_url_again_replaces_its_bytes(self):
+        """Test that concurrent misses on one URL do not leak the byte count."""
+        cache = AssetCache(max_bytes=100)
+        for _ in range(3):
+            cache._store("a", CachedAsset(b"x" * 40, {}, True))
+        cache._store("b", CachedAsset(b"x" * 40, {}, True))
+
+        assert list(cache._entries) == ["a", "b"]
+        assert cache.bytes == 80
+
+    @pytest.mark.unit
+    def test_evicted_entries_do_not_count_their_compression(self):
+        """Test that compressing an entry evicted meanwhile adds no bytes."""
+        cache = AssetCache(max_bytes=3000, compress=True)
+        entry = CachedAsset(b"x" * 2048, {"content-type": "text/css"}, True)
+        cache._store("style.css", entry)
+        cache._store("other.css", CachedAsset(b"y" * 2048, {}, True))
+
+        asyncio.run(cache._encode(entry, "gzip"))
+
+        assert list(cache._entries) == ["other.css"]
+        assert cache.bytes == 2048
+
+
+class TestProxyMetrics:
+    """Tests for the metrics endpoints."""
+
+    @pytest.mark.unit
+    def test_requests_are_counted(self, upstream_port):
+        """Test per-route counts, bytes and the Prometheus output."""
+        tree = GradioProxyTree(port=0)
+        tree.add_route("/", upstream_port)
+        tree.add_route("/ext", upstream_port)
+
+        _, _, metrics, metrics_json = requests(
+            tree,
+            [
+                ("GET", "/ext/a", {}),
+                ("POST", "/ext/b", {"content": b"12345"}),
+                ("GET", "/metrics", {}),
+                ("GET", "/metrics.json", {}),
+            ],
+        )
+
+        route = metrics_json.json()["routes"]["/ext"]
+        assert route["requests"] == {"200": 2}
+        assert route["bytes_in"] == 5
+        assert route["duration"]["count"] == 2
+        assert route["active_requests"] == 0
+        assert 'proxy_requests_total{route="/ext",status="200"} 2' in metrics.text
+        assert 'proxy_ttfb_seconds_bucket{route="/ext",le="+Inf"} 2' in metrics.text
+
+    @pytest.mark.unit
+    def test_upstream_errors_are_counted(self):
+        """Test that failed upstream connections are reported."""
+        tree = GradioProxyTree(port=0)
+        tree.add_route("/down", find_free_port())
+
+        response, metrics_json = requests(
+            tree, [("GET", "/down/", {}), ("GET", "/metrics.json", {})]
+        )
+
+        assert response.status_code == 502
+        route = metrics_json.json()["routes"]["/down"]
+        assert route["upstream_errors"] == {"connect": 1}
+        assert route["requests"] == {"502": 1}
+
+
+class TestUpstreamGroups:
+    """Tests for routes balanced over several upstreams."""
+
+    @pytest.mark.unit
+    def test_round_robin(self):
+        """Test that targets are used in turn."""
+        group = UpstreamGroup(["a", "b", "c"])
+
+        assert [group.pick() for _ in range(4)] == ["a", "b", "c", "a"]
+
+    @pytest.mark.unit
+    def test_least_connections(self):
+        """Test that the target with fewest active requests is chosen."""
+        group = UpstreamGroup(["a", "b"], strategy="least_connections")
+        group.acquire("a")
+
+        assert group.pick() == "b"
+
+    @pytest.mark.unit
+    def test_failing_target_is_ejected(self):
+        """Test that repeated connection failures eject a target."""
+        group = UpstreamGroup(["a", "b"], max_failures=2, eject_seconds=60)
+        for _ in range(2):
+            group.acquire("a")
+            group.release("a", failed=True)
+
+        assert group.healthy() == ["b"]
+        assert group.pick("a") == "b"
+        assert group.stats()["targets"]["a"]["ejected_for"] > 0
+
+    @pytest.mark.unit
+    def test_all_ejected_falls_back_to_all(self):
+        """Test that a group with no healthy targets still tries them."""
+        group = UpstreamGroup(["a"], max_failures=1)
+        group.acquire("a")
+        group.release("a", failed=True)
+
+        assert group.pick() == "a"
+
+    @pytest.mark.unit
+    def test_sticky_sessions(self, upstream, second_upstream):
+        """Test that a client keeps its upstream through the cookie."""
+        tree = GradioProxyTree(port=0)
+        ports = [upstream.server_address[1], second_upstream.server_address[1]]
+        tree.add_route("/ext", ports)
+
+        async def run():
+            transport = httpx.ASGITransport(app=tree._dispatcher)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://proxy"
+            ) as client:
+                for _ in range(4):
+                    await client.get("/ext/assets/a.js")
+            # A client without the cookie goes to the other upstream
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://proxy"
+            ) as client:
+                await client.get("/ext/assets/a.js")
+
+        asyncio.run(run())
+
+        assert len(upstream.asset_requests) == 4
+        assert len(second_upstream.asset_requests) == 1
+
+    @pytest.mark.unit
+    def test_routes_file_round_trip(self, tmp_path):
+        """Test that routes saved by one tree are loaded by another."""
+        path = str(tmp_path / "routes.json")
+        tree = GradioProxyTree(port=0, routes_file=path)
+        tree.add_route("/", 7770)
+        tree.add_route("/ext", [20001, "10.0.0.2:20001"], strategy="least_connections")
+
+        worker = GradioProxyTree(port=0)
+        worker.load_routes(path)
+
+        assert worker.routes == {
+            "": "http://127.0.0.1:7770",
+            "/ext": ["http://127.0.0.1:20001", "http://10.0.0.2:20001"],
+        }
+        assert worker._dispatcher.groups["/ext"].strategy == "least_connections"
+
+
+@pytest.fixture
+def output_tree(tmp_path, upstream_port):
+    outputs = tmp_path / "outputs"
+    outputs.mkdir()
+    (outputs / "audio.wav").write_bytes(bytes(range(256)) * 4)
+    (tmp_path / "secret.txt").write_text("secret")
+    tree = GradioProxyTree(port=0, output_dirs=[str(outputs)])
+    tree.add_route("/", upstream_port)
+    return tree
+
+
+class TestOutputFiles:
+    """Tests for serving output files from the proxy."""
+
+    @pytest.mark.unit
+    def test_output_file_is_served_directly(self, output_tree, tmp_path):
+        """Test that files in an output directory are not proxied."""
+        path = f"/gradio_api/file={tmp_path}/outputs/audio.wav"
+
+        response = request(output_tree, "GET", path)
+
+        assert response.status_code == 200
+        assert response.content == bytes(range(256)) * 4
+        assert response.headers["accept-ranges"] == "bytes"
+        assert response.headers["etag"].startswith('"')
+        assert output_tree._dispatcher.output_files.served == 1
+
+    @pytest.mark.unit
+    def test_range_and_conditional_requests(self, output_tree, tmp_path):
+        """Test that seeking gets a 206 and a matching ETag a 304."""
+        path = f"/gradio_api/file={tmp_path}/outputs/audio.wav"
+        etag = request(output_tree, "HEAD", path).headers["etag"]
+
+        partial, cached = requests(
+            output_tree,
+            [
+                ("GET", path, {"headers": {"range": "bytes=256-511"}}),
+                ("GET", path, {"headers": {"if-none-match": etag}}),
+            ],
+        )
+
+        assert partial.status_code == 206
+        assert partial.headers["content-range"] == "bytes 256-511/1024"
+        assert partial.content == bytes(range(256))
+        assert cached.status_code == 304
+        assert cached.content == b""
+
+    @pytest.mark.unit
+    def test_other_files_are_proxied(self, output_tree, tmp_path):
+        """Test that paths outside the output directories go to the upstream."""
+        paths = [
+            f"/gradio_api/file={tmp_path}/secret.txt",
+            f"/gradio_api/file={tmp_path}/outputs/../secret.txt",
+            f"/gradio_api/file={tmp_path}/outputs/missing.wav",
+        ]
+
+        responses = requests(output_tree, [("GET", path, {}) for path in paths])
+
+        for response in responses:
+            assert response.status_code == 200
+            assert response.text != "secret"
+        assert output_tree._dispatcher.output_files.served == 0
+
+
+@pytest.fixture
+def ws_upstream_port():
+    from websockets.asyncio.server import serve
+
+    async def echo(connection):
+        async for message in connection:
+            await connection.send(message)
+
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+    state = {}
+
+    async def main():
+        async with serve(echo, "127.0.0.1", 0) as server:
+            state["port"] = server.sockets[0].getsockname()[1]
+            state["stop"] = asyncio.Event()
+            ready.set()
+            await state["stop"].wait()
+
+    thread = threading.Thread(target=loop.run_until_complete, args=(main(),))
+    thread.start()
+    ready.wait(10)
+    yield state["port"]
+    loop.call_soon_threadsafe(state["stop"].set)
+    thread.join(10)
+
+
+class TestWebSocketRelay:
+    """Tests for relaying websockets."""
+
+    @pytest.mark.unit
+    def test_frames_are_relayed_and_counted(self, ws_upstream_port):
+        """Test that frames go both ways and bytes are counted."""
+        from starlette.testclient import TestClient
+
+        tree = GradioProxyTree(port=0)
+        tree.add_route("/ext", ws_upstream_port)
+
+        with TestClient(tree.asgi_app) as client:
+            with client.websocket_connect("/ext/ws") as websocket:
+                websocket.send_text("hello")
+                assert websocket.receive_text() == "hello"
+                websocket.send_bytes(b"\x00\x01")
+                assert websocket.receive_bytes() == b"\x00\x01"
+                (relay,) = tree._dispatcher.relays
+                assert relay.frames_up == 2
+                assert relay.bytes_down == 7
+
+        assert tree._dispatcher.relays == set()
+
+    @pytest.mark.unit
+    def test_oversized_frame_closes_connection(self, ws_upstream_port):
+        """Test that frames above the size limit close with 1009."""
+        from starlette.testclient import TestClient
+        from starlette.websockets import WebSocketDisconnect
+
+        tree = GradioProxyTree(
+            port=0, websocket_options=WebSocketOptions(max_frame_size=10)
+        )
+        tree.add_route("/ext", ws_upstream_port)
+
+        with TestClient(tree.asgi_app) as client:
+            with client.websocket_connect("/ext/ws") as websocket:
+                websocket.send_text("x" * 20)
+                with pytest.raises(WebSocketDisconnect) as exc_info:
+                    websocket.receive_text()
+
+        assert exc_info.value.code == 1009
+
+    @pytest.mark.unit
+    def test_unavailable_upstream_is_rejected(self):
+        """Test that the handshake fails when the upstream is down."""
+        from starlette.testclient import TestClient
+        from starlette.websockets import WebSocketDisconnect
+
+        tree = GradioProxyTree(port=0)
+        tree.add_route("/ext", find_free_port())
+
+        with TestClient(tree.asgi_app) as client:
+            with pytest.raises(WebSocketDisconnect):
+                with client.websocket_connect("/ext/ws"):
+                    pass
@@ -0,0 +1,112 @@
+"""
+Unit tests for tts_webui.history_tab.history_index module.
+"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from tts_webui.history_tab.history_index import HistoryIndex
+
+
+@pytest.fixture
+def outputs(temp_dir):
+    path = temp_dir / "outputs"
+    for name in (
+        "2024-01-01_10-00-00__bark__None",
+        "2024-01-03_10-00-00__tortoise__random",
+        "2024-01-02_10-00-00__musicgen__None",
+    ):
+        (path / name).mkdir(parents=True)
+    return path
+
+
+def new_index(outputs, temp_dir):
+    index = HistoryIndex(str(outputs), index_dir=str(temp_dir / "index"))
+    index.refresh()
+    return index
+
+
+def touch_directory(path, offset):
+    # Directory mtimes can be too coarse to see two changes within a test
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + offset))
+
+
+class TestHistoryIndex:
+    """Tests for the HistoryIndex class."""
+
+    @pytest.mark.unit
+    def test_pages_are_sorted(self, outputs, temp_dir):
+        """Test that pages are cut from the requested order."""
+        index = new_index(outputs, temp_dir)
+
+        newest, pages = index.page(1, 2)
+        (oldest,), _ = index.page(1, 1, "Oldest first")
+
+        assert pages == 2
+        assert [row[1] for row in newest] == [
+            "Tortoise random",
+            "Musicgen history: none",
+        ]
+        assert oldest[3] == os.path.join(
+            str(outputs),
+            "2024-01-01_10-00-00__bark__None",
+            "2024-01-01_10-00-00__bark__None.wav",
+        )
+
+    @pytest.mark.unit
+    def test_index_is_reused_by_new_instances(self, outputs, temp_dir):
+        """Test that a restarted server parses nothing for an unchanged directory."""
+        new_index(outputs, temp_dir)
+
+        with patch.object(HistoryIndex, "_parse") as parse:
+            index = new_index(outputs, temp_dir)
+
+        parse.assert_not_called()
+        assert len(index) == 3
+
+    @pytest.mark.unit
+    def test_only_new_generations_are_parsed(self, outputs, temp_dir):
+        """Test that a refresh parses added entries and drops removed ones."""
+        index = new_index(outputs, temp_dir)
+        (outputs / "2024-01-04_10-00-00__bark__None").mkdir()
+        (outputs / "2024-01-01_10-00-00__bark__None").rmdir()
+        touch_directory(outputs, 1_000_000)
+
+        with patch.object(HistoryIndex, "_parse", wraps=index._parse) as parse:
+            assert index.refresh() is True
+
+        parse.assert_called_once_with("2024-01-04_10-00-00__bark__None")
+        (row,), _ = index.page(1, 1)
+        assert row[0].day == 4
+        assert len(index) == 3
+
+    @pytest.mark.unit
+    def test_unchanged_directory_is_not_listed(self, outputs, temp_dir):
+        """Test that a refresh without changes does not scan the directory."""
+        index = new_index(outputs, temp_dir)
+
+        with patch("os.scandir") as scandir:
+            assert index.refresh() is False
+
+        scandir.assert_not_called()
+
+    @pytest.mark.unit
+    def test_watcher_changes_are_applied(self, outputs, temp_dir):
+        """Test that an applied change saves the directory from being listed again."""
+        index = new_index(outputs, temp_dir)
+        previous_mtime_ns = index.mtime_ns
+        (outputs / "2024-01-04_10-00-00__bark__None").mkdir()
+        touch_directory(outputs, 1_000_000)
+        mtime_ns = os.stat(outputs).st_mtime_ns
+
+        index.apply(
+            {"2024-01-04_10-00-00__bark__None"}, set(), mtime_ns, previous_mtime_ns
+        )
+
+        with patch("os.scandir") as scandir:
+            assert index.refresh() is False
+        scandir.assert_not_called()
+        assert len(index) == 4
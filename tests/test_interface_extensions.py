@@ -0,0 +1,72 @@
+"""
+Unit tests for lazy loading in tts_webui.extensions_loader.interface_extensions.
+"""
+
+import sys
+
+import gradio as gr
+import pytest
+
+from tts_webui.extensions_loader import interface_extensions
+
+
+@pytest.fixture
+def fake_extension(temp_dir, monkeypatch):
+    """An installed 'builtin' extension package that records when it is built."""
+    package = temp_dir / "extension_builtin_lazy_test"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "main.py").write_text(
+        "import gradio as gr\n"
+        "BUILT = []\n"
+        "def extension__tts_generation_webui():\n"
+        "    BUILT.append(True)\n"
+        "    gr.Markdown('lazy test')\n"
+    )
+    monkeypatch.syspath_prepend(str(temp_dir))
+    monkeypatch.setattr(interface_extensions, "lazy_load_extensions", True)
+    yield "extension_builtin_lazy_test"
+    sys.modules.pop("extension_builtin_lazy_test.main", None)
+    sys.modules.pop("extension_builtin_lazy_test", None)
+
+
+class TestLazyExtensionTabs:
+    """Tests for lazy extension tab rendering."""
+
+    @pytest.mark.unit
+    def test_lazy_tab_is_not_imported_at_startup(self, fake_extension):
+        """Test that a lazy tab builds only a placeholder."""
+        with gr.Blocks():
+            interface_extensions._handle_package(fake_extension, "Lazy Test", "")
+
+        assert f"{fake_extension}.main" not in sys.modules
+
+    @pytest.mark.unit
+    def test_eager_tab_is_built_at_startup(self, fake_extension, monkeypatch):
+        """Test that extensions listed as eager are built immediately."""
+        monkeypatch.setattr(interface_extensions, "eager_extensions", [fake_extension])
+        with gr.Blocks():
+            interface_extensions._handle_package(fake_extension, "Lazy Test", "")
+
+        assert sys.modules[f"{fake_extension}.main"].BUILT == [True]
+
+    @pytest.mark.unit
+    def test_extension_with_api_endpoints_is_built_at_startup(
+        self, fake_extension, temp_dir
+    ):
+        """Test that an extension naming API endpoints is not lazy."""
+        (temp_dir / fake_extension / "ui.py").write_text(
+            "def bind(button, fn):\n    button.click(fn, api_name='lazy_test')\n"
+        )
+        with gr.Blocks():
+            interface_extensions._handle_package(fake_extension, "Lazy Test", "")
+
+        assert sys.modules[f"{fake_extension}.main"].BUILT == [True]
+
+    @pytest.mark.unit
+    def test_lazy_loader_builds_extension(self, fake_extension):
+        """Test that the deferred loader imports and builds the extension."""
+        with gr.Blocks():
+            interface_extensions._load_extension_tab(fake_extension)
+
+        assert sys.modules[f"{fake_extension}.main"].BUILT == [True]
@@ -0,0 +1,302 @@
+"""
+Unit tests for tts_webui.scheduler module.
+"""
+
+import threading
+import time
+
+import pytest
+
+from tts_webui.scheduler import (
+    JobScheduler,
+    QueueFullError,
+    estimate_cost,
+    job_context,
+)
+from tts_webui.scheduler.job_scheduler import current_job_context
+
+
+def _start_blocking_job(scheduler, release: threading.Event, **kwargs):
+    """Occupy the scheduler's only slot until *release* is set."""
+    started = threading.Event()
+
+    def job():
+        started.set()
+        release.wait(timeout=5)
+
+    thread = threading.Thread(target=scheduler.run, args=(job,), kwargs=kwargs)
+    thread.start()
+    started.wait(timeout=5)
+    return thread
+
+
+def _queue_job(scheduler, order, name, **kwargs):
+    thread = threading.Thread(
+        target=scheduler.run, args=(order.append, (name,)), kwargs=kwargs
+    )
+    thread.start()
+    return thread
+
+
+def _wait_for_depth(scheduler, depth):
+    deadline = time.time() + 5
+    while scheduler.stats()["queue_depth"] < depth and time.time() < deadline:
+        time.sleep(0.01)
+
+
+class TestEstimateCost:
+    """Tests for cost estimation."""
+
+    @pytest.mark.unit
+    def test_short_text_has_unit_cost(self):
+        """Test that short text with an unknown model costs 1."""
+        assert estimate_cost("hello", "kokoro") == 1.0
+
+    @pytest.mark.unit
+    def test_cost_scales_with_text_and_model(self):
+        """Test that longer text and heavier models cost more."""
+        assert estimate_cost("x" * 300) == 3.0
+        assert estimate_cost("hello", "facebook/musicgen-small") > estimate_cost(
+            "hello", "bark"
+        )
+
+
+class TestJobScheduler:
+    """Tests for the JobScheduler class."""
+
+    @pytest.mark.unit
+    def test_run_returns_result(self):
+        """Test that an uncontended job runs immediately."""
+        scheduler = JobScheduler()
+        assert scheduler.run(lambda a, b: a + b, (1, 2)) == 3
+        assert scheduler.stats()["completed"] == 1
+
+    @pytest.mark.unit
+    def test_interactive_jobs_run_before_batch_jobs(self):
+        """Test that higher priority classes are dispatched first."""
+        scheduler = JobScheduler(max_concurrent=1)
+        release = threading.Event()
+        order = []
+
+        blocker = _start_blocking_job(scheduler, release)
+        threads = [_queue_job(scheduler, order, "batch", priority="batch")]
+        _wait_for_depth(scheduler, 1)
+        threads.append(_queue_job(scheduler, order, "interactive"))
+        _wait_for_depth(scheduler, 2)
+
+        release.set()
+        for t in [blocker, *threads]:
+            t.join(timeout=5)
+
+        assert order == ["interactive", "batch"]
+
+    @pytest.mark.unit
+    def test_clients_are_served_fairly(self):
+        """Test that one client's backlog does not starve another client."""
+        scheduler = JobScheduler(max_concurrent=1)
+        release = threading.Event()
+        order = []
+
+        blocker = _start_blocking_job(scheduler, release)
+        threads = []
+        for i in range(3):
+            threads.append(_queue_job(scheduler, order, f"a{i}", client_id="a"))
+            _wait_for_depth(scheduler, len(threads))
+        threads.append(_queue_job(scheduler, order, "b0", client_id="b"))
+        _wait_for_depth(scheduler, len(threads))
+
+        release.set()
+        for t in [blocker, *threads]:
+            t.join(timeout=5)
+
+        assert order.index("b0") <= 1
+
+    @pytest.mark.unit
+    def test_queue_depth_limit_rejects_jobs(self):
+        """Test that admission control raises QueueFullError when full."""
+        scheduler = JobScheduler(max_concurrent=1, max_queue_depth=1)
+        release = threading.Event()
+        order = []
+
+        blocker = _start_blocking_job(scheduler, release)
+        waiting = _queue_job(scheduler, order, "queued")
+        _wait_for_depth(scheduler, 1)
+
+        with pytest.raises(QueueFullError) as exc_info:
+            scheduler.run(order.append, ("rejected",))
+        assert exc_info.value.status_code == 429
+
+        release.set()
+        blocker.join(timeout=5)
+        waiting.join(timeout=5)
+        assert order == ["queued"]
+        assert scheduler.stats()["rejected"] == 1
+
+    @pytest.mark.unit
+    def test_job_context_sets_client_and_priority(self):
+        """Test that job_context provides defaults for submitted jobs."""
+        scheduler = JobScheduler(max_concurrent=1, max_client_queue_depth=1)
+        release = threading.Event()
+        order = []
+
+        blocker = _start_blocking_job(scheduler, release)
+
+        def queue_in_context():
+            with job_context("script", priority="batch"):
+                scheduler.run(order.append, ("queued",))
+
+        waiting = threading.Thread(target=queue_in_context)
+        waiting.start()
+        _wait_for_depth(scheduler, 1)
+        assert scheduler.stats()["queue_depth_by_priority"]["batch"] == 1
+
+        with job_context("script", priority="batch"):
+            with pytest.raises(QueueFullError):
+                scheduler.run(order.append, ("rejected",))
+
+        release.set()
+        blocker.join(timeout=5)
+        waiting.join(timeout=5)
+        assert order == ["queued"]
+
+    @pytest.mark.unit
+    def test_queues_run_side_by_side(self):
+        """Test that a long job only blocks jobs of its own queue."""
+        scheduler = JobScheduler()
+        release = threading.Event()
+        order = []
+
+        blocker = _start_blocking_job(scheduler, release, queue="musicgen")
+        waiting = _queue_job(scheduler, order, "musicgen", queue="musicgen")
+        _wait_for_depth(scheduler, 1)
+
+        scheduler.run(order.append, ("bark",), queue="bark")
+        assert order == ["bark"]
+
+        release.set()
+        blocker.join(timeout=5)
+        waiting.join(timeout=5)
+        assert order == ["bark", "musicgen"]
+
+    @pytest.mark.unit
+    def test_queue_limits(self):
+        """Test that a queue runs up to its limit of jobs at once."""
+        scheduler = JobScheduler(queue_limits={"pool": 2})
+        scheduler.set_queue_limit("pool", 1)
+        release = threading.Event()
+
+        blockers = [
+            _start_blocking_job(scheduler, release, queue="pool") for _ in range(2)
+        ]
+
+        assert scheduler.stats()["running_by_queue"] == {"pool": 2}
+        release.set()
+        for t in blockers:
+            t.join(timeout=5)
+
+    @pytest.mark.unit
+    def test_gradio_sessions_are_separate_clients(self):
+        """Test that each Gradio session queues as its own client."""
+        from types import SimpleNamespace
+
+        from gradio.context import LocalContext
+
+        token = LocalContext.request.set(SimpleNamespace(session_hash="abc"))
+        try:
+            assert current_job_context()["client_id"] == "gradio-abc"
+            with job_context("tts_key", priority="api"):
+                assert current_job_context()["client_id"] == "tts_key"
+        finally:
+            LocalContext.request.reset(token)
+        assert current_job_context()["client_id"] == "gradio"
+
+    @pytest.mark.unit
+    def test_job_context_rejects_unknown_priority(self):
+        """Test that unknown priority classes are rejected."""
+        with pytest.raises(ValueError):
+            with job_context("client", priority="urgent"):
+                pass
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    from tts_webui.scheduler import job_scheduler
+
+    scheduler = JobScheduler(max_concurrent=1)
+    monkeypatch.setattr(job_scheduler, "_scheduler", scheduler)
+    return scheduler
+
+
+class TestScheduledGenerations:
+    """Tests for generation functions run through the scheduler."""
+
+    @pytest.mark.unit
+    def test_extension_generations_are_queued_fairly(self, scheduler):
+        """Test that two clients' generations through the decorator pipeline alternate."""
+        from tts_webui.extensions_loader.decorator_extensions import (
+            decorator_extension_outer,
+        )
+
+        release = threading.Event()
+        order = []
+
+        @decorator_extension_outer
+        def generate(text, **kwargs):
+            if text == "blocker":
+                release.wait(timeout=5)
+            order.append(text)
+            return {"text": text}
+
+        def submit(client_id, text):
+            def target():
+                with job_context(client_id, priority="api"):
+                    generate(text=text)
+
+            thread = threading.Thread(target=target)
+            thread.start()
+            return thread
+
+        threads = [submit("a", "blocker")]
+        while scheduler.stats()["running"] == 0:
+            time.sleep(0.01)
+        for client_id, text in [("a", "a1"), ("a", "a2"), ("b", "b1")]:
+            threads.append(submit(client_id, text))
+            _wait_for_depth(scheduler, len(threads) - 1)
+
+        release.set()
+        for t in threads:
+            t.join(timeout=5)
+
+        assert order == ["blocker", "a1", "b1", "a2"]
+
+    @pytest.mark.unit
+    def test_generator_holds_its_slot_until_exhausted(self, scheduler):
+        """Test that a streaming generation keeps its slot between chunks."""
+        from tts_webui.scheduler import scheduled
+
+        @scheduled()
+        def stream(text):
+            yield from text
+
+        chunks = stream(text="ab")
+        assert next(chunks) == "a"
+        assert scheduler.stats()["running"] == 1
+
+        assert list(chunks) == ["b"]
+        assert scheduler.stats()["running"] == 0
+
+    @pytest.mark.unit
+    def test_nested_generations_share_the_slot(self, scheduler):
+        """Test that a scheduled function calling another does not deadlock."""
+        from tts_webui.scheduler import scheduled
+
+        @scheduled()
+        def inner(text):
+            return text.upper()
+
+        @scheduled()
+        def outer(text):
+            return inner(text=text)
+
+        assert outer(text="hi") == "HI"
+        assert scheduler.stats()["completed"] == 1
@@ -0,0 +1,199 @@
+"""
+Unit tests for tts_webui.utils.manage_model_state module.
+"""
+
+import threading
+import time
+
+import pytest
+
+from tts_webui.utils.manage_model_state import (
+    get_current_model,
+    hold_models,
+    manage_model_state,
+    unload_model,
+)
+
+
+@pytest.fixture
+def slow_loader():
+    """A loader that takes a moment, so concurrent calls overlap."""
+    loads = []
+
+    @manage_model_state("test-concurrent")
+    def load(model_name):
+        loads.append(model_name)
+        time.sleep(0.1)
+        return {"name": model_name}
+
+    yield load, loads
+    unload_model("test-concurrent", silent=True)
+
+
+class TestConcurrentLoading:
+    """Tests for thread-safe model loading and unloading."""
+
+    @pytest.mark.unit
+    def test_concurrent_callers_share_one_load(self, slow_loader):
+        """Test that simultaneous requests load the model only once."""
+        load, loads = slow_loader
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(load("m"))) for _ in range(4)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=5)
+
+        assert loads == ["m"]
+        assert len(results) == 4
+        assert all(r is results[0] for r in results)
+
+    @pytest.mark.unit
+    def test_unload_waits_for_model_in_use(self, slow_loader):
+        """Test that unloading blocks until in-flight users release the model."""
+        load, _ = slow_loader
+        in_use = threading.Event()
+        release = threading.Event()
+        seen = []
+
+        def infer():
+            with load.use("m") as model:
+                in_use.set()
+                release.wait(timeout=5)
+                seen.append(get_current_model("test-concurrent") is model)
+
+        user = threading.Thread(target=infer)
+        user.start()
+        in_use.wait(timeout=5)
+
+        unloader = threading.Thread(target=unload_model, args=("test-concurrent", True))
+        unloader.start()
+        time.sleep(0.05)
+        assert unloader.is_alive()
+
+        release.set()
+        user.join(timeout=5)
+        unloader.join(timeout=5)
+
+        assert seen == [True]
+        assert get_current_model("test-concurrent") is None
+
+    @pytest.mark.unit
+    def test_non_blocking_unload_skips_model_in_use(self, slow_loader):
+        """Test that wait=False leaves a model in use by another thread loaded."""
+        load, _ = slow_loader
+        in_use = threading.Event()
+        release = threading.Event()
+
+        def infer():
+            with load.use("m"):
+                in_use.set()
+                release.wait(timeout=5)
+
+        user = threading.Thread(target=infer)
+        user.start()
+        in_use.wait(timeout=5)
+
+        assert unload_model("test-concurrent", silent=True, wait=False) is False
+        release.set()
+        user.join(timeout=5)
+        assert unload_model("test-concurrent", silent=True, wait=False) is True
+
+    @pytest.mark.unit
+    def test_switching_models_in_use_by_same_thread(self, slow_loader):
+        """Test that a thread holding a model can still switch it without deadlock."""
+        load, loads = slow_loader
+        with load.use("a"):
+            assert load("b") == {"name": "b"}
+        assert loads == ["a", "b"]
+
+
+class TestHoldModels:
+    """Tests for holding models for the duration of a generation."""
+
+    @pytest.mark.unit
+    def test_models_are_held_until_the_call_returns(self, slow_loader):
+        """Test that a model loaded without use() is not unloaded mid-generation."""
+        load, _ = slow_loader
+        loaded = threading.Event()
+        release = threading.Event()
+
+        @hold_models
+        def generate():
+            load("m")
+            loaded.set()
+            release.wait(timeout=5)
+
+        user = threading.Thread(target=generate)
+        user.start()
+        loaded.wait(timeout=5)
+
+        assert unload_model("test-concurrent", silent=True, wait=False) is False
+        release.set()
+        user.join(timeout=5)
+        assert unload_model("test-concurrent", silent=True, wait=False) is True
+
+    @pytest.mark.unit
+    def test_generators_hold_models_until_closed(self, slow_loader):
+        """Test that a suspended generator keeps its model loaded."""
+        load, _ = slow_loader
+
+        @hold_models
+        def generate():
+            load("m")
+            yield 1
+            yield 2
+
+        gen = generate()
+        next(gen)
+        # Gradio resumes generators from worker threads
+        step = threading.Thread(target=next, args=(gen,))
+        step.start()
+        step.join(timeout=5)
+
+        assert unload_model("test-concurrent", silent=True, wait=False) is False
+        gen.close()
+        assert unload_model("test-concurrent", silent=True, wait=False) is True
+
+    @pytest.mark.unit
+    def test_switching_models_in_a_held_call(self, slow_loader):
+        """Test that a generation can switch the model it holds without deadlock."""
+        load, loads = slow_loader
+
+        @hold_models
+        def generate():
+            load("a")
+            return load("b")
+
+        assert generate() == {"name": "b"}
+        assert loads == ["a", "b"]
+
+    @pytest.mark.unit
+    def test_generations_hold_their_models(self, slow_loader):
+        """Test that generations wrapped by the outer decorators hold their models."""
+        from tts_webui.extensions_loader.decorator_extensions import (
+            _create_decorator,
+        )
+
+        load, _ = slow_loader
+        results = []
+
+        # The outer decorators without the installed save extensions
+        @_create_decorator([], schedule=True)
+        def generate(**kwargs):
+            load("m")
+            evict = threading.Thread(
+                target=lambda: results.append(
+                    unload_model("test-concurrent", silent=True, wait=False)
+                )
+            )
+            evict.start()
+            evict.join(timeout=5)
+            return {"text": kwargs["text"]}
+
+        generate(text="hello")
+
+        assert results == [False]
+        assert get_current_model("test-concurrent") == {"name": "m"}
@@ -0,0 +1,137 @@
+"""
+Unit tests for tts_webui.utils.micro_batch module.
+"""
+
+import threading
+
+import pytest
+
+from tts_webui.utils.micro_batch import MicroBatcher, get_micro_batcher, micro_batch
+
+
+def _run_concurrently(fn, args_list):
+    results = [None] * len(args_list)
+    errors = [None] * len(args_list)
+
+    def target(i, args):
+        try:
+            results[i] = fn(*args)
+        except Exception as e:
+            errors[i] = e
+
+    threads = [
+        threading.Thread(target=target, args=(i, args))
+        for i, args in enumerate(args_list)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+    return results, errors
+
+
+class TestMicroBatcher:
+    """Tests for the MicroBatcher class."""
+
+    @pytest.mark.unit
+    def test_single_request_runs_alone(self):
+        """Test that a lone request is executed as a batch of one."""
+        calls = []
+
+        def batch_fn(model_name, items):
+            calls.append((model_name, items))
+            return [x["text"].upper() for x in items]
+
+        batcher = MicroBatcher(batch_fn, max_batch_size=4, window=0.01)
+        assert batcher.submit("m", text="hello") == "HELLO"
+        assert calls == [("m", [{"text": "hello"}])]
+
+    @pytest.mark.unit
+    def test_concurrent_requests_are_batched(self):
+        """Test that concurrent requests for one model share a batch call."""
+        calls = []
+
+        def batch_fn(model_name, items):
+            calls.append(len(items))
+            return [x["n"] * 2 for x in items]
+
+        batcher = MicroBatcher(batch_fn, max_batch_size=4, window=0.5)
+        results, errors = _run_concurrently(
+            lambda n: batcher.submit("m", n=n), [(i,) for i in range(4)]
+        )
+
+        assert errors == [None] * 4
+        assert results == [0, 2, 4, 6]
+        assert calls == [4]
+        assert batcher.requests == 4
+        assert batcher.batches == 1
+
+    @pytest.mark.unit
+    def test_batches_are_keyed_by_model_name(self):
+        """Test that requests for different models are not mixed."""
+        calls = []
+
+        def batch_fn(model_name, items):
+            calls.append((model_name, len(items)))
+            return [model_name] * len(items)
+
+        batcher = MicroBatcher(batch_fn, max_batch_size=2, window=0.5)
+        results, _ = _run_concurrently(
+            lambda name: batcher.submit(name), [("a",), ("b",), ("a",), ("b",)]
+        )
+
+        assert results == ["a", "b", "a", "b"]
+        assert sorted(calls) == [("a", 2), ("b", 2)]
+
+    @pytest.mark.unit
+    def test_batches_are_keyed_by_device(self):
+        """Test that requests for one model on different devices are not mixed."""
+        calls = []
+
+        def batch_fn(model_name, items, device=None):
+            calls.append((model_name, device, len(items)))
+            return [device] * len(items)
+
+        batcher = MicroBatcher(batch_fn, max_batch_size=2, window=0.5)
+        results, _ = _run_concurrently(
+            lambda device: batcher.submit("m", device),
+            [("cpu",), ("cuda:0",), ("cpu",), ("cuda:0",)],
+        )
+
+        assert results == ["cpu", "cuda:0", "cpu", "cuda:0"]
+        assert sorted(calls) == [("m", "cpu", 2), ("m", "cuda:0", 2)]
+
+    @pytest.mark.unit
+    def test_errors_are_propagated_to_every_caller(self):
+        """Test that a failing batch raises in all waiting callers."""
+
+        def batch_fn(model_name, items):
+            raise RuntimeError("boom")
+
+        batcher = MicroBatcher(batch_fn, max_batch_size=2, window=0.5)
+        _, errors = _run_concurrently(lambda: batcher.submit("m"), [(), ()])
+
+        assert all(isinstance(e, RuntimeError) for e in errors)
+
+    @pytest.mark.unit
+    def test_result_count_mismatch_is_an_error(self):
+        """Test that returning the wrong number of results raises."""
+        batcher = MicroBatcher(lambda model_name, items: [], window=0.0)
+
+        with pytest.raises(ValueError):
+            batcher.submit("m", text="x")
+
+
+class TestMicroBatchDecorator:
+    """Tests for the micro_batch decorator."""
+
+    @pytest.mark.unit
+    def test_decorator_registers_namespace(self):
+        """Test that the decorator exposes a per-request function."""
+
+        @micro_batch("test-namespace", window=0.0)
+        def echo(model_name, batch):
+            return [(model_name, x["value"]) for x in batch]
+
+        assert echo("model", value=1) == ("model", 1)
+        assert get_micro_batcher("test-namespace").requests == 1
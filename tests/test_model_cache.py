@@ -0,0 +1,142 @@
+"""
+Unit tests for tts_webui.utils.model_cache module.
+"""
+
+import pytest
+import torch
+
+from tts_webui.utils.model_cache import ModelCacheManager, estimate_model_memory
+
+MB = 1024**2
+
+
+def _model(megabytes):
+    """A module holding *megabytes* of float32 parameters on the CPU."""
+    return torch.nn.Linear(megabytes * MB // 4, 1, bias=False)
+
+
+class TestEstimateModelMemory:
+    """Tests for memory estimation."""
+
+    @pytest.mark.unit
+    def test_counts_module_parameters(self):
+        """Test that a module's parameters are counted as RAM."""
+        assert estimate_model_memory(_model(1)) == (MB, 0)
+
+    @pytest.mark.unit
+    def test_walks_containers_and_deduplicates(self):
+        """Test that tuples and wrapper objects are walked without double counting."""
+        model = _model(1)
+
+        class Pipeline:
+            def __init__(self):
+                self.model = model
+                self.tokenizer = {"vocab": [1, 2, 3]}
+
+        assert estimate_model_memory((model, Pipeline())) == (MB, 0)
+
+
+class TestModelCacheManager:
+    """Tests for the ModelCacheManager class."""
+
+    @pytest.mark.unit
+    def test_least_recently_used_is_evicted_over_budget(self):
+        """Test that loading past the RAM budget unloads the LRU namespace."""
+        unloaded = []
+        cache = ModelCacheManager(unloaded.append, ram_budget=2 * MB)
+
+        cache.record_load("a", "a-model", _model(1), 1.0)
+        cache.record_load("b", "b-model", _model(1), 1.0)
+        cache.record_hit("a")
+        cache.record_load("c", "c-model", _model(1), 1.0)
+
+        assert unloaded == ["b"]
+        assert cache.get_entry("b") is None
+        assert cache.stats()["evictions"] == 1
+
+    @pytest.mark.unit
+    def test_known_size_makes_room_before_loading(self):
+        """Test that a reload evicts other models before the load starts."""
+        unloaded = []
+        cache = ModelCacheManager(unloaded.append, ram_budget=2 * MB)
+
+        cache.record_load("a", "a-model", _model(2), 1.0)
+        cache.record_unload("a")
+        cache.record_load("b", "b-model", _model(1), 1.0)
+        cache.record_miss("a", "a-model")
+
+        assert unloaded == ["b"]
+
+    @pytest.mark.unit
+    def test_pinned_namespaces_are_not_evicted(self):
+        """Test that pinned namespaces are kept even when over budget."""
+        unloaded = []
+        cache = ModelCacheManager(unloaded.append, ram_budget=MB)
+
+        cache.record_load("a", "a-model", _model(1), 1.0)
+        cache.pin("a")
+        cache.record_load("b", "b-model", _model(1), 1.0)
+
+        assert unloaded == []
+
+    @pytest.mark.unit
+    def test_idle_models_are_evicted(self):
+        """Test that models unused for longer than idle_timeout are unloaded."""
+        unloaded = []
+        cache = ModelCacheManager(unloaded.append, idle_timeout=60)
+
+        cache.record_load("a", "a-model", _model(1), 1.0)
+        cache.record_load("b", "b-model", _model(1), 1.0)
+        cache.get_entry("a").last_used -= 120
+
+        assert cache.evict_idle() == ["a"]
+        assert unloaded == ["a"]
+        assert cache.stats()["idle_evictions"] == 1
+
+    @pytest.mark.unit
+    def test_idle_time_counts_from_the_end_of_use(self):
+        """Test that a model used for longer than idle_timeout is kept after the call."""
+        unloaded = []
+        cache = ModelCacheManager(unloaded.append, idle_timeout=60)
+
+        cache.record_load("a", "a-model", _model(1), 1.0)
+        cache.pin("a")
+        cache.get_entry("a").last_used -= 120
+        cache.unpin("a")
+
+        assert cache.evict_idle() == []
+        assert unloaded == []
+
+    @pytest.mark.unit
+    def test_shared_weights_count_once_towards_the_budget(self):
+        """Test that a wrapper holding another namespace's model adds no usage."""
+        unloaded = []
+        cache = ModelCacheManager(unloaded.append, ram_budget=MB)
+        model = _model(1)
+
+        class Pipeline:
+            def __init__(self):
+                self.model = model
+
+        cache.record_load("a", "a-model", model, 1.0)
+        cache.record_load("a-pipe", "a-model", Pipeline(), 1.0)
+
+        assert unloaded == []
+        assert cache.stats()["ram_bytes"] == MB
+        assert cache.get_entry("a-pipe").ram_bytes == MB
+
+    @pytest.mark.unit
+    def test_stats_track_hits_misses_and_load_time(self):
+        """Test hit/miss counters and average load time."""
+        cache = ModelCacheManager(lambda namespace: None)
+
+        cache.record_miss("a", "a-model")
+        cache.record_load("a", "a-model", _model(1), 3.0)
+        cache.record_hit("a")
+        stats = cache.stats()
+
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["avg_load_seconds"] == 3.0
+        assert stats["ram_bytes"] == MB
@@ -0,0 +1,177 @@
+"""
+Unit tests for tts_webui.utils.model_pool module.
+"""
+
+import threading
+import time
+
+import pytest
+
+from tts_webui.utils.manage_model_state import model_pools, unload_model
+from tts_webui.utils.model_pool import manage_model_pool
+from tts_webui.utils.model_preload import model_loaders
+
+
+@pytest.fixture
+def make_pool():
+    """Create pools under test namespaces and remove them afterwards."""
+    namespaces = []
+
+    def make(size):
+        namespace = f"test-pool-{len(namespaces)}"
+        namespaces.append(namespace)
+        loads = []
+
+        @manage_model_pool(namespace, size=size)
+        def load(model_name):
+            loads.append(model_name)
+            return {"name": model_name, "replica": len(loads)}
+
+        return load, loads
+
+    yield make
+    for namespace in namespaces:
+        unload_model(namespace, silent=True)
+        model_pools.pop(namespace, None)
+        model_loaders.pop(namespace, None)
+
+
+class TestModelPool:
+    """Tests for the ModelPool class."""
+
+    @pytest.mark.unit
+    def test_replicas_are_reused(self, make_pool):
+        """Test that sequential checkouts reuse a single replica."""
+        load, loads = make_pool(size=2)
+        for _ in range(3):
+            with load("m") as model:
+                assert model["name"] == "m"
+        assert loads == ["m"]
+
+    @pytest.mark.unit
+    def test_concurrent_checkouts_use_separate_replicas(self, make_pool):
+        """Test that concurrent requests get distinct replicas up to the pool size."""
+        load, loads = make_pool(size=2)
+        checked_out = threading.Barrier(2, timeout=5)
+        replicas = []
+
+        def infer():
+            with load("m") as model:
+                replicas.append(model["replica"])
+                checked_out.wait()
+
+        threads = [threading.Thread(target=infer) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=5)
+
+        assert sorted(replicas) == [1, 2]
+        assert load.pool.stats()["replicas"] == 2
+
+    @pytest.mark.unit
+    def test_pool_size_is_a_limit(self, make_pool):
+        """Test that requests beyond the pool size wait for a free replica."""
+        load, loads = make_pool(size=1)
+        release = threading.Event()
+        in_use = threading.Event()
+        done = []
+
+        def hold():
+            with load("m"):
+                in_use.set()
+                release.wait(timeout=5)
+
+        def wait_for_replica():
+            with load("m") as model:
+                done.append(model["replica"])
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        in_use.wait(timeout=5)
+        waiter = threading.Thread(target=wait_for_replica)
+        waiter.start()
+        time.sleep(0.05)
+        assert done == []
+
+        release.set()
+        holder.join(timeout=5)
+        waiter.join(timeout=5)
+        assert done == [1]
+        assert loads == ["m"]
+
+    @pytest.mark.unit
+    def test_switching_model_replaces_replicas(self, make_pool):
+        """Test that requesting another model discards the previous replicas."""
+        load, loads = make_pool(size=2)
+        with load("a"):
+            pass
+        with load("b") as model:
+            assert model["name"] == "b"
+        assert loads == ["a", "b"]
+        assert load.pool.stats()["replicas"] == 1
+
+    @pytest.mark.unit
+    def test_unload_model_clears_pool(self, make_pool):
+        """Test that unload_model works for pooled namespaces."""
+        load, _ = make_pool(size=2)
+        with load("m"):
+            pass
+        assert unload_model(load.pool.model_namespace, silent=True)
+        assert load.pool.stats()["replicas"] == 0
+
+    @pytest.mark.unit
+    def test_eviction_during_checkout_does_not_deadlock(self, make_pool):
+        """Test that the cache can evict a pool while a checkout records its hit."""
+        from tts_webui.utils.manage_model_state import get_model_cache
+
+        load, _ = make_pool(size=1)
+        with load("m"):
+            pass
+        model_cache = get_model_cache()
+        results = []
+
+        def checkout():
+            with load("m"):
+                pass
+
+        def evict():
+            # Like _enforce_budget, which evicts with the cache lock held
+            with model_cache._lock:
+                checkout_thread.start()
+                time.sleep(0.1)
+                results.append(load.pool.clear(wait=False))
+
+        checkout_thread = threading.Thread(target=checkout)
+        evict_thread = threading.Thread(target=evict)
+        evict_thread.start()
+        evict_thread.join(timeout=5)
+        checkout_thread.join(timeout=5)
+
+        assert not evict_thread.is_alive()
+        assert not checkout_thread.is_alive()
+        assert results == [False]
+
+    @pytest.mark.unit
+    def test_clear_without_wait_does_not_block_on_the_lock(self, make_pool):
+        """Test that clear(wait=False) gives up while another thread holds the pool."""
+        load, _ = make_pool(size=1)
+        with load("m"):
+            pass
+        locked = threading.Event()
+        release = threading.Event()
+
+        def hold_lock():
+            with load.pool._cond:
+                locked.set()
+                release.wait(timeout=5)
+
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        locked.wait(timeout=5)
+        try:
+            assert load.pool.clear(wait=False) is False
+        finally:
+            release.set()
+            holder.join(timeout=5)
+        assert load.pool.clear(wait=False) is True
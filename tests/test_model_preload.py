@@ -0,0 +1,146 @@
+"""
+Unit tests for tts_webui.utils.model_preload module.
+"""
+
+import sys
+from unittest.mock import patch
+
+import gradio as gr
+import pytest
+
+from tts_webui.config.config import config
+from tts_webui.utils.manage_model_state import (
+    is_model_loaded,
+    list_loaded_models_as_markdown,
+    manage_model_state,
+    model_pools,
+    unload_model,
+)
+from tts_webui.utils.model_pool import manage_model_pool
+from tts_webui.utils.model_preload import (
+    model_loaders,
+    preload_extension_on_select,
+    preload_model,
+    preload_status,
+    register_warmup,
+    start_model_preload,
+)
+
+
+@pytest.fixture
+def test_namespace():
+    """Register a loader under a test namespace and clean it up afterwards."""
+    loads = []
+
+    @manage_model_state("test-preload")
+    def load(model_name):
+        loads.append(model_name)
+        return object()
+
+    yield loads
+    unload_model("test-preload", silent=True)
+    preload_status.pop("test-preload", None)
+
+
+@pytest.fixture
+def lazy_extension(temp_dir, monkeypatch):
+    """An extension package that registers its loader only when imported."""
+    package = temp_dir / "extension_preload_test"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "main.py").write_text(
+        "from tts_webui.utils.manage_model_state import manage_model_state\n"
+        "@manage_model_state('test-preload-lazy')\n"
+        "def load(model_name):\n"
+        "    return object()\n"
+    )
+    monkeypatch.syspath_prepend(str(temp_dir))
+    yield "extension_preload_test"
+    unload_model("test-preload-lazy", silent=True)
+    model_loaders.pop("test-preload-lazy", None)
+    preload_status.pop("test-preload-lazy", None)
+    sys.modules.pop("extension_preload_test.main", None)
+    sys.modules.pop("extension_preload_test", None)
+
+
+class TestModelPreload:
+    """Tests for background model preloading."""
+
+    @pytest.mark.unit
+    def test_preload_loads_and_warms_up(self, test_namespace):
+        """Test that preloading loads the model once and runs its warmup."""
+        warmed_up = []
+        register_warmup("test-preload")(warmed_up.append)
+
+        assert preload_model("test-preload", "small", warmup=True)
+
+        assert test_namespace == ["small"]
+        assert warmed_up == ["small"]
+        assert is_model_loaded("test-preload")
+        assert preload_status["test-preload"]["status"] == "ready"
+
+    @pytest.mark.unit
+    def test_unknown_namespace_is_reported(self):
+        """Test that preloading an unregistered namespace fails gracefully."""
+        assert not preload_model("test-missing", "x")
+        assert preload_status.pop("test-missing")["status"] == "unknown namespace"
+
+    @pytest.mark.unit
+    def test_start_model_preload_runs_in_background(self, test_namespace):
+        """Test that config entries are loaded by a background thread."""
+        thread = start_model_preload(["test-preload:large"])
+        thread.join(timeout=5)
+
+        assert test_namespace == ["large"]
+        assert "| test-preload | large | ready" in list_loaded_models_as_markdown()
+
+    @pytest.mark.unit
+    def test_no_entries_starts_nothing(self):
+        """Test that an empty preload list does not start a thread."""
+        assert start_model_preload([]) is None
+
+    @pytest.mark.unit
+    def test_extension_is_imported_before_preloading(self, lazy_extension):
+        """Test that preloading a lazily built extension imports it first."""
+        assert preload_model("test-preload-lazy", "x", extension=lazy_extension)
+
+        assert is_model_loaded("test-preload-lazy")
+
+    @pytest.mark.unit
+    def test_pools_can_be_preloaded(self):
+        """Test that preloading a pooled namespace fills one replica."""
+        loads = []
+
+        @manage_model_pool("test-preload-pool", size=2)
+        def load(model_name):
+            loads.append(model_name)
+            return object()
+
+        try:
+            assert preload_model("test-preload-pool", "small")
+            assert loads == ["small"]
+            assert model_pools["test-preload-pool"].stats()["replicas"] == 1
+        finally:
+            unload_model("test-preload-pool", silent=True)
+            model_pools.pop("test-preload-pool", None)
+            model_loaders.pop("test-preload-pool", None)
+            preload_status.pop("test-preload-pool", None)
+
+    @pytest.mark.unit
+    def test_tab_select_preloads_configured_models(self, monkeypatch):
+        """Test that an extension tab preloads the models configured for it."""
+        monkeypatch.setitem(
+            config,
+            "model_preload",
+            {"on_select": {"extension_test": ["test-preload:small"]}},
+        )
+
+        with patch("tts_webui.utils.model_preload.preload_on_select") as on_select:
+            with gr.Blocks():
+                with gr.Tab("Test") as tab:
+                    preload_extension_on_select(tab, "extension_test")
+                    preload_extension_on_select(tab, "extension_other")
+
+        on_select.assert_called_once_with(
+            tab, "test-preload", "small", False, "extension_test"
+        )
@@ -0,0 +1,126 @@
+"""
+Unit tests for tts_webui.utils.output_watcher module.
+"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from tts_webui.utils.output_watcher import OutputWatcher
+
+
+@pytest.fixture
+def watched(temp_dir):
+    outputs = temp_dir / "outputs"
+    collections = temp_dir / "collections"
+    (outputs / "2024-01-01_10-00-00__bark__None").mkdir(parents=True)
+    (collections / "voices").mkdir(parents=True)
+    watcher = OutputWatcher(
+        directories=[str(outputs), str(collections)],
+        nested=[str(collections)],
+        debounce=0,
+        use_watchdog=False,
+    )
+    changes = []
+    watcher.add_listener(changes.append)
+    # Listed without starting the thread, tests call check() themselves
+    for directory in watcher.directories:
+        watcher._watch(directory)
+    return watcher, changes, outputs, collections
+
+
+class TestOutputWatcher:
+    """Tests for the OutputWatcher class."""
+
+    @pytest.mark.unit
+    def test_added_and_removed_generations_are_reported(self, watched):
+        """Test that a check reports what changed since the last listing."""
+        watcher, changes, outputs, _ = watched
+        (outputs / "2024-01-02_10-00-00__bark__None").mkdir()
+        (outputs / "2024-01-01_10-00-00__bark__None").rmdir()
+
+        watcher.check()
+        watcher.check()
+
+        (change,) = changes
+        assert change.directory == str(outputs)
+        assert change.added == {"2024-01-02_10-00-00__bark__None"}
+        assert change.removed == {"2024-01-01_10-00-00__bark__None"}
+        assert change.mtime_ns == os.stat(outputs).st_mtime_ns
+        assert watcher.version(str(outputs)) == 1
+
+    @pytest.mark.unit
+    def test_changes_wait_for_the_debounce(self, watched):
+        """Test that nothing is reported while a directory is still changing."""
+        watcher, changes, outputs, _ = watched
+        watcher.debounce = 60
+        (outputs / "2024-01-02_10-00-00__bark__None").mkdir()
+
+        watcher.check()
+
+        assert changes == []
+        assert watcher.version(str(outputs)) == 0
+
+    @pytest.mark.unit
+    def test_short_lived_entries_cancel_out(self, watched):
+        """Test that an entry added and removed within the debounce is not reported."""
+        watcher, changes, outputs, _ = watched
+        watcher.debounce = 60
+        (outputs / "tmp").mkdir()
+        watcher.check()
+        (outputs / "tmp").rmdir()
+        watcher.check()
+        watcher.debounce = 0
+
+        watcher.check()
+
+        assert changes == []
+
+    @pytest.mark.unit
+    def test_new_collections_are_watched(self, watched):
+        """Test that generations saved into a new collection are reported."""
+        watcher, changes, _, collections = watched
+        (collections / "new").mkdir()
+        watcher.check()
+        (collections / "new" / "2024-01-03_10-00-00__bark__None").mkdir()
+
+        watcher.check()
+
+        assert [(c.directory, c.added) for c in changes] == [
+            (str(collections), {"new"}),
+            (str(collections / "new"), {"2024-01-03_10-00-00__bark__None"}),
+        ]
+
+    @pytest.mark.unit
+    def test_failing_listener_does_not_stop_others(self, watched):
+        """Test that every listener gets the change even if one raises."""
+        watcher, changes, outputs, _ = watched
+        watcher._listeners.insert(0, lambda change: 1 / 0)
+        (outputs / "2024-01-02_10-00-00__bark__None").mkdir()
+
+        watcher.check()
+
+        assert len(changes) == 1
+
+
+class TestStartOutputWatcher:
+    """Tests for start_output_watcher."""
+
+    @pytest.mark.unit
+    def test_database_is_not_synced_by_default(self, temp_dir, monkeypatch):
+        """Test that the watcher leaves the database alone unless enabled."""
+        from tts_webui.history_tab.collections_directories_atom import set_collections
+        from tts_webui.utils import output_watcher
+
+        monkeypatch.chdir(temp_dir)
+        (temp_dir / "collections").mkdir()
+        monkeypatch.setattr(output_watcher, "_watcher", None)
+        with patch("tts_webui.database.connection.init_db") as init_db:
+            watcher = output_watcher.start_output_watcher()
+        try:
+            init_db.assert_not_called()
+            assert output_watcher.update_database not in watcher._listeners
+        finally:
+            watcher.stop()
+            set_collections(None)
@@ -0,0 +1,77 @@
+"""
+Unit tests for tts_webui.utils.startup_cache module.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from tts_webui.config.config import config
+from tts_webui.utils import startup_cache as startup_cache_module
+from tts_webui.utils.startup_cache import StartupCache
+
+
+@pytest.fixture
+def cache_path(temp_dir):
+    with patch.object(StartupCache, "is_enabled", return_value=True):
+        yield str(temp_dir / "cache" / "startup_cache.json")
+
+
+class TestStartupCache:
+    """Tests for the StartupCache class."""
+
+    @pytest.mark.unit
+    def test_values_persist_across_instances(self, cache_path):
+        """Test that saved sections are restored by a new process."""
+        cache = StartupCache(cache_path)
+        cache.set("extension_discovery", {"pkg": {"is_installed": True}})
+        cache.save()
+
+        assert StartupCache(cache_path).get("extension_discovery") == {
+            "pkg": {"is_installed": True}
+        }
+
+    @pytest.mark.unit
+    def test_fingerprint_change_discards_cache(self, cache_path):
+        """Test that a different fingerprint (e.g. a new package) drops all data."""
+        cache = StartupCache(cache_path)
+        cache.set("extension_discovery", {"pkg": {}})
+        cache.save()
+
+        with patch.object(
+            startup_cache_module, "compute_fingerprint", return_value="changed"
+        ):
+            assert StartupCache(cache_path).get("extension_discovery") is None
+
+    @pytest.mark.unit
+    def test_disabled_cache_is_inert(self, temp_dir):
+        """Test that nothing is read or written unless enabled in config."""
+        path = str(temp_dir / "startup_cache.json")
+        with patch.object(StartupCache, "is_enabled", return_value=False):
+            cache = StartupCache(path)
+            cache.set("section", 1)
+            cache.save()
+            assert cache.get("section") is None
+        assert not (temp_dir / "startup_cache.json").exists()
+
+    @pytest.mark.unit
+    def test_unrelated_settings_keep_the_cache(self, cache_path, monkeypatch):
+        """Test that editing settings discovery does not use keeps its results."""
+        cache = StartupCache(cache_path)
+        cache.set("extension_discovery", {"pkg": {}})
+        cache.save()
+
+        monkeypatch.setitem(config, "model_cache", {"ram_budget_gb": 8})
+
+        assert StartupCache(cache_path).get("extension_discovery") == {"pkg": {}}
+
+    @pytest.mark.unit
+    def test_disabling_an_extension_discards_the_cache(self, cache_path, monkeypatch):
+        """Test that the extension settings are part of the fingerprint."""
+        cache = StartupCache(cache_path)
+        cache.set("extension_discovery", {"pkg": {}})
+        cache.save()
+
+        monkeypatch.setitem(config, "extensions", {"disabled": ["pkg"]})
+
+        assert StartupCache(cache_path).get("extension_discovery") is None
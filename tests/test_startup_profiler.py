@@ -0,0 +1,75 @@
+"""
+Unit tests for tts_webui.utils.startup_profiler module.
+"""
+
+import json
+import sys
+
+import pytest
+
+from tts_webui.utils.startup_profiler import StartupProfiler, load_history
+
+
+@pytest.fixture
+def fake_modules(temp_dir, monkeypatch):
+    """Two importable modules, one importing the other."""
+    (temp_dir / "profiler_test_outer.py").write_text("import profiler_test_inner\n")
+    (temp_dir / "profiler_test_inner.py").write_text("import time\ntime.sleep(0.02)\n")
+    monkeypatch.syspath_prepend(str(temp_dir))
+    yield
+    sys.modules.pop("profiler_test_outer", None)
+    sys.modules.pop("profiler_test_inner", None)
+
+
+class TestStartupProfiler:
+    """Tests for the StartupProfiler class."""
+
+    @pytest.mark.unit
+    def test_imports_are_attributed_to_phases(self, fake_modules):
+        """Test that imports get self/cumulative times and the current phase."""
+        profiler = StartupProfiler()
+        profiler.start()
+        try:
+            with profiler.phase("Outer Extension", "extension"):
+                import profiler_test_outer  # noqa: F401
+        finally:
+            profiler.stop()
+
+        inner = profiler.imports["profiler_test_inner"]
+        outer = profiler.imports["profiler_test_outer"]
+        assert inner["parent"] == "profiler_test_outer"
+        assert inner["self"] >= 0.02
+        assert outer["cumulative"] >= inner["cumulative"]
+        assert outer["self"] < inner["self"]
+
+        (phase,) = profiler.report()["phases"]
+        assert phase["name"] == "Outer Extension"
+        assert phase["top_imports"][0][0] == "profiler_test_outer"
+
+    @pytest.mark.unit
+    def test_disabled_profiler_records_nothing(self):
+        """Test that phases are no-ops unless profiling was started."""
+        profiler = StartupProfiler()
+        with profiler.phase("ignored"):
+            pass
+        assert profiler.phases == []
+        assert profiler.finish() is None
+
+    @pytest.mark.unit
+    def test_finish_writes_reports_and_history(self, temp_dir):
+        """Test that each run writes JSON/HTML reports and appends to history."""
+        for _ in range(2):
+            profiler = StartupProfiler()
+            profiler.start()
+            with profiler.phase("Gradio blocks", "blocks"):
+                pass
+            html_path = profiler.finish(output_dir=str(temp_dir))
+
+        history = load_history(str(temp_dir))
+        assert len(history) == 2
+        assert "Gradio blocks" in history[0]["phases"]
+        with open(temp_dir / history[-1]["report"]) as f:
+            assert "time_to_listen" in json.load(f)
+        with open(html_path) as f:
+            assert "Previous runs" in f.read()
+        assert (temp_dir / "latest.html").exists()
@@ -0,0 +1,94 @@
+"""
+Unit tests for tts_webui.utils.torch_load_patch module.
+"""
+
+import os
+
+import pytest
+import torch
+
+from tts_webui.utils import torch_load_patch
+from tts_webui.utils.torch_load_patch import (
+    apply_torch_load_patch,
+    restore_original_torch_load,
+    weight_cache,
+)
+
+
+@pytest.fixture
+def patched(temp_dir):
+    """Apply the patch with mmap and a weight cache, and undo it afterwards."""
+    weight_cache.clear()
+    apply_torch_load_patch(mmap=True, weight_cache_gb=1)
+    yield temp_dir
+    restore_original_torch_load()
+    torch_load_patch.configure_torch_load(mmap=False, weight_cache_gb=0)
+
+
+def _save_state_dict(path, value=1.0):
+    torch.save({"weight": torch.full((4, 4), value)}, path)
+    return path
+
+
+class TestTorchLoadPatch:
+    """Tests for the patched torch.load."""
+
+    @pytest.mark.unit
+    def test_state_dicts_are_cached(self, patched):
+        """Test that reloading an unchanged file is served from the cache."""
+        path = _save_state_dict(str(patched / "model.pt"))
+
+        first = torch.load(path)
+        second = torch.load(path)
+
+        assert torch.equal(first["weight"], second["weight"])
+        assert first is not second
+        assert weight_cache.stats()["hits"] == 1
+
+    @pytest.mark.unit
+    def test_modified_files_are_reloaded(self, patched):
+        """Test that the cache key includes the file's modification time and size."""
+        path = str(patched / "model.pt")
+        _save_state_dict(path, 1.0)
+        torch.load(path)
+
+        _save_state_dict(path, 2.0)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert torch.load(path)["weight"][0, 0] == 2.0
+
+    @pytest.mark.unit
+    def test_modules_are_not_cached(self, patched):
+        """Test that pickled modules are loaded fresh every time."""
+        path = str(patched / "module.pt")
+        torch.save(torch.nn.Linear(2, 2), path)
+
+        assert torch.load(path) is not torch.load(path)
+        assert weight_cache.stats()["entries"] == 0
+
+    @pytest.mark.unit
+    def test_file_objects_bypass_the_cache(self, patched):
+        """Test that loading from a file object still works and is not cached."""
+        path = _save_state_dict(str(patched / "model.pt"))
+        with open(path, "rb") as f:
+            assert "weight" in torch.load(f)
+        assert weight_cache.stats()["entries"] == 0
+
+    @pytest.mark.unit
+    def test_weights_off_the_cpu_are_not_cached(self, patched):
+        """Test that state dicts loaded to another device are not kept alive."""
+        path = _save_state_dict(str(patched / "model.pt"))
+
+        assert torch.load(path, map_location="meta")["weight"].is_meta
+        assert weight_cache.stats()["entries"] == 0
+
+    @pytest.mark.unit
+    def test_nested_dicts_are_not_shared(self, patched):
+        """Test that editing a loaded state dict does not change the cached one."""
+        path = str(patched / "model.pt")
+        torch.save({"model": {"weight": torch.ones(2)}}, path)
+
+        torch.load(path)["model"].pop("weight")
+
+        assert "weight" in torch.load(path)["model"]
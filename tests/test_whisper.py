@@ -0,0 +1,90 @@
+"""
+Unit tests for the Whisper extension's transcription path.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Ensure project root is on sys.path so 'extensions' is importable
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+
+from extensions.builtin.extension_whisper import main as whisper
+from tts_webui.config.config import config
+from tts_webui.utils.manage_model_state import unload_model
+from tts_webui.workers.model_worker import _import_target
+
+
+class FakePipe:
+    """Stands in for a transformers pipeline; each call waits for a second one."""
+
+    def __init__(self, barrier, replicas):
+        self.barrier = barrier
+        self.replicas = replicas
+
+    def __call__(self, inputs, **kwargs):
+        self.replicas.append(self)
+        self.barrier.wait()
+        return [{"text": x} for x in inputs]
+
+
+@pytest.fixture
+def cpu_pool(monkeypatch):
+    barrier = threading.Barrier(2, timeout=5)
+    replicas = []
+    pool = whisper.get_cpu_pipe.pool
+    monkeypatch.setattr(pool, "load_fn", lambda name: FakePipe(barrier, replicas))
+    monkeypatch.setattr(pool, "size", 2)
+    monkeypatch.setattr(whisper, "_device", lambda: "cpu")
+    yield replicas
+    unload_model("whisper-pipe-cpu", silent=True)
+
+
+class TestTranscribe:
+    """Tests for Whisper transcription through the scheduler and model pool."""
+
+    @pytest.mark.unit
+    def test_concurrent_cpu_transcriptions_use_two_replicas(self, cpu_pool):
+        """Test that two CPU batches run at once, each on its own replica."""
+        results = []
+
+        def transcribe(inputs):
+            results.append(whisper.transcribe(inputs, "openai/whisper-tiny.en"))
+
+        first = threading.Thread(target=transcribe, args=("a.wav",))
+        first.start()
+        # Past the micro-batching window, so the second request is its own batch
+        time.sleep(0.2)
+        second = threading.Thread(target=transcribe, args=("b.wav",))
+        second.start()
+        first.join(timeout=10)
+        second.join(timeout=10)
+
+        assert sorted(results) == ["a.wav", "b.wav"]
+        assert len({id(pipe) for pipe in cpu_pool}) == 2
+
+    @pytest.mark.unit
+    def test_model_workers_config_runs_batches_in_workers(self, monkeypatch):
+        """Test that "model_workers": {"whisper": n} sends batches to a worker pool."""
+        calls = []
+
+        class FakePool:
+            def call(self, *args):
+                calls.append(args)
+                return ["text"]
+
+        def get_worker_pool(target, processes):
+            assert _import_target(target) is whisper._run_pipe
+            assert processes == 2
+            return FakePool()
+
+        monkeypatch.setitem(config, "model_workers", {"whisper": 2})
+        monkeypatch.setattr(whisper, "get_worker_pool", get_worker_pool)
+        monkeypatch.setattr(whisper, "_device", lambda: "cpu")
+
+        assert whisper.transcribe("a.wav", "openai/whisper-tiny.en") == "text"
+        assert calls == [("openai/whisper-tiny.en", [{"inputs": "a.wav"}], "cpu")]
@@ -0,0 +1,109 @@
+"""
+Tests for tts_webui.workers module.
+"""
+
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from tts_webui.workers import (
+    ModelWorker,
+    ModelWorkerPool,
+    WorkerError,
+    read_shared_audio,
+    release_segments,
+    write_shared_audio,
+)
+from tts_webui.workers.shared_audio import decode_result, encode_result
+
+
+class TestSharedAudio:
+    """Tests for shared memory array transport."""
+
+    @pytest.mark.unit
+    def test_round_trip(self):
+        """Test that an array survives a write/read through shared memory."""
+        audio = np.linspace(-1, 1, 16000, dtype=np.float32)
+        segments = []
+        descriptor = write_shared_audio(audio, segments)
+
+        result = read_shared_audio(descriptor)
+        release_segments(segments)
+
+        assert result.dtype == np.float32
+        np.testing.assert_array_equal(result, audio)
+        assert segments == []
+
+    @pytest.mark.unit
+    def test_unacknowledged_segments_are_unlinked(self):
+        """Test that the writer removes segments the reader never mapped."""
+        segments = []
+        descriptor = write_shared_audio(np.zeros(4, dtype=np.int16), segments)
+
+        release_segments(segments, acknowledged=False)
+
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=descriptor["name"])
+
+    @pytest.mark.unit
+    def test_encode_result_replaces_nested_arrays(self):
+        """Test that arrays inside tuples and dicts are encoded and decoded."""
+        value = {"audio_out": (24000, np.arange(10, dtype=np.int16)), "text": "hi"}
+
+        segments = []
+        encoded = encode_result(value, segments)
+        assert isinstance(encoded["audio_out"][1], dict)
+
+        decoded = decode_result(encoded)
+        release_segments(segments)
+        assert decoded["text"] == "hi"
+        assert decoded["audio_out"][0] == 24000
+        np.testing.assert_array_equal(decoded["audio_out"][1], np.arange(10))
+
+
+class TestModelWorker:
+    """Tests for worker processes."""
+
+    @pytest.mark.integration
+    def test_call_returns_array_from_worker(self):
+        """Test that a worker process runs the target and returns its array."""
+        worker = ModelWorker("numpy:ones")
+        try:
+            result = worker.call((2, 3), dtype="float32")
+            np.testing.assert_array_equal(result, np.ones((2, 3), dtype=np.float32))
+            # The process is reused for later calls
+            process = worker._process
+            worker.call(4)
+            assert worker._process is process
+        finally:
+            worker.stop()
+
+    @pytest.mark.integration
+    def test_errors_are_raised_in_caller(self):
+        """Test that exceptions in the worker surface as WorkerError."""
+        pool = ModelWorkerPool("math:sqrt", processes=1)
+        try:
+            assert pool.call(4) == 2.0
+            with pytest.raises(WorkerError, match="ValueError"):
+                pool.call(-1)
+        finally:
+            pool.stop()
+
+    @pytest.mark.integration
+    def test_calls_time_out(self):
+        """Test that a call without an answer stops the worker and raises."""
+        worker = ModelWorker("time:sleep", call_timeout=0.5)
+        try:
+            with pytest.raises(WorkerError, match="did not answer"):
+                worker.call(30)
+            assert not worker.is_alive()
+        finally:
+            worker.stop()
+
+    @pytest.mark.integration
+    def test_unknown_target_fails_to_start(self):
+        """Test that an unimportable target raises WorkerError."""
+        worker = ModelWorker("tts_webui_missing_module:fn", start_timeout=30)
+        with pytest.raises(WorkerError, match="failed to start"):
+            worker.call()
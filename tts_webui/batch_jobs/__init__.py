@@ -0,0 +1,23 @@
+"""
+TTS WebUI Batch Jobs
+
+Persistent, resumable batch generation from JSONL manifests.
+"""
+
+from .manifest import ManifestError, load_manifest, parse_manifest
+from .runner import (
+    BatchJobRunner,
+    get_batch_handlers,
+    get_batch_runner,
+    register_batch_handler,
+)
+
+__all__ = [
+    "ManifestError",
+    "load_manifest",
+    "parse_manifest",
+    "BatchJobRunner",
+    "get_batch_handlers",
+    "get_batch_runner",
+    "register_batch_handler",
+]
@@ -0,0 +1,48 @@
+"""
+Batch Job Manifests
+
+A manifest is JSONL: one JSON object per line with the generation parameters
+of one item. Blank lines and lines starting with '#' are ignored.
+
+    {"text": "Hello there.", "voice": "af_heart"}
+    {"text": "General Kenobi!", "voice": "am_adam", "seed": 42}
+
+An item may also wrap its parameters as {"params": {...}}.
+"""
+
+import json
+from typing import Any, Dict, Iterable, List
+
+
+class ManifestError(ValueError):
+    """Raised when a manifest line cannot be parsed."""
+
+
+def parse_manifest_lines(lines: Iterable[str]) -> List[Dict[str, Any]]:
+    """Parse manifest lines into a list of parameter dicts."""
+    items = []
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ManifestError(f"Line {line_number}: invalid JSON ({e.msg})")
+        if not isinstance(item, dict):
+            raise ManifestError(f"Line {line_number}: expected a JSON object")
+        if isinstance(item.get("params"), dict):
+            item = item["params"]
+        items.append(item)
+    return items
+
+
+def parse_manifest(text: str) -> List[Dict[str, Any]]:
+    """Parse a JSONL manifest string."""
+    return parse_manifest_lines(text.splitlines())
+
+
+def load_manifest(path: str) -> List[Dict[str, Any]]:
+    """Load a JSONL manifest file."""
+    with open(path, "r", encoding="utf-8") as f:
+        return parse_manifest_lines(f)
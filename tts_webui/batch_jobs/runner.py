@@ -0,0 +1,310 @@
+"""
+Batch Job Runner
+
+Processes persistent batch jobs with a worker pool. Every item is
+checkpointed in the database as soon as it finishes, so a job interrupted
+by a crash or restart resumes from the first unfinished item.
+
+Handlers are regular generation functions (usually already wrapped by the
+generation decorators) registered under a name. Items are generated in a
+job_context() with the "batch" priority, so handlers that go through the
+job scheduler queue behind interactive and API work:
+
+    @register_batch_handler("minimax_cloud_tts")
+    @scheduled(model="minimax")
+    def generate(text, model, voice_id, **kwargs): ...
+
+Jobs whose handler is not registered yet (its extension has not been
+loaded) keep their status and start once the handler is registered.
+Parameters are stored as given, so secrets such as API keys are dropped
+from them; handlers read those from the environment instead.
+"""
+
+import datetime
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from tts_webui.scheduler import job_context
+from tts_webui.scheduler.job_scheduler import DEFAULT_CLIENT_ID, current_job_context
+
+_batch_handlers: Dict[str, Callable] = {}
+
+# Never written to the database with the item parameters
+SECRET_PARAMS = ("api_key",)
+# Jobs in these states are finished and cannot be paused or cancelled
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
+
+def register_batch_handler(name: str):
+    """Decorator to make a generation function available to batch jobs."""
+
+    def decorator(fn):
+        _batch_handlers[name] = fn
+        if _runner is not None:
+            _runner.resume_waiting(name)
+        return fn
+
+    return decorator
+
+
+def get_batch_handlers() -> List[str]:
+    return sorted(_batch_handlers)
+
+
+def _to_json_safe(value: Any) -> Any:
+    """Keep the JSON-serializable parts of a generation result (paths, metadata)."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, dict):
+        out = {}
+        for k, v in value.items():
+            safe = _to_json_safe(v)
+            if safe is not None or v is None:
+                out[str(k)] = safe
+        return out
+    if isinstance(value, (list, tuple)):
+        return [_to_json_safe(v) for v in value]
+    # Audio arrays, tensors, bytes and other binary results stay on disk only
+    return None
+
+
+def _call_handler(handler: Callable, params: Dict[str, Any]) -> Any:
+    result = handler(**params)
+    if inspect.isgenerator(result):
+        last = None
+        for partial in result:
+            if partial is not None:
+                last = partial
+        return last
+    return result
+
+
+class BatchJobRunner:
+    """Runs batch jobs in background threads, one worker pool per job."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._active: Dict[int, threading.Thread] = {}
+        # handler name -> unfinished jobs waiting for it to be registered
+        self._waiting: Dict[str, List[int]] = {}
+
+    def submit(
+        self,
+        handler: str,
+        items: List[Dict[str, Any]],
+        name: Optional[str] = None,
+        workers: int = 1,
+        user_id: int = 1,
+    ) -> int:
+        """Persist a new job with its items and start processing it."""
+        from tts_webui.database.connection import init_db
+        from tts_webui.database.models import BatchJob, BatchJobItem
+
+        if handler not in _batch_handlers:
+            raise KeyError(f"Unknown batch handler: {handler}")
+        if not items:
+            raise ValueError("Batch job manifest has no items")
+
+        items = [
+            {k: v for k, v in item.items() if k not in SECRET_PARAMS} for item in items
+        ]
+        init_db()
+        job_id = BatchJob.create(
+            handler=handler, name=name, workers=max(1, workers), user_id=user_id
+        )
+        BatchJobItem.create_many(job_id, items)
+        BatchJob.refresh_counts(job_id)
+        self.start(job_id)
+        return job_id
+
+    def is_active(self, job_id: int) -> bool:
+        thread = self._active.get(job_id)
+        return thread is not None and thread.is_alive()
+
+    def start(self, job_id: int, retry_failed: bool = False) -> bool:
+        """
+        Start (or resume) processing a job. Returns False if it is already running.
+
+        Items are scheduled as batch work of the client in the surrounding
+        job_context(), e.g. the API key that submitted the job, or of the job
+        itself when there is none.
+        """
+        from tts_webui.database.models import BatchJob, BatchJobItem
+
+        client_id = current_job_context()["client_id"]
+        if client_id == DEFAULT_CLIENT_ID:
+            client_id = f"batch-job-{job_id}"
+
+        with self._lock:
+            if self.is_active(job_id):
+                return False
+            # Items left 'running' were interrupted mid-generation
+            BatchJobItem.reset_running(job_id)
+            if retry_failed:
+                BatchJobItem.reset_failed(job_id)
+            BatchJob.set_status(job_id, "running")
+
+            thread = threading.Thread(
+                target=self._run_job,
+                args=(job_id, client_id),
+                daemon=True,
+                name=f"batch-job-{job_id}",
+            )
+            self._active[job_id] = thread
+            thread.start()
+            return True
+
+    def pause(self, job_id: int) -> bool:
+        """
+        Stop claiming new items; items already running finish normally.
+
+        Returns False if the job has already finished.
+        """
+        return self._set_status(job_id, "paused")
+
+    def cancel(self, job_id: int) -> bool:
+        """
+        Cancel a job; items already running finish normally.
+
+        Returns False if the job has already finished.
+        """
+        return self._set_status(job_id, "cancelled")
+
+    def _set_status(self, job_id: int, status: str) -> bool:
+        from tts_webui.database.models import BatchJob
+
+        # Under the lock, so a finishing job cannot complete in between
+        with self._lock:
+            job = BatchJob.get_by_id(job_id)
+            if not job or job["status"] in TERMINAL_STATUSES:
+                return False
+            BatchJob.set_status(job_id, status)
+            return True
+
+    def resume_unfinished(self) -> List[int]:
+        """
+        Restart jobs that were pending or running when the process stopped.
+
+        Jobs whose handler is not registered yet are left as they are and
+        resumed by resume_waiting() when it is.
+        """
+        from tts_webui.database.connection import init_db
+        from tts_webui.database.models import BatchJob
+
+        init_db()
+        ready = []
+        with self._lock:
+            for job in BatchJob.list_unfinished():
+                if job["handler"] in _batch_handlers:
+                    ready.append(job)
+                    continue
+                waiting = self._waiting.setdefault(job["handler"], [])
+                if job["id"] not in waiting:
+                    waiting.append(job["id"])
+                    print(
+                        f"[Batch] Job {job['id']} waits for handler "
+                        f"'{job['handler']}' to be loaded"
+                    )
+        return [job["id"] for job in ready if self._resume(job["id"])]
+
+    def resume_waiting(self, handler: str) -> List[int]:
+        """Resume the unfinished jobs that were waiting for *handler*."""
+        with self._lock:
+            job_ids = self._waiting.pop(handler, [])
+        return [job_id for job_id in job_ids if self._resume(job_id)]
+
+    def _resume(self, job_id: int) -> bool:
+        from tts_webui.database.models import BatchJob
+
+        job = BatchJob.get_by_id(job_id)
+        if not job or job["status"] not in ("pending", "running"):
+            return False
+        # Resumed jobs are queued as their own client, not the caller's
+        with job_context(f"batch-job-{job_id}", priority="batch"):
+            if not self.start(job_id):
+                return False
+        print(f"[Batch] Resuming job {job_id} ({job['name'] or job['handler']})")
+        return True
+
+    def _run_job(self, job_id: int, client_id: str):
+        from tts_webui.database.connection import close_db
+        from tts_webui.database.models import BatchJob
+
+        try:
+            job = BatchJob.get_by_id(job_id)
+            handler = _batch_handlers.get(job["handler"]) if job else None
+            if handler is None:
+                # Its extension may not be installed or loaded, keep the job
+                print(f"[Batch] Job {job_id}: handler not available, pausing")
+                BatchJob.set_status(job_id, "paused")
+                return
+
+            workers = max(1, job["workers"] or 1)
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix=f"batch-job-{job_id}"
+            ) as pool:
+                for _ in range(workers):
+                    pool.submit(self._worker, job_id, handler, client_id)
+
+            with self._lock:
+                BatchJob.refresh_counts(job_id)
+                job = BatchJob.get_by_id(job_id)
+                finished = job["status"] == "running"
+                if finished:
+                    all_failed = job["failed_items"] and not job["completed_items"]
+                    BatchJob.set_status(job_id, "failed" if all_failed else "completed")
+            if finished:
+                print(
+                    f"[Batch] Job {job_id} finished: {job['completed_items']} completed, "
+                    f"{job['failed_items']} failed"
+                )
+        finally:
+            with self._lock:
+                self._active.pop(job_id, None)
+            close_db()
+
+    def _claim(self, job_id: int) -> Optional[Dict[str, Any]]:
+        from tts_webui.database.models import BatchJob, BatchJobItem
+
+        with self._lock:
+            job = BatchJob.get_by_id(job_id)
+            if not job or job["status"] != "running":
+                return None
+            item = BatchJobItem.get_next_pending(job_id)
+            if item:
+                BatchJobItem.mark_running(item["id"])
+            return item
+
+    def _worker(self, job_id: int, handler: Callable, client_id: str):
+        from tts_webui.database.connection import close_db
+        from tts_webui.database.models import BatchJob, BatchJobItem
+
+        try:
+            while (item := self._claim(job_id)) is not None:
+                try:
+                    with job_context(client_id, priority="batch"):
+                        result = _call_handler(handler, item["params"])
+                    BatchJobItem.mark_completed(item["id"], _to_json_safe(result))
+                except Exception as e:
+                    print(f"[Batch] Job {job_id} item {item['item_index']} failed: {e}")
+                    BatchJobItem.mark_failed(item["id"], str(e))
+                BatchJob.refresh_counts(job_id)
+        finally:
+            close_db()
+
+
+_runner: Optional[BatchJobRunner] = None
+
+
+def get_batch_runner() -> BatchJobRunner:
+    global _runner
+    if _runner is None:
+        _runner = BatchJobRunner()
+    return _runner
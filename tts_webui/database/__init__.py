@@ -6,12 +6,21 @@ Provides SQLite database functionality for:
 - User preferences and settings
 - Voice profiles
 - Favorites management
+- Persistent batch generation jobs
 - User authentication (future)
 """
 
 from .connection import close_db, get_db, init_db
 from .decorators import log_generation
-from .models import Favorite, Generation, User, UserPreference, VoiceProfile
+from .models import (
+    BatchJob,
+    BatchJobItem,
+    Favorite,
+    Generation,
+    User,
+    UserPreference,
+    VoiceProfile,
+)
 from .rescan import rescan_outputs
 
 __all__ = [
@@ -23,6 +32,8 @@ __all__ = [
     "VoiceProfile",
     "User",
     "Favorite",
+    "BatchJob",
+    "BatchJobItem",
     "log_generation",
     "rescan_outputs",
 ]
@@ -16,10 +16,27 @@ from typing import Any, Dict, List, Optional
 import uvicorn
 from fastapi import Depends, FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
+from tts_webui.batch_jobs import (
+    ManifestError,
+    get_batch_handlers,
+    get_batch_runner,
+    parse_manifest,
+)
+from tts_webui.scheduler import QueueFullError, get_scheduler, job_context
+
 from .connection import get_db_path, init_db
-from .models import ApiKey, Favorite, Generation, UserPreference, VoiceProfile
+from .models import (
+    ApiKey,
+    BatchJob,
+    BatchJobItem,
+    Favorite,
+    Generation,
+    UserPreference,
+    VoiceProfile,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -116,6 +133,13 @@ class BulkPreferences(BaseModel):
     preferences: Dict[str, Dict[str, Any]]
 
 
+class BatchJobCreate(BaseModel):
+    handler: str
+    manifest: str  # JSONL, one item per line
+    name: Optional[str] = None
+    workers: int = 1
+
+
 class MessageResponse(BaseModel):
     message: str
 
@@ -146,9 +170,22 @@ def generate_api_key() -> tuple[str, str, str]:
 class AuthContext:
     """Authentication context for the current request."""
 
-    def __init__(self, user_id: int = 1, is_admin: bool = True):
+    def __init__(
+        self,
+        user_id: int = 1,
+        is_admin: bool = True,
+        client_id: str = "default",
+        priority: str = "interactive",
+    ):
         self.user_id = user_id
         self.is_admin = is_admin
+        # Scheduler identity: API-key clients are queued per key, below interactive users
+        self.client_id = client_id
+        self.priority = priority
+
+    def job_context(self):
+        """Context manager that submits scheduled jobs as this client."""
+        return job_context(self.client_id, self.priority)
 
 
 async def get_auth(
@@ -179,7 +216,10 @@ async def get_auth(
 
             ApiKey.update_last_used(key_record["id"])
             return AuthContext(
-                user_id=key_record["user_id"], is_admin=key_record["is_admin"]
+                user_id=key_record["user_id"],
+                is_admin=key_record["is_admin"],
+                client_id=key_record["key_prefix"],
+                priority="api",
             )
 
     # Default user for unauthenticated requests
@@ -193,9 +233,10 @@ async def get_auth(
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Initialize database on startup."""
+    """Initialize database on startup and resume interrupted batch jobs."""
     init_db()
     logger.info(f"Database initialized at: {get_db_path()}")
+    get_batch_runner().resume_unfinished()
     yield
 
 
@@ -216,6 +257,16 @@ app.add_middleware(
 )
 
 
+@app.exception_handler(QueueFullError)
+async def queue_full_handler(request, exc: QueueFullError):
+    """Reject work turned away by admission control with 429 Too Many Requests."""
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 # ============================================================================
 # Health & Status
 # ============================================================================
@@ -541,6 +592,126 @@ async def rescan_outputs(auth: AuthContext = Depends(get_auth)):
     return result
 
 
+# ============================================================================
+# Batch Jobs API
+# ============================================================================
+
+
+@app.get("/api/batch-jobs/handlers")
+async def list_batch_handlers(auth: AuthContext = Depends(get_auth)):
+    """List generation handlers available to batch jobs."""
+    return {"handlers": get_batch_handlers()}
+
+
+@app.get("/api/batch-jobs")
+async def list_batch_jobs(
+    limit: int = 100,
+    offset: int = 0,
+    status: Optional[str] = None,
+    auth: AuthContext = Depends(get_auth),
+):
+    """List batch jobs."""
+    jobs = BatchJob.list_all(
+        user_id=auth.user_id, status=status, limit=min(limit, 500), offset=offset
+    )
+    return {"jobs": jobs}
+
+
+@app.post("/api/batch-jobs", response_model=IdResponse, status_code=201)
+async def create_batch_job(data: BatchJobCreate, auth: AuthContext = Depends(get_auth)):
+    """Submit a JSONL manifest as a new batch job."""
+    try:
+        items = parse_manifest(data.manifest)
+        with auth.job_context():
+            job_id = get_batch_runner().submit(
+                handler=data.handler,
+                items=items,
+                name=data.name,
+                workers=data.workers,
+                user_id=auth.user_id,
+            )
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except (ManifestError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return IdResponse(id=job_id)
+
+
+def get_own_batch_job(job_id: int, auth: AuthContext) -> dict:
+    """The batch job, if it belongs to the caller (or the caller is an admin)."""
+    job = BatchJob.get_by_id(job_id)
+    if not job or (job["user_id"] != auth.user_id and not auth.is_admin):
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    return job
+
+
+@app.get("/api/batch-jobs/{job_id}")
+async def get_batch_job(job_id: int, auth: AuthContext = Depends(get_auth)):
+    """Get a batch job with its progress counters."""
+    job = get_own_batch_job(job_id, auth)
+    return {**job, "active": get_batch_runner().is_active(job_id)}
+
+
+@app.get("/api/batch-jobs/{job_id}/items")
+async def list_batch_job_items(
+    job_id: int,
+    status: Optional[str] = None,
+    limit: int = 100,
+    offset: int = 0,
+    auth: AuthContext = Depends(get_auth),
+):
+    """List the items of a batch job in manifest order."""
+    get_own_batch_job(job_id, auth)
+    items = BatchJobItem.list_for_job(
+        job_id, status=status, limit=min(limit, 500), offset=offset
+    )
+    return {"items": items}
+
+
+@app.post("/api/batch-jobs/{job_id}/pause", response_model=MessageResponse)
+async def pause_batch_job(job_id: int, auth: AuthContext = Depends(get_auth)):
+    """Pause a batch job after the items currently being generated."""
+    job = get_own_batch_job(job_id, auth)
+    if not get_batch_runner().pause(job_id):
+        raise HTTPException(
+            status_code=409, detail=f"Batch job is already {job['status']}"
+        )
+    return MessageResponse(message="Paused")
+
+
+@app.post("/api/batch-jobs/{job_id}/cancel", response_model=MessageResponse)
+async def cancel_batch_job(job_id: int, auth: AuthContext = Depends(get_auth)):
+    """Cancel a batch job after the items currently being generated."""
+    job = get_own_batch_job(job_id, auth)
+    if not get_batch_runner().cancel(job_id):
+        raise HTTPException(
+            status_code=409, detail=f"Batch job is already {job['status']}"
+        )
+    return MessageResponse(message="Cancelled")
+
+
+@app.post("/api/batch-jobs/{job_id}/resume", response_model=MessageResponse)
+async def resume_batch_job(
+    job_id: int, retry_failed: bool = False, auth: AuthContext = Depends(get_auth)
+):
+    """Resume a paused, cancelled or interrupted batch job."""
+    get_own_batch_job(job_id, auth)
+    with auth.job_context():
+        started = get_batch_runner().start(job_id, retry_failed=retry_failed)
+    return MessageResponse(message="Resumed" if started else "Already running")
+
+
+# ============================================================================
+# Queue API
+# ============================================================================
+
+
+@app.get("/api/queue")
+async def get_queue_stats(auth: AuthContext = Depends(get_auth)):
+    """Get job queue depth and wait time metrics."""
+    return get_scheduler().stats()
+
+
 # ============================================================================
 # Statistics API
 # ============================================================================
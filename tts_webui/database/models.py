@@ -471,3 +471,199 @@ class ApiKey:
         """Revoke an API key."""
         query = "UPDATE api_keys SET is_active = 0 WHERE id = ?"
         return execute_query(query, (key_id,))
+
+
+class BatchJob:
+    """Model for persistent batch generation jobs."""
+
+    @staticmethod
+    def create(
+        handler: str,
+        name: Optional[str] = None,
+        workers: int = 1,
+        user_id: int = 1,
+    ) -> int:
+        """Create a new batch job record."""
+        query = """
+            INSERT INTO batch_jobs (handler, name, workers, user_id)
+            VALUES (?, ?, ?, ?)
+        """
+        return execute_query(query, (handler, name, workers, user_id))
+
+    @staticmethod
+    def get_by_id(job_id: int) -> Optional[Dict[str, Any]]:
+        """Get a batch job by ID."""
+        query = "SELECT * FROM batch_jobs WHERE id = ?"
+        return execute_query(query, (job_id,), fetch_one=True)
+
+    @staticmethod
+    def list_all(
+        user_id: Optional[int] = None,
+        status: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """List batch jobs with optional filtering."""
+        query = "SELECT * FROM batch_jobs WHERE 1=1"
+        params = []
+
+        if user_id:
+            query += " AND user_id = ?"
+            params.append(user_id)
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+
+        query += " ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+
+        return execute_query(query, tuple(params))
+
+    @staticmethod
+    def list_unfinished() -> List[Dict[str, Any]]:
+        """List jobs that were pending or running, e.g. when the process stopped."""
+        query = """
+            SELECT * FROM batch_jobs WHERE status IN ('pending', 'running')
+            ORDER BY id
+        """
+        return execute_query(query)
+
+    @staticmethod
+    def set_status(job_id: int, status: str) -> int:
+        """Update the status of a batch job."""
+        finished = status in ("completed", "failed", "cancelled")
+        query = f"""
+            UPDATE batch_jobs SET status = ?, updated_at = CURRENT_TIMESTAMP
+            {", finished_at = CURRENT_TIMESTAMP" if finished else ""}
+            WHERE id = ?
+        """
+        return execute_query(query, (status, job_id))
+
+    @staticmethod
+    def refresh_counts(job_id: int) -> int:
+        """Recompute item counters from the items table."""
+        query = """
+            UPDATE batch_jobs SET
+                total_items = (SELECT COUNT(*) FROM batch_job_items WHERE job_id = ?),
+                completed_items = (SELECT COUNT(*) FROM batch_job_items
+                                   WHERE job_id = ? AND status = 'completed'),
+                failed_items = (SELECT COUNT(*) FROM batch_job_items
+                                WHERE job_id = ? AND status = 'failed'),
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        """
+        return execute_query(query, (job_id, job_id, job_id, job_id))
+
+    @staticmethod
+    def delete(job_id: int) -> int:
+        """Delete a batch job and its items."""
+        query = "DELETE FROM batch_jobs WHERE id = ?"
+        return execute_query(query, (job_id,))
+
+
+class BatchJobItem:
+    """Model for the individual items of a batch job."""
+
+    @staticmethod
+    def create_many(job_id: int, items: List[Dict[str, Any]]) -> int:
+        """Insert manifest items for a job in a single transaction."""
+        from .connection import get_db_cursor
+
+        with get_db_cursor() as cursor:
+            cursor.executemany(
+                """
+                INSERT INTO batch_job_items (job_id, item_index, params)
+                VALUES (?, ?, ?)
+                """,
+                [(job_id, i, json.dumps(params)) for i, params in enumerate(items)],
+            )
+        return len(items)
+
+    @staticmethod
+    def get_next_pending(job_id: int) -> Optional[Dict[str, Any]]:
+        """Get the lowest-index pending item of a job."""
+        query = """
+            SELECT * FROM batch_job_items
+            WHERE job_id = ? AND status = 'pending'
+            ORDER BY item_index LIMIT 1
+        """
+        result = execute_query(query, (job_id,), fetch_one=True)
+        if result and result.get("params"):
+            result["params"] = json.loads(result["params"])
+        return result
+
+    @staticmethod
+    def mark_running(item_id: int) -> int:
+        """Mark an item as claimed by a worker."""
+        query = """
+            UPDATE batch_job_items
+            SET status = 'running', attempts = attempts + 1,
+                started_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        """
+        return execute_query(query, (item_id,))
+
+    @staticmethod
+    def mark_completed(item_id: int, result: Any) -> int:
+        """Checkpoint a finished item with its result."""
+        query = """
+            UPDATE batch_job_items
+            SET status = 'completed', result = ?, error_message = NULL,
+                finished_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        """
+        return execute_query(query, (json.dumps(result), item_id))
+
+    @staticmethod
+    def mark_failed(item_id: int, error_message: str) -> int:
+        """Checkpoint a failed item with its error."""
+        query = """
+            UPDATE batch_job_items
+            SET status = 'failed', error_message = ?, finished_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        """
+        return execute_query(query, (error_message, item_id))
+
+    @staticmethod
+    def reset_running(job_id: int) -> int:
+        """Return items interrupted mid-generation to the pending state."""
+        query = """
+            UPDATE batch_job_items SET status = 'pending', started_at = NULL
+            WHERE job_id = ? AND status = 'running'
+        """
+        return execute_query(query, (job_id,))
+
+    @staticmethod
+    def reset_failed(job_id: int) -> int:
+        """Queue failed items of a job for another attempt."""
+        query = """
+            UPDATE batch_job_items
+            SET status = 'pending', error_message = NULL, finished_at = NULL
+            WHERE job_id = ? AND status = 'failed'
+        """
+        return execute_query(query, (job_id,))
+
+    @staticmethod
+    def list_for_job(
+        job_id: int,
+        status: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """List items of a job in manifest order."""
+        query = "SELECT * FROM batch_job_items WHERE job_id = ?"
+        params: List[Any] = [job_id]
+
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+
+        query += " ORDER BY item_index LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+
+        results = execute_query(query, tuple(params))
+        for r in results:
+            for key in ("params", "result"):
+                if r.get(key):
+                    r[key] = json.loads(r[key])
+        return results
@@ -91,20 +91,7 @@ def rescan_outputs(
                 # Add new file to database
                 if add_new:
                     try:
-                        metadata = _extract_metadata(filepath, filename)
-                        Generation.create(
-                            filename=filename,
-                            filepath=normalized_path,
-                            model_name=metadata.get("model_name"),
-                            model_type=metadata.get("model_type", "tts"),
-                            text=metadata.get("text"),
-                            language=metadata.get("language"),
-                            voice=metadata.get("voice"),
-                            parameters=metadata.get("parameters", {}),
-                            file_size=_get_file_size(filepath),
-                            duration_seconds=_get_audio_duration(filepath),
-                            status="imported",  # Mark as imported vs generated
-                        )
+                        _import_file(filepath, normalized_path)
                         results["added"] += 1
                     except Exception as e:
                         results["errors"].append(f"Error adding {filepath}: {e}")
@@ -121,6 +108,96 @@ def rescan_outputs(
     return results
 
 
+def sync_paths(added: List[str], removed: List[str]) -> Dict:
+    """
+    Sync the database with changed paths instead of rescanning everything.
+
+    Used by the output watcher. Paths are generation directories or files.
+
+    Args:
+        added: Paths that appeared or changed; their audio files are added,
+            or marked as existing if already tracked
+        removed: Paths that disappeared; their tracked files are marked missing
+
+    Returns:
+        Dict with the same keys as rescan_outputs (without directories_scanned)
+    """
+    from .connection import execute_query
+    from .models import Generation
+
+    results = {
+        "scanned": 0,
+        "added": 0,
+        "marked_missing": 0,
+        "already_tracked": 0,
+        "errors": [],
+    }
+
+    for path in added:
+        for filepath in _audio_files(path):
+            results["scanned"] += 1
+            normalized_path = _normalize_path(filepath)
+            if Generation.get_by_filepath(normalized_path) is not None:
+                results["already_tracked"] += 1
+                Generation.mark_exists(normalized_path)
+                continue
+            try:
+                _import_file(filepath, normalized_path)
+                results["added"] += 1
+            except Exception as e:
+                results["errors"].append(f"Error adding {filepath}: {e}")
+
+    for path in removed:
+        normalized_path = _normalize_path(path)
+        prefix = normalized_path + "/"
+        # substr rather than LIKE, "_" in generation names is a LIKE wildcard
+        query = """
+            SELECT filepath FROM generations
+            WHERE file_exists = 1
+            AND (filepath = ? OR substr(filepath, 1, ?) = ?)
+        """
+        for row in execute_query(query, (normalized_path, len(prefix), prefix)):
+            if not os.path.exists(row["filepath"]):
+                Generation.mark_missing(row["filepath"])
+                results["marked_missing"] += 1
+
+    return results
+
+
+def _audio_files(path: str) -> List[str]:
+    """Audio files at or under *path*."""
+    if os.path.isfile(path):
+        files = [path]
+    else:
+        files = [
+            os.path.join(root, filename)
+            for root, _, filenames in os.walk(path)
+            for filename in filenames
+        ]
+    return [f for f in files if os.path.splitext(f)[1].lower() in AUDIO_EXTENSIONS]
+
+
+def _import_file(filepath: str, normalized_path: str):
+    """Add a file found on disk to the database."""
+    from .models import Generation
+
+    filename = os.path.basename(filepath)
+    metadata = _extract_metadata(filepath, filename)
+    Generation.create(
+        filename=filename,
+        filepath=normalized_path,
+        model_name=metadata.get("model_name"),
+        model_type=metadata.get("model_type", "tts"),
+        text=metadata.get("text"),
+        language=metadata.get("language"),
+        voice=metadata.get("voice"),
+        parameters=metadata.get("parameters", {}),
+        file_size=_get_file_size(filepath),
+        duration_seconds=_get_audio_duration(filepath),
+        status="imported",  # Mark as imported vs generated
+    )
+
+
 def _normalize_path(filepath: str) -> str:
     """Normalize a filepath for consistent storage."""
     # Use forward slashes and relative path if under current directory
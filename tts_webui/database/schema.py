@@ -8,11 +8,13 @@ Tables:
 - voice_profiles: Voice configuration profiles (JSON)
 - user_preferences: User settings and preferences (JSON)
 - api_keys: API authentication keys
+- batch_jobs: Persistent batch generation jobs
+- batch_job_items: Individual prompts of a batch job (checkpointed per item)
 """
 
 from .connection import get_db
 
-SCHEMA_VERSION = 1
+SCHEMA_VERSION = 2
 
 
 def create_tables():
@@ -151,6 +153,51 @@ def create_tables():
         )
     """)
 
+    # Batch jobs table - one row per submitted manifest
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS batch_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER REFERENCES users(id) ON DELETE SET NULL DEFAULT 1,
+            name TEXT,
+            handler TEXT NOT NULL,
+            workers INTEGER DEFAULT 1,
+
+            -- Status: pending, running, paused, completed, failed, cancelled
+            status TEXT DEFAULT 'pending',
+            total_items INTEGER DEFAULT 0,
+            completed_items INTEGER DEFAULT 0,
+            failed_items INTEGER DEFAULT 0,
+
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            finished_at TIMESTAMP
+        )
+    """)
+
+    # Batch job items table - one row per manifest line
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS batch_job_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_id INTEGER REFERENCES batch_jobs(id) ON DELETE CASCADE,
+            item_index INTEGER NOT NULL,
+            params JSON NOT NULL DEFAULT '{}',
+
+            -- Status: pending, running, completed, failed
+            status TEXT DEFAULT 'pending',
+            result JSON,
+            error_message TEXT,
+            attempts INTEGER DEFAULT 0,
+
+            started_at TIMESTAMP,
+            finished_at TIMESTAMP,
+            UNIQUE(job_id, item_index)
+        )
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_batch_job_items_status
+        ON batch_job_items(job_id, status, item_index)
+    """)
+
     # Schema version tracking
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS schema_version (
@@ -1,5 +1,7 @@
 import time
 
+from tts_webui.utils.startup_profiler import profiler
+
 
 class LoadingIndicator:
     def __init__(self, title_name, skipped=False):
@@ -9,8 +11,11 @@ class LoadingIndicator:
     def __enter__(self):
         print(f"Loading {self.title_name.ljust(35, '.')}...", end="")
         self.start_time = time.time()
+        self._phase = profiler.phase(self.title_name, "extension")
+        self._phase.__enter__()
 
     def __exit__(self, exc_type, exc_value, traceback):
+        self._phase.__exit__(exc_type, exc_value, traceback)
         if self.skipped:
             print(f"{' ' * 6} skipped.")
             return
@@ -12,7 +12,10 @@ from tts_webui.extensions_loader.extensions_data_loader import (
     get_decorator_extensions,
     get_decorator_extensions_by_class,
 )
+from tts_webui.scheduler import scheduled
+from tts_webui.utils.manage_model_state import hold_models
 from tts_webui.utils.pip_install import pip_install_wrapper, pip_uninstall_wrapper
+from tts_webui.utils.startup_profiler import profiler
 
 # A list of disabled extensions and decorators
 # disabled_extensions = ["decorator_disabled"]
@@ -153,7 +156,8 @@ def _load_decorators(class_name: Literal["outer", "inner"]):
         print(f"Loading decorator {x['name'].ljust(30, '.')}...", end="")
         start_time = time.time()
         try:
-            loaded, skipped = _load(x)
+            with profiler.phase(x["name"], "decorator"):
+                loaded, skipped = _load(x)
             print(_get_pretty_time(time.time() - start_time))
 
             if loaded:
@@ -172,10 +176,14 @@ OUTER_WRAPPERS, OUTER_WRAPPERS_GEN = _load_decorators("outer")
 INNER_WRAPPERS, INNER_WRAPPERS_GEN = _load_decorators("inner")
 
 
-def _create_decorator(wrappers_list):
+def _create_decorator(wrappers_list, schedule=False):
     def decorator(fn0):
+        # One queue per generation function, like Gradio's per-event limit
+        queue = f"{fn0.__module__}.{fn0.__qualname__}"
         for wrapper in wrappers_list:
             fn0 = wrapper(fn0)
+        if schedule:
+            fn0 = scheduled(queue=queue)(hold_models(fn0))
 
         @functools.wraps(fn0)
         def wrapped(*args, **kwargs):
@@ -186,10 +194,14 @@ def _create_decorator(wrappers_list):
     return decorator
 
 
-def _create_decorator_generator(wrappers_list):
+def _create_decorator_generator(wrappers_list, schedule=False):
     def decorator(fn0):
+        # One queue per generation function, like Gradio's per-event limit
+        queue = f"{fn0.__module__}.{fn0.__qualname__}"
         for wrapper in wrappers_list:
             fn0 = wrapper(fn0)
+        if schedule:
+            fn0 = scheduled(queue=queue)(hold_models(fn0))
 
         @functools.wraps(fn0)
         def wrapped(*args, **kwargs):
@@ -201,9 +213,13 @@ def _create_decorator_generator(wrappers_list):
 
 
 # Define the four decorators using the helper function
-decorator_extension_outer = _create_decorator(OUTER_WRAPPERS)
+# The outer decorators wrap whole generations, which queue in the job scheduler
+# and keep the models they load from being unloaded until they finish
+decorator_extension_outer = _create_decorator(OUTER_WRAPPERS, schedule=True)
 decorator_extension_inner = _create_decorator(INNER_WRAPPERS)
-decorator_extension_outer_generator = _create_decorator_generator(OUTER_WRAPPERS_GEN)
+decorator_extension_outer_generator = _create_decorator_generator(
+    OUTER_WRAPPERS_GEN, schedule=True
+)
 decorator_extension_inner_generator = _create_decorator_generator(INNER_WRAPPERS_GEN)
 
 if __name__ == "__main__":
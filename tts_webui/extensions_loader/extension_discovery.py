@@ -0,0 +1,108 @@
+"""
+Extension discovery.
+
+Resolves whether interface extensions are installed, and their versions, once at
+startup. Lookups run in a thread pool because importlib.util.find_spec and
+importlib.metadata.version each scan sys.path, which dominates startup time
+with many installed extensions. Results are cached until one of the
+extension catalog files changes, and persisted across restarts by the
+experimental startup cache.
+"""
+
+import importlib
+import importlib.util
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib.metadata import version
+from typing import Any, Dict, List, Optional
+
+from tts_webui.extensions_loader.extensions_data_loader import get_catalog_files_key
+from tts_webui.utils.startup_cache import startup_cache
+
+_discovery_lock = threading.Lock()
+_discovery_cache: Dict[str, Any] = {"key": None, "packages": {}}
+
+
+def check_if_package_installed(package_name, proxy):
+    if proxy == "native":
+        venv = f".venvs/{package_name}"
+
+        if not os.path.exists(venv):
+            return False
+        return True
+    else:
+        spec = importlib.util.find_spec(package_name)
+        return spec is not None
+
+
+def get_extension_version(package_name, proxy):
+    try:
+        if "builtin" in package_name:
+            return "Built-in"
+        if proxy == "native":
+            return ""
+        else:
+            return f"v{version(package_name)}"
+    except Exception as e:
+        print(f"Error getting version for {package_name}: {e}")
+        return "Unknown"
+
+
+def resolve_extension(package_name, proxy=None) -> Dict[str, Any]:
+    """Installation status and version of one extension."""
+    try:
+        is_installed = check_if_package_installed(package_name, proxy)
+    except Exception as e:
+        print(f"Error checking {package_name}: {e}")
+        is_installed = False
+    return {
+        "is_installed": is_installed,
+        "version": get_extension_version(package_name, proxy) if is_installed else "",
+    }
+
+
+def discover_extensions(
+    extensions: List[Dict[str, Any]], max_workers: Optional[int] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Resolve all *extensions* in parallel, reusing earlier results.
+
+    Returns a dict of package_name -> {"is_installed", "version"}.
+    """
+    with _discovery_lock:
+        key = get_catalog_files_key()
+        if _discovery_cache["key"] != key:
+            _discovery_cache["key"] = key
+            _discovery_cache["packages"] = (
+                startup_cache.get("extension_discovery") or {}
+            )
+        packages = _discovery_cache["packages"]
+
+        missing = [x for x in extensions if x["package_name"] not in packages]
+        if missing:
+            start_time = time.time()
+            workers = max_workers or min(16, (os.cpu_count() or 1) * 2)
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="extension-discovery"
+            ) as executor:
+                results = executor.map(
+                    lambda x: resolve_extension(x["package_name"], x.get("proxy")),
+                    missing,
+                )
+                for x, result in zip(missing, results):
+                    packages[x["package_name"]] = result
+            print(
+                f"Discovered {len(missing)} extensions in {time.time() - start_time:.2f}s"
+            )
+            startup_cache.set("extension_discovery", packages)
+        return dict(packages)
+
+
+def invalidate_extension_discovery():
+    """Forget cached results, e.g. after installing or removing an extension."""
+    with _discovery_lock:
+        _discovery_cache["key"] = None
+        _discovery_cache["packages"] = {}
+        startup_cache.set("extension_discovery", None)
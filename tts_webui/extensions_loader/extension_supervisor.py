@@ -0,0 +1,373 @@
+"""
+Extension process supervisor.
+
+Native-proxy extensions run as separate Gradio servers behind the proxy tree.
+The supervisor:
+- Allocates a free port for each start
+- Waits for the extension to answer HTTP requests before routing to it
+- Restarts crashed processes with exponential backoff
+- Stops extensions that received no requests for "idle_timeout_seconds" to
+  release their VRAM, and starts them again on the next request, which the
+  proxy holds until the extension is ready (not with "proxy_tree": {"workers"},
+  whose worker processes do not report requests to the supervisor)
+- Reports pid, uptime, restarts, CPU and RSS per process (CPU and RSS need psutil)
+
+Configured with the "extension_supervisor" config section.
+"""
+
+import socket
+import subprocess
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+MAX_BACKOFF_SECONDS = 60
+
+
+def find_free_port(host: str = "127.0.0.1") -> int:
+    """Let the OS pick a free port."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+class ExtensionProcess:
+    """
+    One supervised extension server.
+
+    *build_env(port)* returns the environment for the process; the port is
+    chosen again on every start so a crashed server holding its port does not
+    block the restart. *spawn(env)*, if given, starts the process instead of
+    running *command*, and returns a subprocess.Popen-like handle.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        command: List[str],
+        build_env: Callable[[int], Dict[str, str]],
+        ready_path: str = "/",
+        on_ready: Optional[Callable[[int], None]] = None,
+        spawn: Optional[Callable[[Dict[str, str]], object]] = None,
+    ):
+        self.name = name
+        self.command = command
+        self.build_env = build_env
+        self.ready_path = ready_path
+        self.on_ready = on_ready
+        self.spawn = spawn
+        self.port: Optional[int] = None
+        self.process: Optional[subprocess.Popen] = None
+        self.state = "stopped"
+        self.started_at: Optional[float] = None
+        self.restarts = 0
+        self.next_restart_at: Optional[float] = None
+        self.active_requests = 0
+        self.last_activity = time.time()
+        # Resolved with start()'s result when a request wakes the process
+        self.ready: Optional[Future] = None
+        self.lock = threading.RLock()
+        # Guards the request counters and idle/starting transitions; never
+        # held while starting or stopping, since the proxy takes it
+        self.activity_lock = threading.Lock()
+        self._ps = None
+
+    def is_running(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def start(self, ready_timeout: float = 120) -> bool:
+        """Start the process and wait until it serves HTTP; returns readiness."""
+        with self.lock:
+            if self.is_running() and self.state == "running":
+                return True
+            self.stop()
+            self.state = "starting"
+            self.port = find_free_port()
+            print(f"Starting {self.name} on port {self.port}...")
+            self.process = self._spawn(self.build_env(self.port))
+            self.started_at = time.time()
+            self.last_activity = self.started_at
+
+            if not self.wait_until_ready(ready_timeout):
+                print(f"{self.name} did not become ready within {ready_timeout}s")
+                self.state = "crashed" if not self.is_running() else "unresponsive"
+                return False
+            self.state = "running"
+            if self.on_ready is not None:
+                self.on_ready(self.port)
+            return True
+
+    def _spawn(self, env: Dict[str, str]):
+        if self.spawn is not None:
+            try:
+                return self.spawn(env)
+            except Exception as e:
+                print(f"Could not fork {self.name}, starting a new process: {e}")
+        return subprocess.Popen(self.command, env=env)
+
+    def wait_until_ready(self, timeout: float) -> bool:
+        """Poll the server over HTTP with backoff; fail early if the process exits."""
+        url = f"http://127.0.0.1:{self.port}{self.ready_path}"
+        deadline = time.time() + timeout
+        delay = 0.05
+        while time.time() < deadline:
+            if not self.is_running():
+                return False
+            try:
+                response = httpx.get(url, timeout=2)
+                if response.status_code < 500:
+                    return True
+            except httpx.HTTPError:
+                pass
+            time.sleep(delay)
+            delay = min(delay * 2, 1.0)
+        return False
+
+    def stop(self, timeout: float = 10, state: str = "stopped"):
+        with self.lock:
+            process, self.process = self.process, None
+            if process is not None and process.poll() is None:
+                process.terminate()
+                try:
+                    process.wait(timeout)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    process.wait()
+                print(f"Stopped {self.name} (PID {process.pid})")
+            self.state = state
+            self.started_at = None
+
+    def stop_if_idle(self, idle_timeout: float) -> bool:
+        """Stop the process if it served no requests for *idle_timeout* seconds."""
+        # A process being started or stopped is not idle
+        if not self.lock.acquire(blocking=False):
+            return False
+        try:
+            with self.activity_lock:
+                if (
+                    self.state != "running"
+                    or self.active_requests
+                    or time.time() - self.last_activity <= idle_timeout
+                ):
+                    return False
+                # Requests arriving from now on wake the process again
+                self.state = "idle"
+            print(f"Stopping idle extension {self.name}")
+            self.stop(state="idle")
+            return True
+        finally:
+            self.lock.release()
+
+    def _psutil_process(self, pid: int):
+        # cpu_percent() measures since the previous call on the same object
+        if self._ps is None or self._ps.pid != pid:
+            self._ps = psutil.Process(pid)
+        return self._ps
+
+    def stats(self) -> Dict[str, object]:
+        running = self.is_running()
+        stats = {
+            "name": self.name,
+            "state": self.state,
+            "pid": self.process.pid if running else None,
+            "port": self.port if running else None,
+            "uptime": time.time() - self.started_at
+            if running and self.started_at
+            else 0,
+            "restarts": self.restarts,
+            "active_requests": self.active_requests,
+            "idle": time.time() - self.last_activity,
+            "cpu_percent": None,
+            "rss": None,
+        }
+        if running and psutil is not None:
+            try:
+                ps = self._psutil_process(self.process.pid)
+                with ps.oneshot():
+                    stats["cpu_percent"] = ps.cpu_percent(interval=None)
+                    stats["rss"] = ps.memory_info().rss
+            except psutil.Error:
+                pass
+        return stats
+
+
+class ExtensionSupervisor:
+    """Watches registered ExtensionProcesses from a background thread."""
+
+    def __init__(
+        self,
+        idle_timeout: Optional[float] = None,
+        max_restarts: int = 5,
+        ready_timeout: float = 120,
+        interval: float = 2,
+    ):
+        self.idle_timeout = idle_timeout
+        self.max_restarts = max_restarts
+        self.ready_timeout = ready_timeout
+        self.interval = interval
+        self.processes: Dict[str, ExtensionProcess] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, process: ExtensionProcess) -> ExtensionProcess:
+        with self._lock:
+            self.processes[process.name] = process
+        return process
+
+    def start(self, name: str) -> bool:
+        """Start (or restart) *name*, resetting its crash count."""
+        process = self.processes[name]
+        process.restarts = 0
+        process.next_restart_at = None
+        self._ensure_monitor()
+        return process.start(self.ready_timeout)
+
+    def stop(self, name: str):
+        process = self.processes[name]
+        process.next_restart_at = None
+        process.stop()
+
+    def stop_all(self):
+        self._stop_event.set()
+        for process in list(self.processes.values()):
+            process.stop()
+
+    def on_activity(self, name: str, delta: int) -> Optional[Future]:
+        """
+        Track in-flight requests; wakes an idle-stopped extension.
+
+        Returns a future resolved when a woken (or waking) extension is ready,
+        for the proxy to wait on before forwarding the request.
+        """
+        process = self.processes.get(name)
+        if process is None:
+            return None
+        with process.activity_lock:
+            process.active_requests = max(0, process.active_requests + delta)
+            process.last_activity = time.time()
+            if delta <= 0:
+                return None
+            if process.state == "idle":
+                process.state = "starting"
+                process.ready = Future()
+                threading.Thread(
+                    target=self._wake, args=(process, process.ready), daemon=True
+                ).start()
+            if process.state == "starting":
+                return process.ready
+        return None
+
+    def _wake(self, process: ExtensionProcess, ready: Future):
+        try:
+            ready.set_result(process.start(self.ready_timeout))
+        except Exception as e:
+            print(f"Could not wake {process.name}: {e}")
+            ready.set_result(False)
+
+    def _ensure_monitor(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._monitor, daemon=True, name="extension-supervisor"
+        )
+        self._thread.start()
+
+    def _monitor(self):
+        while not self._stop_event.wait(self.interval):
+            self.check()
+
+    def check(self):
+        """Restart crashed processes and stop idle ones; called periodically."""
+        now = time.time()
+        for process in list(self.processes.values()):
+            if process.state == "running" and not process.is_running():
+                self._schedule_restart(process, now)
+            elif process.state == "crashed" and process.next_restart_at is not None:
+                if now >= process.next_restart_at:
+                    process.next_restart_at = None
+                    process.restarts += 1
+                    # Starting can take minutes, don't hold up the other processes
+                    threading.Thread(
+                        target=self._restart, args=(process,), daemon=True
+                    ).start()
+            elif self.idle_timeout:
+                process.stop_if_idle(self.idle_timeout)
+
+    def _restart(self, process: ExtensionProcess):
+        print(f"Restarting {process.name} (attempt {process.restarts})")
+        if not process.start(self.ready_timeout):
+            self._schedule_restart(process, time.time())
+
+    def _schedule_restart(self, process: ExtensionProcess, now: float):
+        code = process.process.poll() if process.process is not None else None
+        if process.restarts >= self.max_restarts:
+            print(f"{process.name} crashed (exit code {code}), giving up")
+            process.stop(state="failed")
+            return
+        delay = min(2**process.restarts, MAX_BACKOFF_SECONDS)
+        print(f"{process.name} crashed (exit code {code}), restarting in {delay}s")
+        process.state = "crashed"
+        process.next_restart_at = now + delay
+
+    def stats(self) -> List[Dict[str, object]]:
+        return [process.stats() for process in list(self.processes.values())]
+
+
+def get_idle_timeout() -> Optional[float]:
+    """The configured idle timeout, or None if requests cannot be tracked."""
+    from tts_webui.config.config_utils import get_config_value
+
+    idle_timeout = get_config_value(
+        "extension_supervisor", "idle_timeout_seconds", None
+    )
+    # The standalone proxy's workers serve requests in other processes, so
+    # idle extensions would be stopped while in use and never woken again
+    if idle_timeout and get_config_value("proxy_tree", "workers", 0):
+        print(
+            "Warning: extension_supervisor.idle_timeout_seconds is ignored "
+            "because proxy_tree.workers is set"
+        )
+        return None
+    return idle_timeout
+
+
+_supervisor: Optional[ExtensionSupervisor] = None
+_supervisor_lock = threading.Lock()
+
+
+def get_supervisor() -> ExtensionSupervisor:
+    """The supervisor for native-proxy extensions, created on first use."""
+    global _supervisor
+    with _supervisor_lock:
+        if _supervisor is None:
+            import atexit
+
+            from tts_webui.config.config_utils import get_config_value
+            from tts_webui.gradio_proxy_tree.main import gradio_proxy_tree
+
+            _supervisor = ExtensionSupervisor(
+                idle_timeout=get_idle_timeout(),
+                max_restarts=get_config_value(
+                    "extension_supervisor", "max_restarts", 5
+                ),
+                ready_timeout=get_config_value(
+                    "extension_supervisor", "ready_timeout_seconds", 120
+                ),
+            )
+            # Routes are "/<package_name>", processes are keyed by package name
+            gradio_proxy_tree.add_activity_listener(
+                lambda prefix, delta: _supervisor.on_activity(prefix.lstrip("/"), delta)
+            )
+            gradio_proxy_tree.add_status_provider("extensions", _supervisor.stats)
+            atexit.register(_supervisor.stop_all)
+        return _supervisor
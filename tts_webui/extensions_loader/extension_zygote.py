@@ -0,0 +1,302 @@
+"""
+Extension zygotes (POSIX only), enabled with "extension_zygote": {"enabled": true}.
+
+A zygote is a warm interpreter, one per extension venv, that has already
+imported gradio, the config and the theme. Starting a native-proxy extension
+forks the zygote instead of launching a new interpreter, so only the
+extension itself is imported on start.
+
+Protocol, one JSON object per line:
+- parent -> zygote stdin: {"env": {...}, "target": "module:function"}
+- zygote stdout -> parent: {"ready": true} once preloaded, {"pid": n} for
+  each fork and {"exited": n, "code": c} when a forked child exits
+
+Extra modules to import in the zygote are listed in "extension_zygote" ->
+"preload". Nothing that initializes CUDA may be preloaded, since CUDA does
+not survive a fork.
+"""
+
+import atexit
+import importlib
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_PRELOAD = [
+    "gradio",
+    "tts_webui.config.config",
+    "tts_webui.gradio.get_theme",
+]
+DEFAULT_TARGET = "tts_webui.extensions_loader.proxy_harness:run_extension"
+
+
+def is_zygote_supported() -> bool:
+    return hasattr(os, "fork") and os.name == "posix"
+
+
+def is_zygote_enabled() -> bool:
+    from tts_webui.config.config_utils import get_config_value
+
+    return is_zygote_supported() and bool(
+        get_config_value("extension_zygote", "enabled", False)
+    )
+
+
+class ForkedProcess:
+    """subprocess.Popen-like handle for a child forked by a zygote."""
+
+    def __init__(self, zygote: "Zygote", pid: int, generation: int):
+        self.zygote = zygote
+        self.pid = pid
+        # The zygote process that forked this child; a restarted zygote
+        # knows nothing about the children of the previous one
+        self.generation = generation
+
+    def poll(self) -> Optional[int]:
+        code = self.zygote.exit_codes.get((self.generation, self.pid))
+        if code is not None:
+            return code
+        if self.zygote.is_alive() and self.zygote.generation == self.generation:
+            return None
+        # The zygote is gone and can no longer report; init reaps the child
+        try:
+            os.kill(self.pid, 0)
+            return None
+        except ProcessLookupError:
+            return -1
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        deadline = None if timeout is None else time.time() + timeout
+        while (code := self.poll()) is None:
+            if deadline is not None and time.time() > deadline:
+                raise subprocess.TimeoutExpired(str(self.pid), timeout)
+            time.sleep(0.05)
+        return code
+
+    def send_signal(self, sig):
+        if self.poll() is None:
+            try:
+                os.kill(self.pid, sig)
+            except ProcessLookupError:
+                pass
+
+    def terminate(self):
+        import signal
+
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self):
+        import signal
+
+        self.send_signal(signal.SIGKILL)
+
+
+class Zygote:
+    """Client for one zygote process running under *executable*."""
+
+    def __init__(
+        self,
+        executable: str = sys.executable,
+        preload: Optional[List[str]] = None,
+        ready_timeout: float = 120,
+    ):
+        self.executable = executable
+        self.preload = preload if preload is not None else DEFAULT_PRELOAD
+        self.ready_timeout = ready_timeout
+        # (generation, pid) -> exit code of the children
+        self.exit_codes: Dict[Tuple[int, int], int] = {}
+        # Incremented on every start, to tell the zygote processes apart
+        self.generation = 0
+        self._process: Optional[subprocess.Popen] = None
+        self._replies: "queue.Queue[dict]" = queue.Queue()
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+
+    def is_alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self):
+        """Start the zygote without waiting for its imports to finish."""
+        # Fresh objects per process, so the reader of a dead zygote cannot
+        # signal the one replacing it
+        self._ready = threading.Event()
+        self._replies = queue.Queue()
+        self.generation += 1
+        self._process = subprocess.Popen(
+            [self.executable, "-m", __name__, *self.preload],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        threading.Thread(
+            target=self._read,
+            args=(self._process, self.generation, self._ready, self._replies),
+            daemon=True,
+        ).start()
+
+    def _read(
+        self,
+        process: subprocess.Popen,
+        generation: int,
+        ready: threading.Event,
+        replies: "queue.Queue[dict]",
+    ):
+        for line in process.stdout:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            if "exited" in message:
+                self.exit_codes[(generation, message["exited"])] = message["code"]
+            elif "ready" in message:
+                ready.set()
+            else:
+                replies.put(message)
+        # Unblock a spawn waiting on a zygote that died
+        ready.set()
+        replies.put({})
+
+    def spawn(self, env: Dict[str, str], target: str = DEFAULT_TARGET) -> ForkedProcess:
+        """Fork a child that runs *target()* with *env* as its environment."""
+        with self._lock:
+            if not self.is_alive():
+                self.start()
+            if not self._ready.wait(self.ready_timeout) or not self.is_alive():
+                raise RuntimeError(f"Zygote for {self.executable} is not running")
+            request = json.dumps({"env": dict(env), "target": target}) + "\n"
+            self._process.stdin.write(request.encode())
+            self._process.stdin.flush()
+            try:
+                reply = self._replies.get(timeout=10)
+            except queue.Empty:
+                reply = {}
+            if "pid" not in reply:
+                raise RuntimeError(f"Zygote for {self.executable} did not fork")
+            return ForkedProcess(self, reply["pid"], self.generation)
+
+    def stop(self):
+        if self._process is None:
+            return
+        try:
+            self._process.stdin.close()
+            self._process.wait(5)
+        except (OSError, subprocess.TimeoutExpired):
+            self._process.kill()
+        self._process = None
+
+
+_zygotes: Dict[str, Zygote] = {}
+_zygotes_lock = threading.Lock()
+
+
+def get_zygote(executable: str = sys.executable) -> Zygote:
+    """The zygote for *executable*, started (warming up) on first use."""
+    with _zygotes_lock:
+        if executable not in _zygotes:
+            from tts_webui.config.config_utils import get_config_value
+
+            extra = get_config_value("extension_zygote", "preload", []) or []
+            zygote = Zygote(executable, [*DEFAULT_PRELOAD, *extra])
+            zygote.start()
+            _zygotes[executable] = zygote
+        return _zygotes[executable]
+
+
+@atexit.register
+def stop_zygotes():
+    with _zygotes_lock:
+        for zygote in _zygotes.values():
+            zygote.stop()
+        _zygotes.clear()
+
+
+# Zygote process side
+
+
+def _send(proto, message):
+    proto.write(json.dumps(message) + "\n")
+    proto.flush()
+
+
+def _reap(proto):
+    while True:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid == 0:
+            return
+        code = os.WEXITSTATUS(status) if os.WIFEXITED(status) else -os.WTERMSIG(status)
+        _send(proto, {"exited": pid, "code": code})
+
+
+def _run_child(request):
+    code = 1
+    try:
+        os.setsid()
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        os.close(devnull)
+        os.environ.clear()
+        os.environ.update(request["env"])
+
+        import random
+
+        random.seed()
+
+        module_name, _, function_name = request["target"].partition(":")
+        getattr(importlib.import_module(module_name), function_name)()
+        code = 0
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else 1
+    except BaseException:
+        import traceback
+
+        traceback.print_exc()
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(code)
+
+
+def zygote_main(preload: List[str]):
+    import select
+
+    for name in preload:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            print(f"Zygote could not preload {name}: {e}", file=sys.stderr)
+
+    # Keep the protocol on a private descriptor; prints go to stderr
+    proto = os.fdopen(os.dup(1), "w")
+    os.dup2(2, 1)
+    _send(proto, {"ready": True})
+
+    buffer = b""
+    while True:
+        _reap(proto)
+        if not select.select([0], [], [], 0.5)[0]:
+            continue
+        chunk = os.read(0, 65536)
+        if not chunk:
+            # The server closed our stdin; forked extensions keep running
+            # until the supervisor stops them
+            return
+        buffer += chunk
+        while b"\n" in buffer:
+            line, buffer = buffer.split(b"\n", 1)
+            request = json.loads(line)
+            pid = os.fork()
+            if pid == 0:
+                proto.close()
+                _run_child(request)
+            _send(proto, {"pid": pid})
+
+
+if __name__ == "__main__":
+    zygote_main(sys.argv[1:])
@@ -6,8 +6,10 @@ It abstracts the data loading process to enable more complex data sources in the
 such as multiple JSON file merges or fetching from external sources.
 """
 
+import copy
 import json
 import os
+import threading
 from itertools import chain
 from typing import Any, Dict, Iterable, List, Optional
 
@@ -18,6 +20,10 @@ EXTERNAL_EXTENSIONS_FILE = "extensions.external.json"
 CATALOG_DIR = os.path.join("data", "extensions-catalog")
 CATALOG_EXTENSIONS_FILE = os.path.join(CATALOG_DIR, "lib", "extensions.json")
 
+# Parsed JSON files keyed by path, invalidated when the file's mtime or size changes
+_json_cache: Dict[str, Any] = {}
+_json_cache_lock = threading.Lock()
+
 
 def load_json_file(file_path: str) -> Dict[str, Any]:
     """
@@ -30,13 +36,45 @@ def load_json_file(file_path: str) -> Dict[str, Any]:
         Dict[str, Any]: The contents of the JSON file as a dictionary.
         Returns an empty dict if the file cannot be loaded.
     """
+    try:
+        stat = os.stat(file_path)
+        key = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        key = None
+
+    with _json_cache_lock:
+        cached = _json_cache.get(file_path)
+        if key is not None and cached is not None and cached[0] == key:
+            return copy.deepcopy(cached[1])
+
     try:
         with open(file_path, "r") as f:
-            return json.load(f)
+            data = json.load(f)
     except Exception as e:
         print(f"\n! Failed to load {file_path}: {e}")
         return {}
 
+    if key is not None:
+        with _json_cache_lock:
+            _json_cache[file_path] = (key, data)
+        return copy.deepcopy(data)
+    return data
+
+
+def get_catalog_files_key() -> tuple:
+    """Modification times of the extension catalog files, for cache invalidation."""
+    key = []
+    for file_path in (
+        DEFAULT_EXTENSIONS_FILE,
+        CATALOG_EXTENSIONS_FILE,
+        EXTERNAL_EXTENSIONS_FILE,
+    ):
+        try:
+            key.append(os.stat(file_path).st_mtime_ns)
+        except OSError:
+            key.append(None)
+    return tuple(key)
+
 
 def load_extensions_json() -> Dict[str, Any]:
     """
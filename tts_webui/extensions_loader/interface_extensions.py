@@ -1,11 +1,18 @@
 import importlib
 import importlib.util
-from importlib.metadata import version
+import os
+import re
+import time
 
 import gradio as gr
 
 from tts_webui.config._save_config import _save_config
 from tts_webui.config.config import config
+from tts_webui.extensions_loader.extension_discovery import (
+    discover_extensions,
+    invalidate_extension_discovery,
+    resolve_extension,
+)
 from tts_webui.extensions_loader.extensions_data_loader import (
     filter_extensions_by_type_and_class,
     get_interface_extensions,
@@ -13,6 +20,7 @@ from tts_webui.extensions_loader.extensions_data_loader import (
 from tts_webui.extensions_loader.LoadingIndicator import LoadingIndicator
 from tts_webui.extensions_loader.setup_proxy_extension import setup_proxy_extension
 from tts_webui.utils.generic_error_tab_advanced import generic_error_tab_advanced
+from tts_webui.utils.model_preload import preload_extension_on_select
 from tts_webui.utils.pip_install import (
     pip_install_wrapper,
     pip_uninstall_wrapper,
@@ -24,51 +32,7 @@ def uninstall_extension(package_name):
     yield from pip_uninstall_wrapper(package_name, package_name)()
 
 
-def check_if_package_installed(package_name, proxy):
-    if proxy == "native":
-        venv = f".venvs/{package_name}"
-        import os
-
-        if not os.path.exists(venv):
-            return False
-        return True
-    else:
-        spec = importlib.util.find_spec(package_name)
-        return spec is not None
-
-
-def _get_version(package_name, proxy):
-    try:
-        if "builtin" in package_name:
-            return "Built-in"
-        if proxy == "native":
-            return ""
-            import os
-            import subprocess
-
-            venv_python = (
-                f".venvs/{package_name}/Scripts/python.exe"
-                if os.name == "nt"
-                else f".venvs/{package_name}/bin/python"
-            )
-            result = subprocess.run(
-                [
-                    venv_python,
-                    "-c",
-                    f"import importlib.metadata; print(importlib.metadata.version('{package_name}'))",
-                ],
-                capture_output=True,
-                text=True,
-            )
-            return result.stdout.strip()  # "0.0.3"
-        else:
-            return f"v{version(package_name)}"
-    except Exception as e:
-        print(f"Error getting version for {package_name}: {e}")
-        return "Unknown"
-
-
-def _handle_package(package_name, title_name, requirements, proxy=None):
+def _handle_package(package_name, title_name, requirements, proxy=None, eager=False):
     if package_name in disabled_extensions:
         with LoadingIndicator(title_name, skipped=True):
             with gr.Tab(f"[Disabled] {title_name}"):
@@ -80,7 +44,10 @@ def _handle_package(package_name, title_name, requirements, proxy=None):
                 )
         return
 
-    is_installed = check_if_package_installed(package_name, proxy)
+    status = discover_extensions(extension_list_json).get(
+        package_name
+    ) or resolve_extension(package_name, proxy)
+    is_installed = status["is_installed"]
 
     if not is_installed and proxy != "native":
         with gr.Tab(f"[Available] {title_name}"):
@@ -113,7 +80,7 @@ def _handle_package(package_name, title_name, requirements, proxy=None):
                         package_name,
                         title_name,
                         requirements,
-                        version=_get_version(package_name, proxy),
+                        version=status["version"],
                         show=not is_installed,
                         proxy=proxy,
                         autostart=autostart,
@@ -130,12 +97,17 @@ def _handle_package(package_name, title_name, requirements, proxy=None):
                             install_trigger=install_trigger,
                             is_installed=is_installed,
                         )
+                    elif (
+                        lazy_load_extensions
+                        and not eager
+                        and package_name not in eager_extensions
+                        and not _exposes_api(package_name)
+                    ):
+                        _lazy_extension_tab(package_name, title_name, requirements, tab)
                     else:
-                        module = importlib.import_module(f"{package_name}.main")
-                        main_tab = getattr(module, "extension__tts_generation_webui")
-                        # @gr.render(triggers=[tab.select], trigger_mode="once")
-                        # def load_extension():
-                        main_tab()
+                        _load_extension_tab(package_name)
+                    if proxy != "native":
+                        preload_extension_on_select(tab, package_name)
                 except Exception as e:
                     generic_error_tab_advanced(
                         e, name=title_name, requirements=requirements
@@ -144,9 +116,83 @@ def _handle_package(package_name, title_name, requirements, proxy=None):
             generic_error_tab_advanced(e, name=title_name, requirements=requirements)
 
 
+def _load_extension_tab(package_name):
+    module = importlib.import_module(f"{package_name}.main")
+    main_tab = getattr(module, "extension__tts_generation_webui")
+    main_tab()
+
+
+_API_NAME = re.compile(r"api_name\s*=\s*f?[\"']")
+
+
+def _exposes_api(package_name):
+    """
+    Whether the extension names API endpoints, read from its source files.
+
+    Events created inside gr.render get no stable api_name, so these
+    extensions are built at startup even in lazy mode.
+    """
+    try:
+        spec = importlib.util.find_spec(package_name)
+    except (ImportError, ValueError):
+        return False
+    if spec is None or not spec.submodule_search_locations:
+        return False
+    for directory in spec.submodule_search_locations:
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            continue
+        for name in names:
+            if not name.endswith(".py"):
+                continue
+            try:
+                with open(os.path.join(directory, name), encoding="utf-8") as f:
+                    if _API_NAME.search(f.read()):
+                        return True
+            except (OSError, UnicodeDecodeError):
+                continue
+    return False
+
+
+def _lazy_extension_tab(package_name, title_name, requirements, tab):
+    """
+    Defer importing and building an extension until its tab is first selected.
+
+    The UI is built by gr.render once per browser session; the module import
+    happens once per process. Extensions with API endpoints are not lazy, see
+    _exposes_api.
+    """
+    placeholder = gr.Markdown(f"Loading {title_name}...")
+    selected = gr.State(False)
+
+    tab.select(
+        fn=lambda was_selected: (
+            (gr.skip(), gr.skip())
+            if was_selected
+            else (True, gr.Markdown(visible=False))
+        ),
+        inputs=[selected],
+        outputs=[selected, placeholder],
+        queue=False,
+    )
+
+    @gr.render(inputs=[selected], triggers=[selected.change])
+    def load_extension(is_selected):
+        if not is_selected:
+            return
+        start_time = time.time()
+        try:
+            _load_extension_tab(package_name)
+        except Exception as e:
+            generic_error_tab_advanced(e, name=title_name, requirements=requirements)
+        print(f"Loaded {title_name} on first open in {time.time() - start_time:.2f}s")
+
+
 def enable_extension(package_name):
     def _enable_extension():
         disabled_extensions.remove(package_name)
+        invalidate_extension_discovery()
         print(f"Enabled extension {package_name}")
         gr.Info(
             "Enabled extension. Please restart the application for changes to take effect."
@@ -310,6 +356,9 @@ def _extension_management_ui(
 extension_list_json = get_interface_extensions()
 disabled_extensions: list[str] = config.get("extensions", {}).get("disabled", [])
 autostart_extensions: list[str] = config.get("extensions", {}).get("autostart", [])
+# Build extension tabs on first open instead of at startup, except for "eager" ones
+lazy_load_extensions: bool = config.get("extensions", {}).get("lazy_load", False)
+eager_extensions: list[str] = config.get("extensions", {}).get("eager", [])
 config.setdefault("extensions", {}).setdefault("disabled", disabled_extensions)
 config.setdefault("extensions", {}).setdefault("autostart", autostart_extensions)
 
@@ -319,8 +368,16 @@ def handle_extension_class(extension_class, config):
     filtered_extensions = filter_extensions_by_type_and_class(
         extension_list_json, "interface", extension_class
     )
-    for x in filtered_extensions:
-        _handle_package(x["package_name"], x["name"], x["requirements"], x.get("proxy"))
+    for i, x in enumerate(filtered_extensions):
+        _handle_package(
+            x["package_name"],
+            x["name"],
+            x["requirements"],
+            x.get("proxy"),
+            # all_tabs adds a "Main" tab first, except to the Extensions group,
+            # whose first tab is shown without a select event
+            eager=i == 0 and extension_class == "extensions",
+        )
 
 
 def extension_list_tab():
@@ -1,15 +1,18 @@
 import importlib
+import os
+
+DEFAULT_PACKAGE = "tts_webui_extension.mms.main"
 
-if __name__ == "__main__":
-    import os
 
+def run_extension(package_name=None):
+    """Serve one extension's tab as a standalone Gradio app (blocks until exit)."""
     import gradio as gr
 
     from tts_webui.config.config import config
     from tts_webui.gradio.get_theme import get_theme
 
-    package_name = os.environ.get(
-        "TTS_WEBUI_EXTENSION_PACKAGE", "tts_webui_extension.mms.main"
+    package_name = package_name or os.environ.get(
+        "TTS_WEBUI_EXTENSION_PACKAGE", DEFAULT_PACKAGE
     )
     module = importlib.import_module(f"{package_name}.main")
     main_tab = getattr(module, "extension__tts_generation_webui")
@@ -25,4 +28,15 @@ if __name__ == "__main__":
     ) as extension_blocks:
         main_tab()
 
-    extension_blocks.launch(share=False, inbrowser=False)
+    # Gradio reads GRADIO_SERVER_PORT at import time, which may have happened
+    # in a zygote before the port was chosen
+    port = os.environ.get("GRADIO_SERVER_PORT")
+    extension_blocks.launch(
+        share=False,
+        inbrowser=False,
+        server_port=int(port) if port else None,
+    )
+
+
+if __name__ == "__main__":
+    run_extension()
@@ -1,41 +1,70 @@
-import functools
 import os
-import subprocess
 import sys
 
 import gradio as gr
 
 from tts_webui.config.config_utils import get_config_value
+from tts_webui.extensions_loader.extension_supervisor import (
+    ExtensionProcess,
+    get_supervisor,
+)
+from tts_webui.extensions_loader.extension_zygote import (
+    get_zygote,
+    is_zygote_enabled,
+)
 from tts_webui.gradio_proxy_tree.main import (
     GRADIO_TREE_URL,
     add_extension_route,
 )
 
-PORT_ROUTER = 27770
-
 
 def get_openai_api_host():
     port = get_config_value("extension_openai_tts_api", "port", 7778)
     return f"http://localhost:{port}"
 
 
-def wait_for_server(port, timeout=30):
-    import socket
-    import time
-
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(1)
-            result = sock.connect_ex(("127.0.0.1", port))
-            sock.close()
-            if result == 0:
-                return True
-        except Exception:
-            pass
-        time.sleep(0.25)
-    return False
+def get_extension_executable(package_name):
+    venv_python = (
+        f".venvs/{package_name}/Scripts/python.exe"
+        if os.name == "nt"
+        else f".venvs/{package_name}/bin/python"
+    )
+    if os.path.exists(venv_python):
+        return venv_python
+    return sys.executable
+
+
+def register_extension_process(package_name):
+    """Register the extension's server with the supervisor (not started yet)."""
+    supervisor = get_supervisor()
+    if package_name in supervisor.processes:
+        return supervisor.processes[package_name]
+
+    def build_env(port):
+        return {
+            **os.environ,
+            "GRADIO_SERVER_PORT": str(port),
+            "GRADIO_ROOT_PATH": f"/{package_name}",
+            "TTS_WEBUI_EXTENSION_PACKAGE": package_name,
+            "OPENAI_PROXY_HOST": get_openai_api_host(),
+        }
+
+    executable = get_extension_executable(package_name)
+
+    def spawn(env):
+        # The venv's zygote is started when its first extension starts
+        return get_zygote(executable).spawn(env)
+
+    return supervisor.register(
+        ExtensionProcess(
+            package_name,
+            [executable, "-m", "tts_webui.extensions_loader.proxy_harness"],
+            build_env,
+            # The port changes on every (re)start
+            on_ready=lambda port: add_extension_route(package_name, port),
+            spawn=spawn if is_zygote_enabled() else None,
+        )
+    )
 
 
 def setup_proxy_extension(
@@ -48,11 +77,9 @@ def setup_proxy_extension(
     is_installed=False,
 ):
     extension_ran = False
-    global PORT_ROUTER
-    PORT_ROUTER += 1
-    port = PORT_ROUTER
+    supervisor = get_supervisor()
+    register_extension_process(package_name)
     iframe = f'<iframe src="{GRADIO_TREE_URL}/{package_name}/" style="width: 100%; height: 100vh;"></iframe>'
-    process = None
 
     run_guard = gr.State(False)
     first_load_guard = gr.State(False)
@@ -65,11 +92,9 @@ def setup_proxy_extension(
 
     def shutdown_extension():
         try:
-            nonlocal process, extension_ran
-            process.terminate()
+            nonlocal extension_ran
+            supervisor.stop(package_name)
             gr.Info("Extension stopped")
-            print(f"Terminated {title_name} extension process with PID {process.pid}")
-            process = None
             extension_ran = False
             return (
                 gr.HTML("Extension stopped."),
@@ -88,43 +113,15 @@ def setup_proxy_extension(
         else "Press 'Start Extension'"
     )
 
-    @functools.lru_cache(maxsize=1)
-    def add_route_once():
-        return add_extension_route(package_name, port)
-
     def run_extension():
-        nonlocal extension_ran, process
+        nonlocal extension_ran
 
         yield gr.HTML("Starting extension, please wait..."), gr.skip(), gr.skip()
 
-        print(
-            f"\nStarting {title_name} extension in a separate process on port {port}/{package_name}..."
-        )
-        executable = sys.executable
-        venv_python = (
-            f".venvs/{package_name}/Scripts/python.exe"
-            if os.name == "nt"
-            else f".venvs/{package_name}/bin/python"
-        )
-        if os.path.exists(venv_python):
-            executable = venv_python
-        process = subprocess.Popen(
-            [executable, "-m", "tts_webui.extensions_loader.proxy_harness"],
-            env={
-                **os.environ,
-                "GRADIO_SERVER_PORT": str(port),
-                "GRADIO_ROOT_PATH": f"/{package_name}",
-                "TTS_WEBUI_EXTENSION_PACKAGE": package_name,
-                "OPENAI_PROXY_HOST": get_openai_api_host(),
-            },
-        )
-        # Somehow lift up the errors to gr.Error and yield
-        # process.stdout
+        print(f"\nStarting {title_name} extension in a separate process...")
         extension_ran = True
-
-        if not wait_for_server(port, timeout=120):
-            gr.Error(f"Warning: Server on port {port} did not start within timeout")
-        add_route_once()
+        if not supervisor.start(package_name):
+            gr.Error(f"Warning: {title_name} did not start within timeout")
         yield (
             gr.HTML(iframe, padding=False),
             gr.Button(interactive=False),
@@ -0,0 +1,249 @@
+"""
+In-process cache for static assets of proxied Gradio apps.
+
+Cached paths are the frontend build (/assets/*, hashed file names, served
+without asking the upstream again), /static/* and /theme.css (revalidated
+with the upstream's ETag/Last-Modified on every request). Entries are kept
+in an LRU bounded by their total size in bytes, including compressed copies.
+
+Entries are keyed by the upstream URL, which contains the port, so a
+restarted extension never gets the previous instance's assets.
+"""
+
+import asyncio
+import gzip
+import logging
+from collections import OrderedDict
+from typing import Optional, Union
+
+import httpx
+from starlette.datastructures import Headers
+from starlette.responses import Response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger("gradio_proxy_tree")
+
+IMMUTABLE_PREFIXES = ("/assets/",)
+REVALIDATED_PREFIXES = ("/static/",)
+REVALIDATED_PATHS = ("/theme.css",)
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/javascript",
+    "application/json",
+    "application/xml",
+    "image/svg+xml",
+)
+MIN_COMPRESS_SIZE = 1024
+# Fast levels: most of the size reduction for a fraction of the CPU time
+BROTLI_QUALITY = 5
+GZIP_LEVEL = 5
+
+# Stored with the entry and sent back to the client
+_STORED_HEADERS = frozenset(
+    {"content-type", "etag", "last-modified", "cache-control", "expires"}
+)
+# Client conditionals are answered from the entry, not forwarded
+_CONDITIONAL_HEADERS = frozenset({"if-none-match", "if-modified-since"})
+
+
+class CachedAsset:
+    def __init__(self, body: bytes, headers: dict[str, str], immutable: bool):
+        self.body = body
+        self.headers = headers
+        self.immutable = immutable
+        self.etag = headers.get("etag")
+        self.last_modified = headers.get("last-modified")
+        # Compressed copies by content-encoding
+        self.encoded: dict[str, bytes] = {}
+        # Set when stored in a cache
+        self.url: Optional[str] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(b) for b in self.encoded.values())
+
+    @property
+    def compressible(self) -> bool:
+        content_type = self.headers.get("content-type", "")
+        return len(self.body) >= MIN_COMPRESS_SIZE and content_type.startswith(
+            COMPRESSIBLE_TYPES
+        )
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+class AssetCache:
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_entry_bytes: int = 8 * 1024 * 1024,
+        compress: bool = False,
+    ):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.compress = compress
+        self._entries: "OrderedDict[str, CachedAsset]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+
+    def is_cacheable(self, method: str, upstream_path: str, headers: Headers) -> bool:
+        if method != "GET" or "range" in headers or "authorization" in headers:
+            return False
+        path = upstream_path.split("?", 1)[0]
+        return path.startswith(IMMUTABLE_PREFIXES + REVALIDATED_PREFIXES) or (
+            path in REVALIDATED_PATHS
+        )
+
+    async def lookup(
+        self, client: httpx.AsyncClient, url: str, headers: dict[str, str]
+    ) -> Union[CachedAsset, httpx.Response]:
+        """
+        The cached asset for *url*, fetching or revalidating it as needed.
+
+        Returns the streaming upstream response instead when it cannot be
+        cached; the caller relays it as usual.
+        """
+        headers = {
+            k: v
+            for k, v in headers.items()
+            if k.lower() not in _CONDITIONAL_HEADERS and k.lower() != "accept-encoding"
+        }
+        # Store the identity encoding, compression is done here
+        headers["accept-encoding"] = "identity"
+
+        entry = self._entries.get(url)
+        if entry is not None:
+            self._entries.move_to_end(url)
+            if entry.immutable:
+                self.hits += 1
+                return entry
+            if entry.etag:
+                headers["if-none-match"] = entry.etag
+            if entry.last_modified:
+                headers["if-modified-since"] = entry.last_modified
+
+        response = await client.send(
+            client.build_request("GET", url, headers=headers), stream=True
+        )
+        if entry is not None:
+            if response.status_code == 304:
+                await response.aclose()
+                self.revalidations += 1
+                return entry
+            self._remove(url)
+
+        self.misses += 1
+        if not self._is_cacheable_response(response):
+            return response
+        try:
+            body = await response.aread()
+        finally:
+            await response.aclose()
+
+        cache_control = response.headers.get("cache-control", "")
+        entry = CachedAsset(
+            body,
+            {k: v for k, v in response.headers.items() if k.lower() in _STORED_HEADERS},
+            immutable="immutable" in cache_control
+            or httpx.URL(url).path.startswith(IMMUTABLE_PREFIXES),
+        )
+        self._store(url, entry)
+        return entry
+
+    def _is_cacheable_response(self, response: httpx.Response) -> bool:
+        cache_control = response.headers.get("cache-control", "")
+        length = response.headers.get("content-length")
+        return (
+            response.status_code == 200
+            and "no-store" not in cache_control
+            and "private" not in cache_control
+            and "set-cookie" not in response.headers
+            and "content-encoding" not in response.headers
+            and length is not None
+            and int(length) <= self.max_entry_bytes
+        )
+
+    def _store(self, url: str, entry: CachedAsset):
+        # Concurrent misses on the same URL each store their own entry
+        self._remove(url)
+        entry.url = url
+        self._entries[url] = entry
+        self.bytes += entry.size
+        self._evict()
+
+    def _remove(self, url: str):
+        entry = self._entries.pop(url, None)
+        if entry is not None:
+            self.bytes -= entry.size
+
+    def _evict(self):
+        while self.bytes > self.max_bytes and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self.bytes -= entry.size
+
+    async def _encode(self, entry: CachedAsset, accept_encoding: str) -> Optional[str]:
+        """Pick (and compress once) an encoding the client accepts."""
+        if not self.compress or not entry.compressible:
+            return None
+        accepted = {e.split(";")[0].strip() for e in accept_encoding.split(",")}
+        if "br" in accepted and brotli is not None:
+            encoding = "br"
+        elif "gzip" in accepted:
+            encoding = "gzip"
+        else:
+            return None
+        if encoding not in entry.encoded:
+            # Off the event loop, a large bundle takes a while even at these levels
+            body = await asyncio.get_running_loop().run_in_executor(
+                None, _compress, entry.body, encoding
+            )
+            # Another request may have compressed it meanwhile
+            if encoding not in entry.encoded:
+                entry.encoded[encoding] = body
+                # Only counted while stored, it may have been evicted meanwhile
+                if self._entries.get(entry.url) is entry:
+                    self.bytes += len(body)
+                    self._evict()
+        return encoding
+
+    async def respond(self, entry: CachedAsset, scope, receive, send):
+        request_headers = Headers(scope=scope)
+        headers = dict(entry.headers)
+        if self.compress and entry.compressible:
+            headers["vary"] = "Accept-Encoding"
+
+        if_none_match = request_headers.get("if-none-match")
+        if_modified_since = request_headers.get("if-modified-since")
+        if (if_none_match and entry.etag and entry.etag in if_none_match) or (
+            not if_none_match
+            and if_modified_since
+            and if_modified_since == entry.last_modified
+        ):
+            await Response(status_code=304, headers=headers)(scope, receive, send)
+            return
+
+        body = entry.body
+        encoding = await self._encode(entry, request_headers.get("accept-encoding", ""))
+        if encoding is not None:
+            body = entry.encoded[encoding]
+            headers["content-encoding"] = encoding
+        await Response(body, status_code=200, headers=headers)(scope, receive, send)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "revalidations": self.revalidations,
+            "misses": self.misses,
+        }
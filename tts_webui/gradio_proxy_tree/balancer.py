@@ -0,0 +1,128 @@
+"""
+Upstream groups: one route served by several replicas of the same app.
+
+Requests are spread with "round_robin" or "least_connections". A browser
+sticks to the replica that served its first request through a cookie, since
+a Gradio session (queue join, SSE stream, uploaded files) lives in one
+process. A replica that refuses connections "max_failures" times in a row is
+ejected for "eject_seconds", doubling on each further ejection; if every
+replica is ejected, all of them are tried again.
+"""
+
+import itertools
+import time
+import zlib
+from http.cookies import SimpleCookie
+from typing import Optional, Union
+
+STRATEGIES = ("round_robin", "least_connections")
+
+
+class UpstreamGroup:
+    def __init__(
+        self,
+        targets: list[str],
+        strategy: str = "round_robin",
+        max_failures: int = 3,
+        eject_seconds: float = 10,
+        max_eject_seconds: float = 300,
+    ):
+        if not targets:
+            raise ValueError("An upstream group needs at least one target")
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown balancing strategy {strategy!r}")
+        self.targets = list(targets)
+        self.strategy = strategy
+        self.max_failures = max_failures
+        self.eject_seconds = eject_seconds
+        self.max_eject_seconds = max_eject_seconds
+        self.active = {t: 0 for t in self.targets}
+        self.failures = {t: 0 for t in self.targets}
+        self.ejections = {t: 0 for t in self.targets}
+        self.ejected_until = {t: 0.0 for t in self.targets}
+        self._round_robin = itertools.cycle(range(len(self.targets)))
+
+    @property
+    def sticky(self) -> bool:
+        return len(self.targets) > 1
+
+    def describe(self) -> Union[str, list[str]]:
+        return self.targets[0] if len(self.targets) == 1 else list(self.targets)
+
+    def healthy(self) -> list[str]:
+        now = time.monotonic()
+        healthy = [t for t in self.targets if self.ejected_until[t] <= now]
+        return healthy or list(self.targets)
+
+    def pick(self, preferred: Optional[str] = None) -> str:
+        """Choose a target, keeping *preferred* (the sticky one) if healthy."""
+        if len(self.targets) == 1:
+            return self.targets[0]
+        healthy = self.healthy()
+        if preferred in healthy:
+            return preferred
+        if self.strategy == "least_connections":
+            return min(healthy, key=lambda t: self.active[t])
+        for _ in self.targets:
+            target = self.targets[next(self._round_robin)]
+            if target in healthy:
+                return target
+        return healthy[0]
+
+    def acquire(self, target: str):
+        self.active[target] += 1
+
+    def release(self, target: str, failed: bool = False):
+        self.active[target] -= 1
+        if not failed:
+            self.failures[target] = 0
+            self.ejections[target] = 0
+            return
+        self.failures[target] += 1
+        if self.failures[target] >= self.max_failures:
+            seconds = min(
+                self.eject_seconds * 2 ** self.ejections[target],
+                self.max_eject_seconds,
+            )
+            self.ejected_until[target] = time.monotonic() + seconds
+            self.ejections[target] += 1
+            self.failures[target] = 0
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "strategy": self.strategy,
+            "targets": {
+                t: {
+                    "active": self.active[t],
+                    "ejected_for": max(0.0, self.ejected_until[t] - now),
+                }
+                for t in self.targets
+            },
+        }
+
+
+def sticky_cookie_name(prefix: str) -> str:
+    # Cookies of "/" are also sent to "/ext", so the name depends on the prefix
+    return f"proxy_upstream_{zlib.crc32(prefix.encode()):08x}"
+
+
+def read_sticky_target(
+    group: UpstreamGroup, prefix: str, cookie_header: str
+) -> Optional[str]:
+    try:
+        morsel = SimpleCookie(cookie_header).get(sticky_cookie_name(prefix))
+        index = int(morsel.value) if morsel is not None else None
+    except Exception:
+        return None
+    if index is not None and 0 <= index < len(group.targets):
+        return group.targets[index]
+    return None
+
+
+def sticky_cookie(group: UpstreamGroup, prefix: str, target: str) -> bytes:
+    index = group.targets.index(target)
+    return (
+        f"{sticky_cookie_name(prefix)}={index}; Path={prefix or '/'}; "
+        "HttpOnly; SameSite=Lax"
+    ).encode("latin-1")
@@ -0,0 +1,135 @@
+"""
+Pooled upstream HTTP clients: one httpx.AsyncClient per upstream target.
+
+Each client keeps its connections alive between requests, so the hundreds of
+requests of a Gradio page load reuse a handful of TCP connections instead of
+opening one each.
+"""
+
+import asyncio
+import contextlib
+import logging
+import threading
+from typing import AsyncIterator, Optional
+
+import httpx
+
+from .metrics import pool_stats
+
+logger = logging.getLogger("gradio_proxy_tree")
+
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0
+)
+DEFAULT_TIMEOUT = httpx.Timeout(300.0)
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+
+        return True
+    except ImportError:
+        return False
+
+
+class UpstreamClients:
+    """
+    Registry of pooled clients, keyed by target URL.
+
+    Clients are created when a route is added (or on first use) and closed on
+    shutdown. A client whose target is no longer routed, e.g. after an
+    extension restarted on a new port, is closed once the requests still
+    using it (a queue's SSE stream, an audio download) have finished.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[httpx.Limits] = None,
+        timeout: Optional[httpx.Timeout] = None,
+        http2: bool = False,
+    ):
+        self.limits = limits or DEFAULT_LIMITS
+        self.timeout = timeout or DEFAULT_TIMEOUT
+        if http2 and not _http2_available():
+            logger.warning("HTTP/2 requested but h2 is not installed, using HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._retired: list[httpx.AsyncClient] = []
+        # Requests using each client, by client
+        self._in_flight: dict[httpx.AsyncClient, int] = {}
+        self._lock = threading.Lock()
+
+    def _create(self, target: str) -> httpx.AsyncClient:
+        # The client binds to an event loop on first use, not here, so it can
+        # be created from the thread that adds the route
+        return httpx.AsyncClient(
+            follow_redirects=False,
+            timeout=self.timeout,
+            limits=self.limits,
+            http2=self.http2,
+        )
+
+    def add(self, target: str):
+        with self._lock:
+            if target not in self._clients:
+                self._clients[target] = self._create(target)
+
+    def remove(self, target: str):
+        with self._lock:
+            client = self._clients.pop(target, None)
+            if client is not None:
+                self._retired.append(client)
+
+    def get(self, target: str) -> httpx.AsyncClient:
+        """Client for *target*; must be called from the proxy's event loop."""
+        with self._lock:
+            idle = [c for c in self._retired if c not in self._in_flight]
+            self._retired = [c for c in self._retired if c in self._in_flight]
+            client = self._clients.get(target)
+            if client is None:
+                client = self._clients[target] = self._create(target)
+        for old in idle:
+            asyncio.ensure_future(self._close(old))
+        return client
+
+    @contextlib.asynccontextmanager
+    async def use(self, target: str) -> AsyncIterator[httpx.AsyncClient]:
+        """The client for *target*, kept open until the block exits."""
+        client = self.get(target)
+        with self._lock:
+            self._in_flight[client] = self._in_flight.get(client, 0) + 1
+        try:
+            yield client
+        finally:
+            with self._lock:
+                self._in_flight[client] -= 1
+                done = self._in_flight[client] == 0
+                if done:
+                    del self._in_flight[client]
+                retired = done and client in self._retired
+                if retired:
+                    self._retired.remove(client)
+            if retired:
+                await self._close(client)
+
+    async def _close(self, client: httpx.AsyncClient):
+        try:
+            await client.aclose()
+        except Exception as exc:
+            logger.error("Error closing upstream client: %s", exc)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Connection counts per upstream target."""
+        with self._lock:
+            clients = dict(self._clients)
+        return {target: pool_stats(client) for target, client in clients.items()}
+
+    async def aclose(self):
+        with self._lock:
+            clients = [*self._clients.values(), *self._retired]
+            self._clients.clear()
+            self._retired.clear()
+        for client in clients:
+            await self._close(client)
@@ -0,0 +1,79 @@
+"""
+Direct serving of generated files from whitelisted output directories.
+
+Audio previews reach the browser as Gradio file URLs, e.g.
+"/gradio_api/file=outputs/2024-01-01_00-00-00__bark/audio.wav". When the
+file is inside one of the output directories the proxy answers with a
+FileResponse instead of forwarding the request to the app: Range requests
+(seeking) and If-None-Match work, the ETag is strong and the body is sent
+with "http.response.pathsend" when the server supports it.
+
+Anything else (Gradio temp files, paths outside the directories, symlinks
+leading out of them) is proxied as before, so Gradio's own checks apply.
+"""
+
+import os
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.types import Receive, Scope, Send
+
+FILE_ROUTE = "/gradio_api/file="
+OUTPUT_DIRS = ("outputs", "favorites", "outputs-rvc", "collections")
+
+
+class OutputFiles:
+    def __init__(self, directories: list[str], base: Optional[str] = None):
+        base = base or os.getcwd()
+        self.roots = [os.path.realpath(os.path.join(base, d)) for d in directories]
+        self.base = base
+        self.served = 0
+
+    def resolve(self, path: str) -> Optional[str]:
+        """The file a Gradio file URL points to, if it is in an output directory."""
+        index = path.find(FILE_ROUTE)
+        if index == -1:
+            return None
+        file_path = path[index + len(FILE_ROUTE) :]
+        if not file_path or "\x00" in file_path:
+            return None
+        real_path = os.path.realpath(os.path.join(self.base, file_path))
+        for root in self.roots:
+            try:
+                inside = os.path.commonpath([root, real_path]) == root
+            except ValueError:
+                # Different drives on Windows
+                continue
+            if inside and os.path.isfile(real_path):
+                return real_path
+        return None
+
+    async def respond(self, file_path: str, scope: Scope, receive: Receive, send: Send):
+        try:
+            stat_result = os.stat(file_path)
+        except OSError:
+            # Deleted since it was resolved
+            await Response(status_code=404)(scope, receive, send)
+            return
+
+        response = FileResponse(
+            file_path,
+            stat_result=stat_result,
+            # Revalidated on every use, outputs can be regenerated in place
+            headers={"cache-control": "no-cache"},
+        )
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        if if_none_match and response.headers["etag"] in if_none_match:
+            headers = {
+                k: v
+                for k, v in response.headers.items()
+                if k in ("etag", "last-modified", "cache-control")
+            }
+            await Response(status_code=304, headers=headers)(scope, receive, send)
+        else:
+            await response(scope, receive, send)
+        self.served += 1
+
+    def stats(self) -> dict:
+        return {"directories": self.roots, "served": self.served}
@@ -4,12 +4,16 @@ Core proxy logic: HTTP and WebSocket forwarding for a single route.
 
 import asyncio
 import logging
+from typing import Optional
 
 import httpx
 import websockets
 from starlette.requests import Request
 from starlette.responses import Response, StreamingResponse
-from starlette.websockets import WebSocket, WebSocketDisconnect
+from starlette.websockets import WebSocket
+
+from .asset_cache import AssetCache, CachedAsset
+from .websocket_relay import WebSocketOptions, WebSocketRelay
 
 logger = logging.getLogger("gradio_proxy_tree")
 
@@ -47,7 +51,38 @@ def _proxy_headers(
     return out
 
 
-async def proxy_http(scope, receive, send, *, prefix: str, target: str):
+class RequestBodyTooLarge(Exception):
+    pass
+
+
+async def _stream_request_body(request: Request, max_body_size: Optional[int]):
+    """
+    Yield the request body as it arrives.
+
+    httpx pulls the next chunk only once the previous one was written
+    upstream, so a slow upstream slows down the client instead of buffering.
+    """
+    received = 0
+    async for chunk in request.stream():
+        if not chunk:
+            continue
+        received += len(chunk)
+        if max_body_size is not None and received > max_body_size:
+            raise RequestBodyTooLarge()
+        yield chunk
+
+
+async def proxy_http(
+    scope,
+    receive,
+    send,
+    *,
+    prefix: str,
+    target: str,
+    client: httpx.AsyncClient,
+    max_body_size: Optional[int] = None,
+    asset_cache: Optional[AssetCache] = None,
+):
     """Forward an HTTP request, stripping *prefix* and sending to *target*."""
     request = Request(scope, receive)
 
@@ -61,16 +96,34 @@ async def proxy_http(scope, receive, send, *, prefix: str, target: str):
     url = target + upstream_path + (f"?{query}" if query else "")
 
     headers = _proxy_headers(scope.get("headers", []), scope.get("scheme", "http"))
-    body = await request.body()
 
-    logger.info("%s %s -> %s", scope["method"], raw_path, url)
+    content = None
+    content_length = request.headers.get("content-length")
+    if content_length is not None and content_length != "0":
+        if max_body_size is not None and int(content_length) > max_body_size:
+            await _body_too_large(scope, receive, send)
+            return
+        # A known length is forwarded as is; otherwise httpx sends chunks
+        headers["content-length"] = content_length
+        content = _stream_request_body(request, max_body_size)
+    elif "transfer-encoding" in request.headers:
+        content = _stream_request_body(request, max_body_size)
 
-    client = httpx.AsyncClient(follow_redirects=False, timeout=httpx.Timeout(300.0))
     try:
-        req = client.build_request(
-            method=scope["method"], url=url, headers=headers, content=body
-        )
-        upstream_resp = await client.send(req, stream=True)
+        # *client* is pooled per upstream and outlives this request
+        if asset_cache is not None and asset_cache.is_cacheable(
+            scope["method"], upstream_path, request.headers
+        ):
+            result = await asset_cache.lookup(client, url, headers)
+            if isinstance(result, CachedAsset):
+                await asset_cache.respond(result, scope, receive, send)
+                return
+            upstream_resp = result
+        else:
+            req = client.build_request(
+                method=scope["method"], url=url, headers=headers, content=content
+            )
+            upstream_resp = await client.send(req, stream=True)
 
         resp_headers = {
             k: v
@@ -84,29 +137,47 @@ async def proxy_http(scope, receive, send, *, prefix: str, target: str):
                     yield chunk
             finally:
                 await upstream_resp.aclose()
-                await client.aclose()
 
         response = StreamingResponse(
             stream_body(), status_code=upstream_resp.status_code, headers=resp_headers
         )
         await response(scope, receive, send)
 
+    except RequestBodyTooLarge:
+        scope["proxy_error"] = "body_too_large"
+        await _body_too_large(scope, receive, send)
     except httpx.ConnectError as exc:
-        await client.aclose()
+        scope["proxy_error"] = "connect"
         logger.error("Upstream %s unavailable: %s", target, exc)
         await Response("Proxy error: upstream unavailable", status_code=502)(
             scope, receive, send
         )
     except Exception as exc:
-        await client.aclose()
+        scope["proxy_error"] = type(exc).__name__
         logger.error("Proxy error for %s: %s", target, exc)
         await Response("Proxy error: internal error", status_code=500)(
             scope, receive, send
         )
 
 
-async def proxy_ws(scope, receive, send, *, prefix: str, target: str):
+async def _body_too_large(scope, receive, send):
+    await Response("Proxy error: request body too large", status_code=413)(
+        scope, receive, send
+    )
+
+
+async def proxy_ws(
+    scope,
+    receive,
+    send,
+    *,
+    prefix: str,
+    target: str,
+    options: Optional[WebSocketOptions] = None,
+    relays: Optional[set] = None,
+):
     """Forward a WebSocket connection, stripping *prefix* and sending to *target*."""
+    options = options or WebSocketOptions()
     websocket = WebSocket(scope, receive, send)
 
     raw_path = scope.get("raw_path", scope["path"].encode()).decode("latin-1")
@@ -118,63 +189,40 @@ async def proxy_ws(scope, receive, send, *, prefix: str, target: str):
     ws_target = target.replace("http://", "ws://").replace("https://", "wss://")
     ws_url = ws_target + upstream_path + (f"?{query}" if query else "")
 
-    headers_dict = {
-        k.decode("latin-1"): v.decode("latin-1") for k, v in scope.get("headers", [])
-    }
-    host = headers_dict.get("host", "localhost")
-
-    logger.info("WS %s -> %s", raw_path, ws_url)
-    await websocket.accept()
+    host = websocket.headers.get("host", "localhost")
 
+    # Connect upstream first, so a failure rejects the client handshake
     try:
-        async with websockets.connect(
+        upstream = await websockets.connect(
             ws_url,
             additional_headers={
                 "Host": host,
                 "X-Forwarded-Host": host,
                 "X-Forwarded-Proto": scope.get("scheme", "ws"),
             },
+            subprotocols=scope.get("subprotocols") or None,
+            # Upstreams are local; never go through HTTP(S)_PROXY
+            proxy=None,
             open_timeout=30,
             close_timeout=10,
-        ) as upstream:
-
-            async def client_to_upstream():
-                try:
-                    while True:
-                        data = await websocket.receive()
-                        if "text" in data and data["text"] is not None:
-                            await upstream.send(data["text"])
-                        elif "bytes" in data and data["bytes"] is not None:
-                            await upstream.send(data["bytes"])
-                        else:
-                            return
-                except (WebSocketDisconnect, Exception):
-                    return
-
-            async def upstream_to_client():
-                try:
-                    async for msg in upstream:
-                        if isinstance(msg, str):
-                            await websocket.send_text(msg)
-                        elif isinstance(msg, bytes):
-                            await websocket.send_bytes(msg)
-                except (websockets.ConnectionClosed, Exception):
-                    return
-
-            done, pending = await asyncio.wait(
-                [
-                    asyncio.create_task(client_to_upstream()),
-                    asyncio.create_task(upstream_to_client()),
-                ],
-                return_when=asyncio.FIRST_COMPLETED,
-            )
-            for task in pending:
-                task.cancel()
-
-    except Exception as exc:
-        logger.error("WebSocket proxy error for %s: %s", target, exc)
+            max_size=options.max_frame_size,
+            max_queue=options.queue_size,
+            ping_interval=options.ping_interval,
+            ping_timeout=options.ping_timeout,
+        )
+    except (OSError, asyncio.TimeoutError, websockets.InvalidHandshake) as exc:
+        scope["proxy_error"] = "connect"
+        logger.error("WebSocket upstream %s unavailable: %s", ws_url, exc)
+        await websocket.close(1011)
+        return
+
+    await websocket.accept(subprotocol=upstream.subprotocol)
+    relay = WebSocketRelay(raw_path, target, options)
+    if relays is not None:
+        relays.add(relay)
+    try:
+        await relay.run(websocket, upstream)
     finally:
-        try:
-            await websocket.close()
-        except Exception:
-            pass
+        if relays is not None:
+            relays.discard(relay)
+        logger.debug("WS %s closed: %s", raw_path, relay.stats())
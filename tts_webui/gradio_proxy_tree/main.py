@@ -1,6 +1,11 @@
 import os
 
+import httpx
+
+from tts_webui.config.config_utils import get_config_value
 from tts_webui.gradio_proxy_tree import GradioProxyTree
+from tts_webui.gradio_proxy_tree.file_server import OUTPUT_DIRS
+from tts_webui.gradio_proxy_tree.websocket_relay import WebSocketOptions
 
 GRADIO_TREE_PORT = int(os.environ.get("GRADIO_TREE_PORT", 7769))
 GRADIO_TREE_HOSTNAME = os.environ.get("GRADIO_TREE_HOSTNAME", "127.0.0.1")
@@ -9,14 +14,99 @@ GRADIO_TREE_URL = os.environ.get(
 )
 # GRADIO_TREE_URL = os.environ.get("GRADIO_TREE_URL", f"http://{GRADIO_TREE_HOSTNAME}:{GRADIO_TREE_PORT}")
 
-gradio_proxy_tree = GradioProxyTree(host="0.0.0.0", port=GRADIO_TREE_PORT)
+# With "proxy_tree": {"workers": n}, the proxy runs as its own process with n
+# workers, which read the routes from this file
+ROUTES_FILE = os.path.join("data", "cache", "proxy_routes.json")
+PROXY_TREE_WORKERS = get_config_value("proxy_tree", "workers", 0)
+
+
+def get_websocket_options():
+    return WebSocketOptions(
+        max_frame_size=int(
+            get_config_value("proxy_tree", "ws_max_frame_mb", 16) * 1024 * 1024
+        ),
+        queue_size=get_config_value("proxy_tree", "ws_queue_size", 16),
+        ping_interval=get_config_value("proxy_tree", "ws_ping_interval", 20.0),
+        ping_timeout=get_config_value("proxy_tree", "ws_ping_timeout", 20.0),
+    )
+
+
+def get_output_dirs():
+    # The proxy does not check Gradio logins, so with auth on every file goes
+    # through Gradio
+    if get_config_value("gradio_interface_options", "auth", None):
+        return []
+    return get_config_value("proxy_tree", "output_dirs", list(OUTPUT_DIRS))
+
+
+def create_gradio_proxy_tree(routes_file=None):
+    max_body_mb = get_config_value("proxy_tree", "max_body_mb", None)
+    return GradioProxyTree(
+        host="0.0.0.0",
+        port=GRADIO_TREE_PORT,
+        client_limits=httpx.Limits(
+            max_connections=get_config_value("proxy_tree", "max_connections", 100),
+            max_keepalive_connections=get_config_value(
+                "proxy_tree", "max_keepalive_connections", 20
+            ),
+            keepalive_expiry=get_config_value("proxy_tree", "keepalive_expiry", 30.0),
+        ),
+        http2=get_config_value("proxy_tree", "http2", False),
+        max_body_size=int(max_body_mb * 1024 * 1024) if max_body_mb else None,
+        asset_cache_size=int(
+            get_config_value("proxy_tree", "asset_cache_mb", 64) * 1024 * 1024
+        ),
+        compress_assets=get_config_value("proxy_tree", "compress_assets", False),
+        log_sample_rate=get_config_value("proxy_tree", "log_sample_rate", 0.01),
+        routes_file=routes_file,
+        websocket_options=get_websocket_options(),
+        output_dirs=get_output_dirs(),
+    )
+
+
+gradio_proxy_tree = create_gradio_proxy_tree(
+    ROUTES_FILE if PROXY_TREE_WORKERS else None
+)
 
 print(f"Gradio Proxy Tree initialized on {GRADIO_TREE_HOSTNAME}:{GRADIO_TREE_PORT}")
 
 
 def setup_gradio_proxy_tree(gr_options):
     gradio_proxy_tree.add_route("/", gr_options["server_port"])
-    gradio_proxy_tree.start_background()
+    # Extra routes, e.g. a heavy extension served by several processes:
+    # {"/name": {"targets": [20001, "127.0.0.1:20002"], "strategy": "least_connections"}}
+    extra_routes = get_config_value("proxy_tree", "routes", {}) or {}
+    for prefix, spec in extra_routes.items():
+        gradio_proxy_tree.add_route(
+            prefix, spec["targets"], strategy=spec.get("strategy", "round_robin")
+        )
+    if PROXY_TREE_WORKERS:
+        start_standalone_proxy_tree(PROXY_TREE_WORKERS)
+    else:
+        gradio_proxy_tree.start_background()
+
+
+def start_standalone_proxy_tree(workers):
+    import atexit
+    import subprocess
+    import sys
+
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "tts_webui.gradio_proxy_tree.standalone",
+            "--port",
+            str(GRADIO_TREE_PORT),
+            "--workers",
+            str(workers),
+            "--routes",
+            ROUTES_FILE,
+        ]
+    )
+    atexit.register(process.terminate)
+    print(f"Gradio Proxy Tree running in a separate process with {workers} workers")
+    return process
 
 
 def add_extension_route(package_name, port):
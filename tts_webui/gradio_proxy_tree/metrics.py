@@ -0,0 +1,249 @@
+"""
+Proxy metrics: per-route request counts, latency histograms, bytes and errors.
+
+Exposed by GradioProxyTree at /metrics (Prometheus text format) and
+/metrics.json. Everything is recorded on the proxy's event loop, so no
+locking is needed.
+"""
+
+import random
+import time
+from typing import Optional
+
+import httpx
+from starlette.types import Receive, Scope, Send
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """(le, count) pairs as Prometheus expects, ending with +Inf."""
+        result, total = [], 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((f"{bound:g}", total))
+        result.append(("+Inf", self.count))
+        return result
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "avg": self.sum / self.count if self.count else 0,
+            "buckets": dict(self.cumulative()),
+        }
+
+
+class RouteMetrics:
+    def __init__(self):
+        self.requests: dict[int, int] = {}
+        self.ttfb = Histogram()
+        self.duration = Histogram()
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.active_requests = 0
+        self.active_websockets = 0
+        self.websockets = 0
+        self.upstream_errors: dict[str, int] = {}
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": {str(k): v for k, v in sorted(self.requests.items())},
+            "ttfb": self.ttfb.as_dict(),
+            "duration": self.duration.as_dict(),
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "active_requests": self.active_requests,
+            "active_websockets": self.active_websockets,
+            "websockets": self.websockets,
+            "upstream_errors": dict(self.upstream_errors),
+        }
+
+
+def _message_size(message) -> int:
+    data = message.get("body") or message.get("bytes") or message.get("text") or b""
+    return len(data)
+
+
+class ProxyMetrics:
+    def __init__(self):
+        self.routes: dict[str, RouteMetrics] = {}
+
+    def route(self, prefix: str) -> RouteMetrics:
+        label = prefix or "/"
+        if label not in self.routes:
+            self.routes[label] = RouteMetrics()
+        return self.routes[label]
+
+    async def observe(self, scope: Scope, receive: Receive, send: Send, app, prefix):
+        """
+        Run *app* for one proxied request or websocket, recording its metrics.
+
+        Returns (status, seconds) for logging. Handlers report proxy-side
+        failures by setting scope["proxy_error"].
+        """
+        metrics = self.route(prefix)
+        is_websocket = scope["type"] == "websocket"
+        start = time.perf_counter()
+        state = {"status": None}
+
+        async def counting_receive():
+            message = await receive()
+            metrics.bytes_in += _message_size(message)
+            return message
+
+        async def counting_send(message):
+            message_type = message["type"]
+            if message_type == "http.response.start":
+                state["status"] = message["status"]
+                metrics.ttfb.observe(time.perf_counter() - start)
+            elif message_type == "websocket.accept":
+                state["status"] = 101
+            metrics.bytes_out += _message_size(message)
+            await send(message)
+
+        if is_websocket:
+            metrics.active_websockets += 1
+            metrics.websockets += 1
+        else:
+            metrics.active_requests += 1
+        try:
+            await app(scope, counting_receive, counting_send)
+        finally:
+            seconds = time.perf_counter() - start
+            if is_websocket:
+                metrics.active_websockets -= 1
+            else:
+                metrics.active_requests -= 1
+                metrics.duration.observe(seconds)
+                status = state["status"] or 0
+                metrics.requests[status] = metrics.requests.get(status, 0) + 1
+            error = scope.get("proxy_error")
+            if error:
+                metrics.upstream_errors[error] = (
+                    metrics.upstream_errors.get(error, 0) + 1
+                )
+        return state["status"], seconds
+
+    def as_dict(self, pools: Optional[dict] = None) -> dict:
+        return {
+            "routes": {k: v.as_dict() for k, v in self.routes.items()},
+            "pools": pools or {},
+        }
+
+    def prometheus(self, pools: Optional[dict] = None) -> str:
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(
+                    f'{k}="{_escape(str(v))}"' for k, v in labels.items()
+                )
+                lines.append(f"{name}{{{label_text}}} {value}")
+
+        routes = sorted(self.routes.items())
+        metric(
+            "proxy_requests_total",
+            "counter",
+            "Proxied HTTP requests by route and status.",
+            [
+                ({"route": route, "status": status}, count)
+                for route, m in routes
+                for status, count in sorted(m.requests.items())
+            ],
+        )
+        for name, attr, help_text in (
+            ("proxy_ttfb_seconds", "ttfb", "Time to the response headers."),
+            ("proxy_request_duration_seconds", "duration", "Total request time."),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for route, m in routes:
+                histogram = getattr(m, attr)
+                label = _escape(route)
+                for le, count in histogram.cumulative():
+                    lines.append(f'{name}_bucket{{route="{label}",le="{le}"}} {count}')
+                lines.append(f'{name}_sum{{route="{label}"}} {histogram.sum}')
+                lines.append(f'{name}_count{{route="{label}"}} {histogram.count}')
+        for name, kind, attr, help_text in (
+            ("proxy_bytes_in_total", "counter", "bytes_in", "Bytes from clients."),
+            ("proxy_bytes_out_total", "counter", "bytes_out", "Bytes to clients."),
+            (
+                "proxy_active_requests",
+                "gauge",
+                "active_requests",
+                "In-flight requests.",
+            ),
+            (
+                "proxy_active_websockets",
+                "gauge",
+                "active_websockets",
+                "Open websockets.",
+            ),
+            ("proxy_websockets_total", "counter", "websockets", "Websockets opened."),
+        ):
+            metric(
+                name,
+                kind,
+                help_text,
+                [({"route": route}, getattr(m, attr)) for route, m in routes],
+            )
+        metric(
+            "proxy_upstream_errors_total",
+            "counter",
+            "Requests the proxy failed to forward, by kind.",
+            [
+                ({"route": route, "kind": kind}, count)
+                for route, m in routes
+                for kind, count in sorted(m.upstream_errors.items())
+            ],
+        )
+        metric(
+            "proxy_pool_connections",
+            "gauge",
+            "Upstream connections by state.",
+            [
+                ({"upstream": upstream, "state": state}, count)
+                for upstream, counts in sorted((pools or {}).items())
+                for state, count in counts.items()
+            ],
+        )
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def pool_stats(client: httpx.AsyncClient) -> dict[str, int]:
+    """Active/idle connection counts of a client's pool (empty if unknown)."""
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = getattr(pool, "connections", None)
+    if connections is None:
+        return {}
+    idle = sum(1 for c in connections if c.is_idle())
+    return {"active": len(connections) - idle, "idle": idle}
+
+
+def should_log(sample_rate: float, status: Optional[int]) -> bool:
+    """Log every failed request, and a *sample_rate* fraction of the rest."""
+    if status is None or status >= 500:
+        return True
+    return sample_rate >= 1 or random.random() < sample_rate
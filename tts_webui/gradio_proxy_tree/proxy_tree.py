@@ -8,49 +8,135 @@ Each route maps a URL prefix to a local port, e.g.:
 Routes can be added at any time (even while the server is running).
 """
 
+import asyncio
+import json
 import logging
+import os
 import threading
-from typing import Optional
+from concurrent.futures import Future
+from typing import Callable, Optional, Union
 
+import httpx
 import uvicorn
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
+from starlette.datastructures import Headers
 from starlette.requests import Request
 from starlette.types import ASGIApp, Receive, Scope, Send
 
+from .asset_cache import AssetCache
+from .balancer import UpstreamGroup, read_sticky_target, sticky_cookie
+from .clients import UpstreamClients
+from .file_server import OutputFiles
 from .handlers import proxy_http, proxy_ws
+from .metrics import ProxyMetrics, should_log
+from .routing import RouteTable
+from .websocket_relay import WebSocketOptions, WebSocketRelay
 
 logger = logging.getLogger("gradio_proxy_tree")
 
+# Served by the proxy itself, even when a route is mounted at "/"
+MANAGEMENT_PATHS = frozenset(
+    {"/healthz", "/routes", "/status", "/metrics", "/metrics.json"}
+)
+# Longest a request waits for a stopped upstream woken by an activity listener
+WAKE_TIMEOUT_SECONDS = 120.0
+
 
 class _RouteDispatcher:
     """ASGI middleware that dispatches requests to the right upstream by prefix."""
 
-    def __init__(self, app: ASGIApp):
+    def __init__(
+        self,
+        app: ASGIApp,
+        clients: Optional[UpstreamClients] = None,
+        max_body_size: Optional[int] = None,
+        asset_cache: Optional[AssetCache] = None,
+        log_sample_rate: float = 0.01,
+        websocket_options: Optional[WebSocketOptions] = None,
+        output_files: Optional[OutputFiles] = None,
+    ):
         self.app = app
-        # {"/mms": "http://127.0.0.1:20001", ...}
-        self._routes: dict[str, str] = {}
+        self.output_files = output_files
+        self.websocket_options = websocket_options or WebSocketOptions()
+        # Open websocket relays, for their byte counters in /status
+        self.relays: set[WebSocketRelay] = set()
+        self.metrics = ProxyMetrics()
+        self.log_sample_rate = log_sample_rate
+        self.clients = clients or UpstreamClients()
+        self.max_body_size = max_body_size
+        self.asset_cache = asset_cache
+        # {"/mms": "http://127.0.0.1:20001", ...}, replaced on every change;
+        # the lock only serializes writers
+        self._table = RouteTable()
         self._lock = threading.Lock()
-
-    def add_route(self, prefix: str, target: str):
+        # Called as listener(prefix, delta) with +1 when a proxied request or
+        # websocket starts and -1 when it ends. A listener that (re)starts the
+        # upstream returns a Future, and the request waits for it before it is
+        # forwarded.
+        self._activity_listeners: list[Callable[[str, int], Optional[Future]]] = []
+        self.wake_timeout = WAKE_TIMEOUT_SECONDS
+
+    def add_route(
+        self, prefix: str, targets: Union[str, list[str]], strategy: str = "round_robin"
+    ):
+        if isinstance(targets, str):
+            targets = [targets]
+        group = UpstreamGroup(targets, strategy)
         with self._lock:
-            self._routes[prefix] = target
-        logger.info("Route added: %s -> %s", prefix, target)
+            previous = self._table.routes.get(prefix)
+            self._table = self._table.with_route(prefix, group)
+            routed = {t for g in self._table.routes.values() for t in g.targets}
+        for target in targets:
+            self.clients.add(target)
+        for target in previous.targets if previous is not None else []:
+            if target not in routed:
+                self.clients.remove(target)
+        logger.info("Route added: %s -> %s", prefix, ", ".join(targets))
 
     @property
-    def routes(self) -> dict[str, str]:
-        with self._lock:
-            return dict(self._routes)
+    def routes(self) -> dict[str, Union[str, list[str]]]:
+        return {prefix: g.describe() for prefix, g in self._table.routes.items()}
+
+    @property
+    def groups(self) -> dict[str, UpstreamGroup]:
+        return dict(self._table.routes)
+
+    def upstream_stats(self) -> dict[str, dict]:
+        """Balancing state of the routes with several targets."""
+        return {p: g.stats() for p, g in self._table.routes.items() if g.sticky}
+
+    def add_activity_listener(self, listener: Callable[[str, int], Optional[Future]]):
+        self._activity_listeners.append(listener)
+
+    def _notify(self, prefix: str, delta: int) -> list[Future]:
+        waiting = []
+        for listener in self._activity_listeners:
+            try:
+                result = listener(prefix, delta)
+            except Exception as exc:
+                logger.error("Activity listener failed: %s", exc)
+                continue
+            if isinstance(result, Future):
+                waiting.append(result)
+        return waiting
+
+    async def _wait_for_wake(self, prefix: str, waiting: list[Future]):
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(asyncio.wrap_future(f) for f in waiting)),
+                self.wake_timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.warning(
+                "%s was not ready within %.0fs, forwarding anyway",
+                prefix,
+                self.wake_timeout,
+            )
 
-    def _match(self, path: str) -> Optional[tuple[str, str]]:
+    def _match(self, path: str) -> Optional[tuple[str, UpstreamGroup]]:
         """Find the longest matching prefix for a path."""
-        with self._lock:
-            best = None
-            for prefix, target in self._routes.items():
-                if path == prefix or path.startswith(prefix + "/"):
-                    if best is None or len(prefix) > len(best[0]):
-                        best = (prefix, target)
-            return best
+        return self._table.match(path)
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send):
         if scope["type"] not in ("http", "websocket"):
@@ -58,17 +144,117 @@ class _RouteDispatcher:
             return
 
         path = scope["path"]
-        match = self._match(path)
+        match = None if path in MANAGEMENT_PATHS else self._match(path)
 
         if match is None:
             await self.app(scope, receive, send)
             return
 
-        prefix, target = match
-        if scope["type"] == "http":
-            await proxy_http(scope, receive, send, prefix=prefix, target=target)
-        else:
-            await proxy_ws(scope, receive, send, prefix=prefix, target=target)
+        prefix, group = match
+        if self.output_files is not None and scope.get("method") in ("GET", "HEAD"):
+            file_path = self.output_files.resolve(path)
+            if file_path is not None:
+                await self._serve_file(file_path, scope, receive, send, prefix)
+                return
+
+        waiting = self._notify(prefix, 1)
+        try:
+            if waiting:
+                await self._wait_for_wake(prefix, waiting)
+                # A woken upstream comes back on a new port
+                group = self._table.routes.get(prefix, group)
+
+            preferred = None
+            if group.sticky:
+                cookie = Headers(scope=scope).get("cookie", "")
+                preferred = read_sticky_target(group, prefix, cookie)
+            target = group.pick(preferred)
+            if group.sticky and target != preferred and scope["type"] == "http":
+                send = _with_header(
+                    send, b"set-cookie", sticky_cookie(group, prefix, target)
+                )
+
+            group.acquire(target)
+            try:
+                status, seconds = await self.metrics.observe(
+                    scope, receive, send, self._proxy(prefix, target), prefix
+                )
+            finally:
+                group.release(target, failed=scope.get("proxy_error") == "connect")
+        finally:
+            self._notify(prefix, -1)
+        if should_log(self.log_sample_rate, status):
+            logger.info(
+                "%s %s -> %s %s in %.1fms",
+                scope.get("method", "WS"),
+                path,
+                target,
+                status,
+                seconds * 1000,
+            )
+
+    async def _serve_file(
+        self, file_path: str, scope: Scope, receive: Receive, send: Send, prefix: str
+    ):
+        async def app(scope: Scope, receive: Receive, send: Send):
+            await self.output_files.respond(file_path, scope, receive, send)
+
+        status, seconds = await self.metrics.observe(scope, receive, send, app, prefix)
+        if should_log(self.log_sample_rate, status):
+            logger.info(
+                "%s %s -> file %s in %.1fms",
+                scope["method"],
+                scope["path"],
+                status,
+                seconds * 1000,
+            )
+
+    def _proxy(self, prefix: str, target: str) -> ASGIApp:
+        async def app(scope: Scope, receive: Receive, send: Send):
+            if scope["type"] == "http":
+                async with self.clients.use(target) as client:
+                    await proxy_http(
+                        scope,
+                        receive,
+                        send,
+                        prefix=prefix,
+                        target=target,
+                        client=client,
+                        max_body_size=self.max_body_size,
+                        asset_cache=self.asset_cache,
+                    )
+            else:
+                await proxy_ws(
+                    scope,
+                    receive,
+                    send,
+                    prefix=prefix,
+                    target=target,
+                    options=self.websocket_options,
+                    relays=self.relays,
+                )
+
+        return app
+
+
+def _target(port: Union[int, str], host: str) -> str:
+    if isinstance(port, int):
+        return f"http://{host}:{port}"
+    if port.startswith(("http://", "https://")):
+        return port.rstrip("/")
+    return f"http://{port}"
+
+
+def _with_header(send: Send, name: bytes, value: bytes) -> Send:
+    async def send_with_header(message):
+        if message["type"] == "http.response.start":
+            message = {
+                **message,
+                "headers": [*message.get("headers", []), (name, value)],
+            }
+        await send(message)
+
+    return send_with_header
 
 
 class GradioProxyTree:
@@ -83,12 +269,38 @@ class GradioProxyTree:
         tree.start()  # blocking
     """
 
-    def __init__(self, host: str = "0.0.0.0", port: int = 8079):
+    def __init__(
+        self,
+        host: str = "0.0.0.0",
+        port: int = 8079,
+        client_limits: Optional[httpx.Limits] = None,
+        http2: bool = False,
+        max_body_size: Optional[int] = None,
+        asset_cache_size: int = 0,
+        compress_assets: bool = False,
+        log_sample_rate: float = 0.01,
+        routes_file: Optional[str] = None,
+        websocket_options: Optional[WebSocketOptions] = None,
+        output_dirs: Optional[list[str]] = None,
+    ):
         self.host = host
         self.port = port
+        self.routes_file = routes_file
 
         self._app = FastAPI(title="Gradio Proxy Tree")
-        self._dispatcher = _RouteDispatcher(self._app)
+        self._dispatcher = _RouteDispatcher(
+            self._app,
+            UpstreamClients(limits=client_limits, http2=http2),
+            max_body_size=max_body_size,
+            asset_cache=AssetCache(asset_cache_size, compress=compress_assets)
+            if asset_cache_size
+            else None,
+            log_sample_rate=log_sample_rate,
+            websocket_options=websocket_options,
+            output_files=OutputFiles(output_dirs) if output_dirs else None,
+        )
+        # Lifespan events pass through the dispatcher to FastAPI
+        self._app.router.add_event_handler("shutdown", self._dispatcher.clients.aclose)
 
         self._register_management_routes()
 
@@ -96,6 +308,8 @@ class GradioProxyTree:
         self._thread: Optional[threading.Thread] = None
 
     def _register_management_routes(self):
+        self._status_providers: dict[str, Callable[[], object]] = {}
+
         @self._app.get("/healthz")
         async def health():
             return {"status": "ok", "routes": self._dispatcher.routes}
@@ -104,6 +318,30 @@ class GradioProxyTree:
         async def list_routes():
             return {"routes": self._dispatcher.routes}
 
+        if self._dispatcher.asset_cache is not None:
+            self._status_providers["asset_cache"] = self._dispatcher.asset_cache.stats
+        if self._dispatcher.output_files is not None:
+            self._status_providers["output_files"] = self._dispatcher.output_files.stats
+        self._status_providers["upstreams"] = self._dispatcher.upstream_stats
+        self._status_providers["websockets"] = lambda: [
+            relay.stats() for relay in list(self._dispatcher.relays)
+        ]
+
+        @self._app.get("/status")
+        async def status():
+            return {name: fn() for name, fn in self._status_providers.items()}
+
+        @self._app.get("/metrics")
+        async def metrics():
+            return PlainTextResponse(
+                self._dispatcher.metrics.prometheus(self._dispatcher.clients.stats()),
+                media_type="text/plain; version=0.0.4",
+            )
+
+        @self._app.get("/metrics.json")
+        async def metrics_json():
+            return self._dispatcher.metrics.as_dict(self._dispatcher.clients.stats())
+
         @self._app.api_route(
             "/{path:path}",
             methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS", "HEAD"],
@@ -121,30 +359,99 @@ class GradioProxyTree:
     # Public API
     # ------------------------------------------------------------------
 
-    def add_route(self, prefix: str, port: int, host: str = "127.0.0.1"):
+    def add_route(
+        self,
+        prefix: str,
+        port: Union[int, str, list[Union[int, str]]],
+        host: str = "127.0.0.1",
+        strategy: str = "round_robin",
+    ):
         """
         Add a proxy route: requests to *prefix* are forwarded to *host:port*.
 
+        *port* may also be a list of replicas, each a port on *host*, a
+        "host:port" string or a URL; requests are balanced between them with
+        *strategy* ("round_robin" or "least_connections").
+
         Can be called before or after the server is started.
         """
         if not prefix.startswith("/"):
             prefix = "/" + prefix
         prefix = prefix.rstrip("/")
-        target = f"http://{host}:{port}"
-        self._dispatcher.add_route(prefix, target)
+        ports = port if isinstance(port, list) else [port]
+        targets = [_target(p, host) for p in ports]
+        self._dispatcher.add_route(prefix, targets, strategy)
+        if self.routes_file:
+            self.save_routes(self.routes_file)
 
     @property
-    def routes(self) -> dict[str, str]:
+    def routes(self) -> dict[str, Union[str, list[str]]]:
         return self._dispatcher.routes
 
+    @property
+    def asgi_app(self) -> ASGIApp:
+        """The ASGI application, for serving with an external uvicorn."""
+        return self._dispatcher
+
+    def add_startup_handler(self, handler: Callable):
+        self._app.router.add_event_handler("startup", handler)
+
+    def save_routes(self, path: str):
+        """Write all routes to *path* (JSON), e.g. for standalone workers."""
+        routes = {
+            prefix: {"targets": group.targets, "strategy": group.strategy}
+            for prefix, group in self._dispatcher.groups.items()
+        }
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"routes": routes}, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def load_routes(self, path: str):
+        """Add (or update) the routes listed in a file written by save_routes."""
+        with open(path) as f:
+            routes = json.load(f)["routes"]
+        current = self._dispatcher.groups
+        for prefix, spec in routes.items():
+            group = current.get(prefix)
+            if (
+                group is None
+                or group.targets != spec["targets"]
+                or group.strategy != spec["strategy"]
+            ):
+                self._dispatcher.add_route(prefix, spec["targets"], spec["strategy"])
+
+    def add_activity_listener(self, listener: Callable[[str, int], Optional[Future]]):
+        """
+        Register *listener(prefix, delta)*, called as proxied requests start/end.
+
+        If it returns a concurrent.futures.Future when a request starts, the
+        request is forwarded once the future is done (or after wake_timeout).
+        """
+        self._dispatcher.add_activity_listener(listener)
+
+    def add_status_provider(self, name: str, provider: Callable[[], object]):
+        """Include *provider()* under *name* in the GET /status response."""
+        self._status_providers[name] = provider
+
     def start(self):
         """Start the proxy server (blocking)."""
         logger.info("Proxy tree listening on %s:%d", self.host, self.port)
         for prefix, target in self._dispatcher.routes.items():
             logger.info("  %s -> %s", prefix, target)
 
+        ws = self._dispatcher.websocket_options
         config = uvicorn.Config(
-            self._dispatcher, host=self.host, port=self.port, log_level="info"
+            self._dispatcher,
+            host=self.host,
+            port=self.port,
+            log_level="info",
+            # Client side of the websocket relay, matching the upstream side
+            ws_max_size=ws.max_frame_size,
+            ws_max_queue=ws.queue_size,
+            ws_ping_interval=ws.ping_interval,
+            ws_ping_timeout=ws.ping_timeout,
         )
         self._server = uvicorn.Server(config)
         self._server.run()
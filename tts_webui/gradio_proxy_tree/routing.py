@@ -0,0 +1,56 @@
+"""
+Immutable route table: a trie of path segments with an LRU of recent matches.
+
+Tables are never modified. Adding a route builds a new table and swaps it in
+with one attribute assignment, so requests match against a consistent table
+without taking a lock.
+"""
+
+import functools
+from typing import Any, Optional
+
+MATCH_CACHE_SIZE = 1024
+
+# Key under which a trie node stores the (prefix, target) ending at that node;
+# path segments are strings, so they never collide with it
+_ROUTE = None
+
+
+class RouteTable:
+    """Longest-prefix matching of request paths against route prefixes."""
+
+    def __init__(self, routes: Optional[dict[str, Any]] = None):
+        # prefix -> target (an UpstreamGroup in the dispatcher)
+        self.routes: dict[str, Any] = dict(routes or {})
+        self._root: dict = {}
+        for prefix, target in self.routes.items():
+            node = self._root
+            for segment in _segments(prefix):
+                node = node.setdefault(segment, {})
+            node[_ROUTE] = (prefix, target)
+        self.match = functools.lru_cache(maxsize=MATCH_CACHE_SIZE)(self._match)
+
+    def with_route(self, prefix: str, target: Any) -> "RouteTable":
+        return RouteTable({**self.routes, prefix: target})
+
+    def _match(self, path: str) -> Optional[tuple[str, Any]]:
+        """
+        Find the longest matching prefix for a path.
+
+        A prefix matches the path itself and anything below it, so "/mms"
+        matches "/mms" and "/mms/x" but not "/mmsx". The cost depends on the
+        depth of the path, not on the number of routes.
+        """
+        node = self._root
+        best = node.get(_ROUTE)
+        for segment in _segments(path):
+            node = node.get(segment)
+            if node is None:
+                break
+            best = node.get(_ROUTE, best)
+        return best
+
+
+def _segments(path: str) -> list[str]:
+    # "" (the root route) -> [], "/a/b" -> ["a", "b"]
+    return path.split("/")[1:]
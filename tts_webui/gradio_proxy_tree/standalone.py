@@ -0,0 +1,95 @@
+"""
+Standalone proxy tree with several worker processes.
+
+    python -m tts_webui.gradio_proxy_tree.standalone --routes data/cache/proxy_routes.json --workers 4
+
+Started by the server when "proxy_tree": {"workers": n} is set. Routes are
+read from the routes file, which the server rewrites whenever a route
+changes; every worker reloads it within a second. Extension activity
+tracking and the /status providers of the server process are not available
+to the workers, so the extension supervisor does not stop idle extensions.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+
+from tts_webui.gradio_proxy_tree.proxy_tree import GradioProxyTree
+
+ROUTES_FILE_ENV = "GRADIO_PROXY_TREE_ROUTES"
+
+logger = logging.getLogger("gradio_proxy_tree")
+
+
+def watch_routes_file(tree: GradioProxyTree, path: str, interval: float = 1.0):
+    """Reload *path* into *tree* whenever it changes, from the server's loop."""
+    state = {"mtime": None}
+
+    def reload():
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return
+        if mtime != state["mtime"]:
+            state["mtime"] = mtime
+            try:
+                tree.load_routes(path)
+            except (OSError, ValueError, KeyError) as exc:
+                logger.error("Could not load routes from %s: %s", path, exc)
+
+    async def watch():
+        while True:
+            reload()
+            await asyncio.sleep(interval)
+
+    async def start_watching():
+        asyncio.ensure_future(watch())
+
+    reload()
+    tree.add_startup_handler(start_watching)
+
+
+def create_app():
+    """uvicorn app factory, called once in every worker."""
+    from tts_webui.gradio_proxy_tree.main import create_gradio_proxy_tree
+
+    tree = create_gradio_proxy_tree()
+    watch_routes_file(tree, os.environ[ROUTES_FILE_ENV])
+    return tree.asgi_app
+
+
+def main(argv=None):
+    import uvicorn
+
+    from tts_webui.gradio_proxy_tree.main import (
+        GRADIO_TREE_PORT,
+        ROUTES_FILE,
+        get_websocket_options,
+    )
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=GRADIO_TREE_PORT)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--routes", default=ROUTES_FILE)
+    args = parser.parse_args(argv)
+
+    os.environ[ROUTES_FILE_ENV] = os.path.abspath(args.routes)
+    ws = get_websocket_options()
+    uvicorn.run(
+        "tts_webui.gradio_proxy_tree.standalone:create_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level="info",
+        ws_max_size=ws.max_frame_size,
+        ws_max_queue=ws.queue_size,
+        ws_ping_interval=ws.ping_interval,
+        ws_ping_timeout=ws.ping_timeout,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+WebSocket relay between a proxied client and its upstream.
+
+Each direction is a reader and a writer joined by a bounded queue. When a
+side reads slower than the other writes, the queue fills up, the reader
+stops reading and TCP flow control pushes back on the sender, so a slow
+browser cannot make the proxy buffer an audio stream in memory.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional, Union
+
+import websockets
+from starlette.websockets import WebSocket
+
+logger = logging.getLogger("gradio_proxy_tree")
+
+# Close codes that must not be sent in a close frame
+_RESERVED_CLOSE_CODES = frozenset({1005, 1006, 1015})
+MESSAGE_TOO_BIG = 1009
+
+
+class WebSocketOptions:
+    def __init__(
+        self,
+        max_frame_size: int = 16 * 1024 * 1024,
+        queue_size: int = 16,
+        ping_interval: Optional[float] = 20.0,
+        ping_timeout: Optional[float] = 20.0,
+    ):
+        self.max_frame_size = max_frame_size
+        self.queue_size = queue_size
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+
+
+class WebSocketRelay:
+    """One relayed connection, with its byte and frame counters."""
+
+    def __init__(self, path: str, target: str, options: WebSocketOptions):
+        self.path = path
+        self.target = target
+        self.options = options
+        self.started = time.time()
+        self.bytes_up = 0
+        self.bytes_down = 0
+        self.frames_up = 0
+        self.frames_down = 0
+        self.close_code: Optional[int] = None
+        self._up: "asyncio.Queue[Optional[Union[str, bytes]]]" = asyncio.Queue(
+            options.queue_size
+        )
+        self._down: "asyncio.Queue[Optional[Union[str, bytes]]]" = asyncio.Queue(
+            options.queue_size
+        )
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "target": self.target,
+            "seconds": time.time() - self.started,
+            "bytes_up": self.bytes_up,
+            "bytes_down": self.bytes_down,
+            "frames_up": self.frames_up,
+            "frames_down": self.frames_down,
+            "queued_up": self._up.qsize(),
+            "queued_down": self._down.qsize(),
+        }
+
+    def _closed(self, code: Optional[int]):
+        if self.close_code is None:
+            self.close_code = code
+
+    async def _read_client(self, websocket: WebSocket):
+        try:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    self._closed(message.get("code", 1000))
+                    return
+                data = message.get("text")
+                if data is None:
+                    data = message.get("bytes")
+                if data is None:
+                    continue
+                if len(data) > self.options.max_frame_size:
+                    self._closed(MESSAGE_TOO_BIG)
+                    return
+                self.frames_up += 1
+                self.bytes_up += len(data)
+                await self._up.put(data)
+        finally:
+            await self._up.put(None)
+
+    async def _write_upstream(self, upstream):
+        while (data := await self._up.get()) is not None:
+            await upstream.send(data)
+
+    async def _read_upstream(self, upstream):
+        try:
+            async for data in upstream:
+                self.frames_down += 1
+                self.bytes_down += len(data)
+                await self._down.put(data)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self._closed(upstream.close_code)
+            await self._down.put(None)
+
+    async def _write_client(self, websocket: WebSocket):
+        while (data := await self._down.get()) is not None:
+            if isinstance(data, str):
+                await websocket.send_text(data)
+            else:
+                await websocket.send_bytes(data)
+
+    async def run(self, websocket: WebSocket, upstream):
+        """Relay until either side closes, then close the other with its code."""
+        tasks = [
+            asyncio.ensure_future(self._read_client(websocket)),
+            asyncio.ensure_future(self._read_upstream(upstream)),
+        ]
+        writers = [
+            asyncio.ensure_future(self._write_upstream(upstream)),
+            asyncio.ensure_future(self._write_client(websocket)),
+        ]
+        try:
+            # A writer ends once its reader is done and the queue is drained
+            done, _ = await asyncio.wait(writers, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                error = task.exception()
+                if error is not None and not isinstance(
+                    error, (websockets.ConnectionClosed, RuntimeError)
+                ):
+                    logger.error("WebSocket relay error for %s: %s", self.target, error)
+        finally:
+            for task in tasks + writers:
+                task.cancel()
+            await asyncio.gather(*tasks, *writers, return_exceptions=True)
+
+        code = self.close_code
+        if code is None or code in _RESERVED_CLOSE_CODES:
+            code = 1000
+        await upstream.close(code)
+        try:
+            await websocket.close(code)
+        except Exception:
+            # The client is already gone
+            pass
@@ -1,9 +1,13 @@
 import os
+from typing import Optional
 
 import gradio as gr
 
+# Kept up to date by the output watcher while it runs
+_collections: Optional[list[str]] = None
 
-def get_collections():
+
+def list_collections():
     from tts_webui.utils.get_path_from_root import get_path_from_root
 
     path = get_path_from_root("collections")
@@ -18,6 +22,17 @@ def get_collections():
     ]
 
 
+def set_collections(collections: Optional[list[str]]):
+    global _collections
+    _collections = collections
+
+
+def get_collections():
+    if _collections is not None:
+        return list(_collections)
+    return list_collections()
+
+
 collections_directories_atom = gr.JSON(
     visible=False, value=get_collections(), render=False
 )
@@ -0,0 +1,205 @@
+"""
+Persistent index of the generation directories listed by the History tab.
+
+Each listed directory (outputs, favorites, a collection) has an index in
+data/cache/history_index/ with the parsed date and pretty name of every
+generation. A refresh lists the directory only when its modification time
+changed (adding or removing a generation changes it) and parses only the
+new entries, so opening the tab with tens of thousands of generations does
+not re-parse all of them. The UI asks for one sorted page at a time.
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import threading
+from typing import Optional
+
+from tts_webui.history_tab.generate_pretty_name import generate_pretty_name
+from tts_webui.history_tab.generate_relative_date import generate_relative_date
+from tts_webui.history_tab.parse_time import extract_and_parse_time
+
+INDEX_DIR = os.path.join("data", "cache", "history_index")
+INDEX_VERSION = 1
+SORT_ORDERS = ("Newest first", "Oldest first", "Name")
+DEFAULT_PAGE_SIZE = 100
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def get_wav_in_dir(dir_path: str):
+    return os.path.join(dir_path, f"{os.path.basename(dir_path)}.wav")
+
+
+class HistoryIndex:
+    def __init__(self, directory: str, index_dir: str = INDEX_DIR):
+        self.directory = directory
+        key = hashlib.sha1(os.path.abspath(directory).encode()).hexdigest()[:12]
+        name = os.path.basename(os.path.normpath(directory)) or "root"
+        self.index_path = os.path.join(index_dir, f"{name}_{key}.json")
+        # name -> (timestamp or None, pretty name)
+        self.entries: dict[str, tuple[Optional[float], str]] = {}
+        self.mtime_ns: Optional[int] = None
+        self._sorted: dict[str, list[str]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != INDEX_VERSION:
+            return
+        self.entries = {k: (v[0], v[1]) for k, v in data["entries"].items()}
+        self.mtime_ns = data.get("mtime_ns")
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {
+                    "version": INDEX_VERSION,
+                    "directory": self.directory,
+                    "mtime_ns": self.mtime_ns,
+                    "entries": self.entries,
+                },
+                f,
+            )
+        os.replace(tmp_path, self.index_path)
+
+    def refresh(self, force: bool = False) -> bool:
+        """Bring the index up to date; returns True if anything changed."""
+        with self._lock:
+            try:
+                mtime_ns = os.stat(self.directory).st_mtime_ns
+            except OSError:
+                mtime_ns = None
+            if not force and mtime_ns is not None and mtime_ns == self.mtime_ns:
+                return False
+
+            names = set()
+            if mtime_ns is not None:
+                with os.scandir(self.directory) as it:
+                    names = {e.name for e in it if e.is_dir()}
+            added = names - self.entries.keys()
+            removed = self.entries.keys() - names
+            for name in removed:
+                del self.entries[name]
+            for name in added:
+                self.entries[name] = self._parse(name)
+            changed = bool(added or removed) or mtime_ns != self.mtime_ns
+            self.mtime_ns = mtime_ns
+            if added or removed:
+                self._sorted = {}
+            if changed:
+                self._save_quietly()
+            return changed
+
+    def _parse(self, name: str) -> tuple[Optional[float], str]:
+        full_path = os.path.join(self.directory, name)
+        timestamp = extract_and_parse_time(full_path)
+        return (
+            timestamp.timestamp() if timestamp else None,
+            generate_pretty_name(full_path),
+        )
+
+    def _save_quietly(self):
+        try:
+            self._save()
+        except OSError as e:
+            print(f"Could not save the history index of {self.directory}: {e}")
+
+    def apply(
+        self,
+        added,
+        removed,
+        mtime_ns: Optional[int] = None,
+        previous_mtime_ns: Optional[int] = None,
+    ):
+        """
+        Apply a change reported by the output watcher.
+
+        The watcher listed the directory at *mtime_ns*. If the index was
+        current at *previous_mtime_ns*, it is now current at *mtime_ns* and
+        the next refresh does not list the directory again.
+        """
+        with self._lock:
+            for name in removed:
+                self.entries.pop(name, None)
+            for name in added:
+                if name not in self.entries:
+                    self.entries[name] = self._parse(name)
+            self._sorted = {}
+            if previous_mtime_ns is not None and previous_mtime_ns == self.mtime_ns:
+                self.mtime_ns = mtime_ns
+            self._save_quietly()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _order(self, sort: str) -> list[str]:
+        if sort not in self._sorted:
+            if sort == "Name":
+                key = lambda n: (self.entries[n][1].lower(), n)  # noqa: E731
+                self._sorted[sort] = sorted(self.entries, key=key)
+            else:
+                # Undated generations last when newest first, like before
+                ordered = sorted(
+                    self.entries, key=lambda n: (self.entries[n][0] or 0.0, n)
+                )
+                if sort != "Oldest first":
+                    ordered.reverse()
+                self._sorted[sort] = ordered
+        return self._sorted[sort]
+
+    def page(
+        self,
+        page: int = 1,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        sort: str = SORT_ORDERS[0],
+    ) -> tuple[list[list], int]:
+        """
+        Rows of one page, as [date, name, relative date, wav path], and the
+        number of pages.
+        """
+        with self._lock:
+            order = self._order(sort)
+            pages = max(1, -(-len(order) // page_size))
+            page = min(max(1, page), pages)
+            names = order[(page - 1) * page_size : page * page_size]
+            return [self._row(name) for name in names], pages
+
+    def _row(self, name: str) -> list:
+        timestamp, pretty_name = self.entries[name]
+        date = datetime.datetime.fromtimestamp(timestamp) if timestamp else None
+        return [
+            date or _EPOCH,
+            pretty_name,
+            generate_relative_date(date),  # type: ignore
+            get_wav_in_dir(os.path.join(self.directory, name)),
+        ]
+
+
+_indexes: dict[str, HistoryIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_history_index(directory: str) -> HistoryIndex:
+    """The (refreshed) index of *directory*, shared by all tabs."""
+    with _indexes_lock:
+        key = os.path.abspath(directory)
+        if key not in _indexes:
+            _indexes[key] = HistoryIndex(directory)
+        index = _indexes[key]
+    index.refresh()
+    return index
+
+
+def find_history_index(directory: str) -> Optional[HistoryIndex]:
+    """The index of *directory* if a tab has opened it, without refreshing it."""
+    with _indexes_lock:
+        return _indexes.get(os.path.abspath(directory))
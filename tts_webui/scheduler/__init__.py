@@ -0,0 +1,26 @@
+"""
+TTS WebUI Job Scheduler
+
+Priority classes, per-client fair queuing and admission control for
+generation work.
+"""
+
+from .job_scheduler import (
+    PRIORITY_CLASSES,
+    JobScheduler,
+    QueueFullError,
+    estimate_cost,
+    get_scheduler,
+    job_context,
+    scheduled,
+)
+
+__all__ = [
+    "PRIORITY_CLASSES",
+    "JobScheduler",
+    "QueueFullError",
+    "estimate_cost",
+    "get_scheduler",
+    "job_context",
+    "scheduled",
+]
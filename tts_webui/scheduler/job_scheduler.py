@@ -0,0 +1,427 @@
+"""
+Job Scheduler
+
+Admission control and ordering for generation work:
+- A queue (slot limit) per model, so a long job only blocks its own model
+- Priority classes (interactive > api > batch), strictly ordered
+- Per-client fair queuing within a class, weighted by estimated cost;
+  every Gradio session is its own client
+- Queue depth limits that reject new work with a 429-style error
+- Queue depth and wait time metrics
+"""
+
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional, Union
+
+PRIORITY_CLASSES = {"interactive": 0, "api": 1, "batch": 2}
+DEFAULT_PRIORITY = "interactive"
+DEFAULT_CLIENT_ID = "gradio"
+
+# Relative cost of one ~100 character request, by model name substring
+MODEL_COST_WEIGHTS = {
+    "musicgen": 20.0,
+    "audiogen": 20.0,
+    "magnet": 15.0,
+    "stable-audio": 15.0,
+    "tortoise": 10.0,
+    "bark": 5.0,
+    "whisper": 2.0,
+}
+
+
+class QueueFullError(Exception):
+    """Raised when a job is rejected by admission control."""
+
+    status_code = 429
+
+    def __init__(self, message: str, retry_after: int = 5):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def estimate_cost(text: Optional[str] = None, model: Optional[str] = None) -> float:
+    """Estimate the relative cost of a job from its text length and model."""
+    weight = 1.0
+    if model:
+        model_lower = model.lower()
+        for pattern, pattern_weight in MODEL_COST_WEIGHTS.items():
+            if pattern in model_lower:
+                weight = pattern_weight
+                break
+    length_factor = max(1.0, len(text or "") / 100)
+    return weight * length_factor
+
+
+class _Job:
+    def __init__(
+        self, client_id: str, priority: int, cost: float, queue: Optional[str] = None
+    ):
+        self.client_id = client_id
+        self.priority = priority
+        self.cost = cost
+        self.queue = queue
+        self.enqueued_at = time.monotonic()
+        self.started = False
+
+
+class _PriorityClass:
+    """Pending jobs of one priority class, with start-time fair queuing per client."""
+
+    def __init__(self):
+        self.queues: Dict[str, deque] = {}
+        self.virtual_time: Dict[str, float] = {}
+
+    def __len__(self):
+        return sum(len(q) for q in self.queues.values())
+
+    def push(self, job: _Job):
+        if job.client_id not in self.queues:
+            # A newly active client starts level with the least served active client
+            floor = min((self.virtual_time[c] for c in self.queues), default=0.0)
+            self.virtual_time[job.client_id] = max(
+                self.virtual_time.get(job.client_id, 0.0), floor
+            )
+            self.queues[job.client_id] = deque()
+        self.queues[job.client_id].append(job)
+
+    def pop(self, can_start: Callable[[_Job], bool]) -> Optional[_Job]:
+        """The next job of the least served client that *can_start*, if any."""
+        for client_id in sorted(self.queues, key=lambda c: self.virtual_time[c]):
+            queue = self.queues[client_id]
+            job = next((j for j in queue if can_start(j)), None)
+            if job is None:
+                continue
+            queue.remove(job)
+            if not queue:
+                del self.queues[client_id]
+            self.virtual_time[client_id] += job.cost
+            return job
+        return None
+
+    def client_depth(self, client_id: str) -> int:
+        return len(self.queues.get(client_id, ()))
+
+
+class JobScheduler:
+    """
+    Runs jobs in the calling thread once admitted and dispatched.
+
+    Jobs name the queue (usually the model) they run in. Each queue runs up
+    to its limit of jobs at once, 1 unless configured, so different models
+    run side by side like separate Gradio events did. *max_concurrent*
+    optionally caps the jobs running across all queues.
+
+    Example::
+
+        scheduler = JobScheduler(queue_limits={"whisper-pipe-cpu": 4})
+        result = scheduler.run(
+            generate,
+            kwargs={"text": text},
+            client_id="tts_ab12cd34",
+            priority="api",
+            cost=estimate_cost(text, "bark"),
+            queue="bark",
+        )
+    """
+
+    def __init__(
+        self,
+        max_concurrent: Optional[int] = None,
+        max_queue_depth: int = 64,
+        max_client_queue_depth: int = 16,
+        queue_limits: Optional[Dict[str, int]] = None,
+        default_queue_limit: int = 1,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queue_depth = max_queue_depth
+        self.max_client_queue_depth = max_client_queue_depth
+        # Configured limits win over the ones registered by code
+        self.queue_limits = dict(queue_limits or {})
+        self.default_queue_limit = default_queue_limit
+        self._default_limits: Dict[str, Union[int, Callable[[], int]]] = {}
+
+        self._cond = threading.Condition()
+        self._classes = {p: _PriorityClass() for p in PRIORITY_CLASSES.values()}
+        self._running = 0
+        self._running_by_queue: Dict[str, int] = {}
+
+        self._completed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._dispatched = 0
+
+    def set_queue_limit(self, queue: str, limit: Union[int, Callable[[], int]]):
+        """
+        Default limit of *queue*, unless configured; *limit* may be a callable,
+        e.g. the size of a model pool, which is read on every dispatch.
+        """
+        with self._cond:
+            self._default_limits[queue] = limit
+            self._dispatch()
+
+    def queue_limit(self, queue: str) -> int:
+        limit = self.queue_limits.get(
+            queue, self._default_limits.get(queue, self.default_queue_limit)
+        )
+        return max(1, int(limit() if callable(limit) else limit))
+
+    def _can_start(self, job: _Job) -> bool:
+        return job.queue is None or (
+            self._running_by_queue.get(job.queue, 0) < self.queue_limit(job.queue)
+        )
+
+    def _depth(self) -> int:
+        return sum(len(c) for c in self._classes.values())
+
+    def _admit(self, job: _Job):
+        if self._depth() >= self.max_queue_depth:
+            self._rejected += 1
+            raise QueueFullError(
+                f"Generation queue is full ({self.max_queue_depth} jobs waiting)"
+            )
+        client_depth = sum(
+            c.client_depth(job.client_id) for c in self._classes.values()
+        )
+        if client_depth >= self.max_client_queue_depth:
+            self._rejected += 1
+            raise QueueFullError(
+                f"Too many queued jobs for client '{job.client_id}' "
+                f"({self.max_client_queue_depth} max)"
+            )
+        self._classes[job.priority].push(job)
+
+    def _next_job(self) -> Optional[_Job]:
+        # Strict priority, but a class whose queues are all busy does not
+        # hold back jobs of lower classes in other queues
+        for _, pending in sorted(self._classes.items()):
+            if len(pending):
+                job = pending.pop(self._can_start)
+                if job is not None:
+                    return job
+        return None
+
+    def _dispatch(self):
+        while self.max_concurrent is None or self._running < self.max_concurrent:
+            job = self._next_job()
+            if job is None:
+                return
+            job.started = True
+            self._running += 1
+            if job.queue is not None:
+                self._running_by_queue[job.queue] = (
+                    self._running_by_queue.get(job.queue, 0) + 1
+                )
+
+            wait = time.monotonic() - job.enqueued_at
+            self._dispatched += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(
+        self,
+        *,
+        client_id: Optional[str] = None,
+        priority: Optional[str] = None,
+        cost: float = 1.0,
+        queue: Optional[str] = None,
+    ):
+        """Queue a job, block until it is dispatched, and hold its slot inside the block."""
+        context = current_job_context()
+        job = _Job(
+            client_id=client_id or context["client_id"],
+            priority=PRIORITY_CLASSES[priority or context["priority"]],
+            cost=cost,
+            queue=queue,
+        )
+
+        with self._cond:
+            self._admit(job)
+            self._dispatch()
+            while not job.started:
+                self._cond.wait()
+
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._running -= 1
+                if job.queue is not None:
+                    self._running_by_queue[job.queue] -= 1
+                    if not self._running_by_queue[job.queue]:
+                        del self._running_by_queue[job.queue]
+                self._completed += 1
+                self._dispatch()
+
+    def run(
+        self,
+        fn: Callable,
+        args: tuple = (),
+        kwargs: Optional[dict] = None,
+        *,
+        client_id: Optional[str] = None,
+        priority: Optional[str] = None,
+        cost: float = 1.0,
+        queue: Optional[str] = None,
+    ) -> Any:
+        """Queue *fn*, block until it is dispatched, then run it and return its result."""
+        with self.slot(client_id=client_id, priority=priority, cost=cost, queue=queue):
+            return fn(*args, **(kwargs or {}))
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and wait time metrics."""
+        with self._cond:
+            return {
+                "queue_depth": self._depth(),
+                "queue_depth_by_priority": {
+                    name: len(self._classes[p]) for name, p in PRIORITY_CLASSES.items()
+                },
+                "running": self._running,
+                "running_by_queue": dict(self._running_by_queue),
+                "max_concurrent": self.max_concurrent,
+                "max_queue_depth": self.max_queue_depth,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_wait_seconds": (
+                    self._total_wait / self._dispatched if self._dispatched else 0.0
+                ),
+                "max_wait_seconds": self._max_wait,
+            }
+
+
+_job_context: contextvars.ContextVar[Dict[str, str]] = contextvars.ContextVar(
+    "tts_webui_job_context",
+    default={"client_id": DEFAULT_CLIENT_ID, "priority": DEFAULT_PRIORITY},
+)
+
+
+def _gradio_session_id() -> Optional[str]:
+    """The session hash of the Gradio event being processed, if any."""
+    try:
+        from gradio.context import LocalContext
+    except ImportError:
+        return None
+    request = LocalContext.request.get(None)
+    return getattr(request, "session_hash", None)
+
+
+def current_job_context() -> Dict[str, str]:
+    context = _job_context.get()
+    if context["client_id"] == DEFAULT_CLIENT_ID:
+        # Without an explicit context, each browser session is its own client
+        session_id = _gradio_session_id()
+        if session_id:
+            return {**context, "client_id": f"{DEFAULT_CLIENT_ID}-{session_id}"}
+    return context
+
+
+@contextmanager
+def job_context(client_id: str, priority: str = DEFAULT_PRIORITY):
+    """Set the client and priority class used for jobs submitted in this context."""
+    if priority not in PRIORITY_CLASSES:
+        raise ValueError(f"Unknown priority class: {priority}")
+    token = _job_context.set({"client_id": client_id, "priority": priority})
+    try:
+        yield
+    finally:
+        _job_context.reset(token)
+
+
+_scheduler: Optional[JobScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> JobScheduler:
+    """Get the process-wide scheduler, configured from the 'scheduler' config section."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            from tts_webui.config.config_utils import get_config_value
+
+            _scheduler = JobScheduler(
+                max_concurrent=get_config_value("scheduler", "max_concurrent", None),
+                max_queue_depth=get_config_value("scheduler", "max_queue_depth", 64),
+                max_client_queue_depth=get_config_value(
+                    "scheduler", "max_client_queue_depth", 16
+                ),
+                queue_limits=get_config_value("scheduler", "queue_limits", {}),
+            )
+        return _scheduler
+
+
+# Set while a scheduled function runs, so nested scheduled calls share its slot
+_in_job: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "tts_webui_in_job", default=False
+)
+
+
+def scheduled(model: Optional[str] = None, queue: Optional[str] = None):
+    """
+    Decorator to run a generation function through the job scheduler.
+
+    Jobs run in *queue*, by default *model* or else the function's own name,
+    so each model gets its own slot. The cost is estimated from the "text"
+    (or "prompt") keyword argument and *model*; client and priority come from
+    the surrounding job_context().
+    Generator functions hold their slot until they are exhausted or closed.
+    Scheduled functions called from a scheduled function run in its slot.
+    """
+
+    def decorator(fn):
+        job_queue = queue or model or f"{fn.__module__}.{fn.__qualname__}"
+
+        def _cost(kwargs):
+            text = kwargs.get("text") or kwargs.get("prompt")
+            return estimate_cost(
+                text if isinstance(text, str) else None,
+                model or kwargs.get("model_name"),
+            )
+
+        def _run_in_job(fn, *args, **kwargs):
+            token = _in_job.set(True)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _in_job.reset(token)
+
+        if inspect.isgeneratorfunction(fn):
+
+            @functools.wraps(fn)
+            def gen_wrapper(*args, **kwargs):
+                if _in_job.get():
+                    yield from fn(*args, **kwargs)
+                    return
+                with get_scheduler().slot(cost=_cost(kwargs), queue=job_queue):
+                    gen = fn(*args, **kwargs)
+                    try:
+                        # Gradio may resume the generator from another thread,
+                        # so the flag is set around each step, not the loop
+                        while True:
+                            try:
+                                value = _run_in_job(next, gen)
+                            except StopIteration as e:
+                                return e.value
+                            yield value
+                    finally:
+                        gen.close()
+
+            return gen_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _in_job.get():
+                return fn(*args, **kwargs)
+            with get_scheduler().slot(cost=_cost(kwargs), queue=job_queue):
+                return _run_in_job(fn, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
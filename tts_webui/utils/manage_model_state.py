@@ -1,5 +1,22 @@
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
 import gradio as gr
 
+from tts_webui.utils.model_cache import (
+    ModelCacheManager,
+    create_model_cache,
+    format_bytes,
+)
+from tts_webui.utils.model_preload import (
+    preload_status_as_markdown,
+    register_model_loader,
+)
 from tts_webui.utils.torch_clear_memory import torch_clear_memory
 
 
@@ -12,6 +29,41 @@ class ModelState:
     def __init__(self):
         self._model = None
         self._model_name = None
+        # Held while loading or unloading; concurrent loads of a namespace
+        # wait on it and then reuse the model loaded by the first caller.
+        self.lock = threading.RLock()
+        self._released = threading.Condition(self.lock)
+        # owner -> number of references held while running inference; the
+        # owner is the running generation (see hold_models) or the thread
+        self._users = {}
+
+    def acquire(self, owner=None):
+        with self.lock:
+            owner = owner or _current_owner()
+            self._users[owner] = self._users.get(owner, 0) + 1
+
+    def release(self, owner=None):
+        with self.lock:
+            owner = owner or _current_owner()
+            count = self._users.get(owner, 0) - 1
+            if count > 0:
+                self._users[owner] = count
+            else:
+                self._users.pop(owner, None)
+            self._released.notify_all()
+
+    def in_use(self):
+        return bool(self._users)
+
+    def in_use_by_other_threads(self):
+        """In use by another thread or generation than the current one."""
+        current = (threading.get_ident(), _hold.get())
+        return any(owner not in current for owner in self._users)
+
+    def wait_until_unused(self):
+        """Wait for other threads to release the model. Call with the lock held."""
+        while self.in_use_by_other_threads():
+            self._released.wait()
 
     def set_model(self, model, model_name):
         self._model = model
@@ -30,7 +82,112 @@ class ModelState:
         self._model_name = model_name
 
 
+class ModelHold:
+    """The models used by one generation call, released when it ends."""
+
+    def __init__(self):
+        self.namespaces = []
+
+    def add(self, model_namespace, model_state: ModelState):
+        if model_namespace not in self.namespaces:
+            model_state.acquire(self)
+            get_model_cache().pin(model_namespace)
+            self.namespaces.append(model_namespace)
+
+    def release(self):
+        for model_namespace in self.namespaces:
+            get_model_cache().unpin(model_namespace)
+            get_model_state(model_namespace).release(self)
+        self.namespaces = []
+
+
+_hold: contextvars.ContextVar[Optional[ModelHold]] = contextvars.ContextVar(
+    "tts_webui_model_hold", default=None
+)
+
+
+def _current_owner():
+    return _hold.get() or threading.get_ident()
+
+
+def hold_models(fn):
+    """
+    Decorator to keep the models loaded during a call from being unloaded.
+
+    Every model a manage_model_state loader returns while *fn* runs counts as
+    in use until *fn* returns, so unload_model() and the model cache wait for
+    it like for use(). Generator functions hold their models until they are
+    exhausted or closed. Nested calls share the outer hold.
+    """
+
+    def _run_holding(hold, fn, *args, **kwargs):
+        token = _hold.set(hold)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _hold.reset(token)
+
+    if inspect.isgeneratorfunction(fn):
+
+        @functools.wraps(fn)
+        def gen_wrapper(*args, **kwargs):
+            if _hold.get() is not None:
+                yield from fn(*args, **kwargs)
+                return
+            hold = ModelHold()
+            gen = fn(*args, **kwargs)
+            try:
+                # Gradio may resume the generator from another thread, so the
+                # hold is set around each step
+                while True:
+                    try:
+                        value = _run_holding(hold, next, gen)
+                    except StopIteration as e:
+                        return e.value
+                    yield value
+            finally:
+                _run_holding(hold, gen.close)
+                hold.release()
+
+        return gen_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if _hold.get() is not None:
+            return fn(*args, **kwargs)
+        hold = ModelHold()
+        try:
+            return _run_holding(hold, fn, *args, **kwargs)
+        finally:
+            hold.release()
+
+    return wrapper
+
+
 model_states = {}
+# namespace -> ModelPool, see tts_webui.utils.model_pool
+model_pools = {}
+_model_states_lock = threading.Lock()
+
+
+def get_model_state(model_namespace) -> ModelState:
+    with _model_states_lock:
+        if model_namespace not in model_states:
+            model_states[model_namespace] = ModelState()
+        return model_states[model_namespace]
+
+
+_model_cache = None
+
+
+def get_model_cache() -> ModelCacheManager:
+    """Get the cache manager that budgets and evicts models across namespaces."""
+    global _model_cache
+    if _model_cache is None:
+        _model_cache = create_model_cache(
+            lambda namespace: unload_model(namespace, silent=True, wait=False)
+        )
+    return _model_cache
 
 
 def manage_model_state(model_namespace):
@@ -38,53 +195,153 @@ def manage_model_state(model_namespace):
 
     def decorator(func):
         def wrapper(model_name="default", *args, **kwargs):
-            model_state: ModelState = model_states.setdefault(
-                model_namespace, ModelState()
-            )
+            model_state = get_model_state(model_namespace)
+            model_cache = get_model_cache()
+
+            with model_state.lock:
+                if model_state.is_model_loaded(model_name):
+                    model_cache.record_hit(model_namespace)
+                    _hold_model(model_namespace, model_state)
+                    return model_state.get_model()
+
+                while not model_state.is_model_loaded(model_name):
+                    if model_state.get_model() is not None:
+                        # Waits for in-flight requests on the previous model
+                        unload_model(model_namespace, silent=True)
+                        continue
+                    show(f"Loading model '{model_name}'...")
+                    model_cache.record_miss(model_namespace, model_name)
+                    start_time = time.time()
+                    model = func(model_name, *args, **kwargs)
+                    model_state.set_model(model, model_name)
+                    model_cache.record_load(
+                        model_namespace, model_name, model, time.time() - start_time
+                    )
+
+                _hold_model(model_namespace, model_state)
+                return model_state.get_model()
+
+        @contextmanager
+        def use(model_name="default", *args, **kwargs):
+            """
+            Load the model and hold a reference to it while the block runs.
+
+            unload_model() waits for such references to be released, so the
+            model cannot be unloaded or replaced mid-inference.
+            """
+            model_state = get_model_state(model_namespace)
+            with model_state.lock:
+                model = wrapper(model_name, *args, **kwargs)
+                model_state.acquire()
+                get_model_cache().pin(model_namespace)
+            try:
+                yield model
+            finally:
+                get_model_cache().unpin(model_namespace)
+                model_state.release()
+
+        wrapper.use = use
+        register_model_loader(model_namespace, wrapper)
+        return wrapper
+
+    return decorator
 
-            if not model_state.is_model_loaded(model_name):
-                show(f"Loading model '{model_name}'...")
-                unload_model(model_namespace, silent=True)
-                model = func(model_name, *args, **kwargs)
-                model_state.set_model(model, model_name)
 
-            return model_state.get_model()
+def _hold_model(model_namespace, model_state):
+    hold = _hold.get()
+    if hold is not None:
+        hold.add(model_namespace, model_state)
 
-        return wrapper
 
-    return decorator
+def unload_model(model_namespace, silent=False, wait=True):
+    """
+    Unload the model in a namespace once no other thread is using it.
 
+    With wait=False the model is only unloaded if that can be done without
+    blocking; returns whether a model was unloaded.
+    """
+    if model_namespace in model_pools:
+        unloaded = model_pools[model_namespace].clear(wait=wait)
+        if not silent:
+            show(
+                f"Model in namespace '{model_namespace}' has been unloaded."
+                if unloaded
+                else f"No model loaded in namespace '{model_namespace}'."
+            )
+        return unloaded
 
-def unload_model(model_namespace, silent=False):
-    if (
-        model_namespace in model_states
-        and model_states[model_namespace].get_model() is not None
-    ):
-        model_states[model_namespace].set_model(None, None)
+    if model_namespace not in model_states:
+        if not silent:
+            show(f"No model loaded in namespace '{model_namespace}'.")
+        return False
+
+    model_state = model_states[model_namespace]
+    if not model_state.lock.acquire(blocking=wait):
+        return False
+    try:
+        if model_state.get_model() is None:
+            if not silent:
+                show(f"No model loaded in namespace '{model_namespace}'.")
+            return False
+        if not wait and model_state.in_use_by_other_threads():
+            return False
+        model_state.wait_until_unused()
+        model_state.set_model(None, None)
+        get_model_cache().record_unload(model_namespace)
         # del model_states[model_namespace]
         torch_clear_memory()
         if not silent:
             show(f"Model in namespace '{model_namespace}' has been unloaded.")
-    else:
-        if not silent:
-            show(f"No model loaded in namespace '{model_namespace}'.")
+        return True
+    finally:
+        model_state.lock.release()
 
 
 def unload_all_models():
-    for model_namespace in list(model_states.keys()):
+    for model_namespace in [*model_states.keys(), *model_pools.keys()]:
         unload_model(model_namespace)
 
 
 def list_loaded_models_as_markdown():
-    lines = ["| Model Namespace | Model Name |", "|-----------------|------------|"]
+    model_cache = get_model_cache()
+    lines = [
+        "| Model Namespace | Model Name | RAM | VRAM | Idle |",
+        "|-----------------|------------|-----|------|------|",
+    ]
 
     for namespace, state in model_states.items():
         model_name = state.get_model_name()
-        if model_name:
-            lines.append(f"| {namespace} | {model_name} |")
+        entry = model_cache.get_entry(namespace)
+        if model_name and entry:
+            lines.append(
+                f"| {namespace} | {model_name} | {format_bytes(entry.ram_bytes)} "
+                f"| {format_bytes(entry.vram_bytes)} "
+                f"| {time.time() - entry.last_used:.0f}s |"
+            )
+        elif model_name:
+            lines.append(f"| {namespace} | {model_name} | - | - | - |")
+        else:
+            lines.append(f"| {namespace} | Not Loaded | - | - | - |")
+
+    for namespace, pool in model_pools.items():
+        stats = pool.stats()
+        entry = model_cache.get_entry(namespace)
+        if stats["model_name"] and entry:
+            lines.append(
+                f"| {namespace} | {stats['model_name']} "
+                f"({stats['replicas']}/{stats['size']} replicas, {stats['busy']} busy) "
+                f"| {format_bytes(entry.ram_bytes)} "
+                f"| {format_bytes(entry.vram_bytes)} "
+                f"| {time.time() - entry.last_used:.0f}s |"
+            )
         else:
-            lines.append(f"| {namespace} | Not Loaded |")
+            lines.append(f"| {namespace} | Not Loaded | - | - | - |")
 
+    lines.append("")
+    lines.append(model_cache.stats_as_markdown())
+    preload = preload_status_as_markdown()
+    if preload:
+        lines += ["", preload]
     return "\n".join(lines)
 
 
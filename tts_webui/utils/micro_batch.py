@@ -0,0 +1,116 @@
+import functools
+import threading
+from concurrent.futures import Future
+from typing import Optional
+
+
+class _Batch:
+    def __init__(self):
+        self.items: list[dict] = []
+        self.futures: list[Future] = []
+        self.full = threading.Event()
+
+
+class MicroBatcher:
+    """
+    Collects concurrent requests for the same model into a single batch call.
+
+    Each namespace has its own batcher, and within it requests are batched
+    per (model name, device), so a CPU and a GPU request for the same model
+    never share a call. The first request to arrive for a key becomes the
+    batch leader: it waits up to `window` seconds (or until `max_batch_size`
+    requests have joined), then calls `batch_fn(model_name, items)` once
+    (with `device=` when one was given) and hands each caller its own result.
+    """
+
+    def __init__(self, batch_fn, max_batch_size=8, window=0.02):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.window = window
+        self._lock = threading.Lock()
+        self._open_batches: dict[tuple[str, Optional[str]], _Batch] = {}
+        self.requests = 0
+        self.batches = 0
+
+    def submit(self, model_name, device=None, **item):
+        key = (model_name, device)
+        future = Future()
+        with self._lock:
+            batch = self._open_batches.get(key)
+            is_leader = batch is None
+            if is_leader:
+                batch = self._open_batches[key] = _Batch()
+            batch.items.append(item)
+            batch.futures.append(future)
+            self.requests += 1
+            if len(batch.items) >= self.max_batch_size:
+                self._close(key, batch)
+
+        if is_leader:
+            batch.full.wait(self.window)
+            with self._lock:
+                self._close(key, batch)
+                self.batches += 1
+            self._run(model_name, device, batch)
+
+        return future.result()
+
+    def _close(self, key, batch):
+        if self._open_batches.get(key) is batch:
+            del self._open_batches[key]
+        batch.full.set()
+
+    def _run(self, model_name, device, batch: _Batch):
+        kwargs = {} if device is None else {"device": device}
+        try:
+            results = self.batch_fn(model_name, batch.items, **kwargs)
+            if len(results) != len(batch.items):
+                raise ValueError(
+                    f"Batch function returned {len(results)} results for {len(batch.items)} requests"
+                )
+        except BaseException as e:
+            for future in batch.futures:
+                future.set_exception(e)
+            return
+        for future, result in zip(batch.futures, results):
+            future.set_result(result)
+
+
+_micro_batchers: dict[str, MicroBatcher] = {}
+
+
+def get_micro_batcher(model_namespace) -> Optional[MicroBatcher]:
+    return _micro_batchers.get(model_namespace)
+
+
+def micro_batch(model_namespace, max_batch_size=8, window=0.02):
+    """
+    Decorator turning a batch-capable function into a per-request function.
+
+    The decorated function receives the model name and a list of keyword
+    argument dicts, and must return one result per dict, in order. Callers
+    that pass `device=` are batched per device, and the decorated function
+    receives it as a keyword argument. Callers use
+    it like a regular single-request function, so the usual generation
+    decorators (saving, metadata, logging) still run once per request.
+
+    For example:
+    @micro_batch("whisper-pipe")
+    def transcribe_batch(model_name, batch):
+        pipe = get_pipe(model_name)
+        return [r["text"] for r in pipe([x["inputs"] for x in batch])]
+
+    transcribe_batch("openai/whisper-tiny.en", inputs="audio.wav")
+    """
+
+    def decorator(batch_fn):
+        batcher = MicroBatcher(batch_fn, max_batch_size, window)
+        _micro_batchers[model_namespace] = batcher
+
+        @functools.wraps(batch_fn)
+        def wrapper(model_name="default", device=None, **kwargs):
+            return batcher.submit(model_name, device, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,319 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+GB = 1024**3
+
+
+def _add_tensor(tensor, seen, totals, storages=None):
+    try:
+        storage = tensor.untyped_storage()
+        key = (storage.data_ptr(), tensor.device.type)
+        if key in seen:
+            return
+        seen.add(key)
+        nbytes = storage.nbytes()
+        if storages is not None:
+            storages[key] = nbytes
+    except Exception:
+        nbytes = tensor.numel() * tensor.element_size()
+    if tensor.device.type == "cpu":
+        totals[0] += nbytes
+    else:
+        totals[1] += nbytes
+
+
+def estimate_model_memory(model, max_depth=3, storages=None):
+    """
+    Estimate (ram_bytes, vram_bytes) held by a loaded model.
+
+    Walks torch modules and tensors inside the returned object, including
+    tuples/dicts such as (model, processor) and attributes of wrapper objects
+    such as transformers pipelines. *storages*, if given, is filled with
+    (data_ptr, device type) -> bytes for every tensor storage found.
+    """
+    import torch
+
+    totals = [0, 0]
+    seen_tensors = set()
+    seen_objects = set()
+
+    def visit(obj, depth):
+        if obj is None or id(obj) in seen_objects or depth > max_depth:
+            return
+        seen_objects.add(id(obj))
+        if isinstance(obj, torch.Tensor):
+            _add_tensor(obj, seen_tensors, totals, storages)
+        elif isinstance(obj, torch.nn.Module):
+            for tensor in [*obj.parameters(), *obj.buffers()]:
+                _add_tensor(tensor, seen_tensors, totals, storages)
+        elif isinstance(obj, dict):
+            for value in obj.values():
+                visit(value, depth + 1)
+        elif isinstance(obj, (list, tuple, set)):
+            for value in obj:
+                visit(value, depth + 1)
+        elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+            for value in vars(obj).values():
+                visit(value, depth + 1)
+
+    visit(model, 0)
+    return totals[0], totals[1]
+
+
+def format_bytes(nbytes):
+    if not nbytes:
+        return "-"
+    if nbytes >= GB:
+        return f"{nbytes / GB:.2f} GB"
+    return f"{nbytes / 1024**2:.0f} MB"
+
+
+class CacheEntry:
+    def __init__(self, model_name, ram_bytes, vram_bytes, load_seconds, storages=None):
+        self.model_name = model_name
+        self.ram_bytes = ram_bytes
+        self.vram_bytes = vram_bytes
+        # (data_ptr, device type) -> bytes, so that weights shared with
+        # another namespace are counted once
+        self.storages = storages or {}
+        self.load_seconds = load_seconds
+        self.loaded_at = time.time()
+        self.last_used = time.time()
+
+
+class ModelCacheManager:
+    """
+    Tracks models loaded through manage_model_state across namespaces.
+
+    Keeps loaded namespaces in least-recently-used order, unloads the oldest
+    ones when the estimated RAM/VRAM budget would be exceeded, and unloads
+    models that have been idle longer than `idle_timeout` seconds.
+
+    A namespace whose model holds another namespace's model (e.g. a pipeline
+    wrapping a model) reports the shared weights in both entries, but they
+    count once towards the budget.
+    """
+
+    def __init__(
+        self,
+        unload_fn: Callable[[str], None],
+        ram_budget: Optional[int] = None,
+        vram_budget: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+    ):
+        self.unload_fn = unload_fn
+        self.ram_budget = ram_budget
+        self.vram_budget = vram_budget
+        self.idle_timeout = idle_timeout
+
+        self._lock = threading.RLock()
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        # Last known footprint of (namespace, model_name), used before reloading
+        self._known_sizes: dict[tuple, tuple] = {}
+        self._pinned: dict[str, int] = {}
+        self._reaper: Optional[threading.Thread] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.evictions = 0
+        self.idle_evictions = 0
+        self.total_load_seconds = 0.0
+
+    # ------------------------------------------------------------------
+    # Hooks called by manage_model_state
+    # ------------------------------------------------------------------
+
+    def record_hit(self, namespace):
+        with self._lock:
+            self.hits += 1
+            if namespace in self._entries:
+                self._entries[namespace].last_used = time.time()
+                self._entries.move_to_end(namespace)
+
+    def record_miss(self, namespace, model_name):
+        """Count a miss and make room for the model using its last known size."""
+        with self._lock:
+            self.misses += 1
+            ram, vram = self._known_sizes.get((namespace, model_name), (0, 0))
+            self._enforce_budget(extra_ram=ram, extra_vram=vram, keep=namespace)
+
+    def record_load(self, namespace, model_name, model, load_seconds):
+        storages = {}
+        try:
+            ram, vram = estimate_model_memory(model, storages=storages)
+        except Exception as e:
+            print(f"Could not estimate memory of model '{model_name}': {e}")
+            ram, vram, storages = 0, 0, {}
+        with self._lock:
+            self.loads += 1
+            self.total_load_seconds += load_seconds
+            self._known_sizes[(namespace, model_name)] = (ram, vram)
+            self._entries[namespace] = CacheEntry(
+                model_name, ram, vram, load_seconds, storages
+            )
+            self._entries.move_to_end(namespace)
+            self._enforce_budget(keep=namespace)
+        self._ensure_reaper()
+
+    def record_unload(self, namespace):
+        with self._lock:
+            self._entries.pop(namespace, None)
+
+    # ------------------------------------------------------------------
+    # Eviction
+    # ------------------------------------------------------------------
+
+    def pin(self, namespace):
+        """Protect a namespace from eviction while it is being used."""
+        with self._lock:
+            self._pinned[namespace] = self._pinned.get(namespace, 0) + 1
+
+    def unpin(self, namespace):
+        with self._lock:
+            count = self._pinned.get(namespace, 0) - 1
+            if count > 0:
+                self._pinned[namespace] = count
+            else:
+                self._pinned.pop(namespace, None)
+                # Idle time counts from the end of the last use
+                if namespace in self._entries:
+                    self._entries[namespace].last_used = time.time()
+
+    def _usage(self):
+        ram = vram = 0
+        storages = {}
+        for entry in self._entries.values():
+            if entry.storages:
+                storages.update(entry.storages)
+            else:
+                ram += entry.ram_bytes
+                vram += entry.vram_bytes
+        for (_, device_type), nbytes in storages.items():
+            if device_type == "cpu":
+                ram += nbytes
+            else:
+                vram += nbytes
+        return ram, vram
+
+    def _over_budget(self, extra_ram=0, extra_vram=0):
+        ram, vram = self._usage()
+        return (self.ram_budget is not None and ram + extra_ram > self.ram_budget) or (
+            self.vram_budget is not None and vram + extra_vram > self.vram_budget
+        )
+
+    def _enforce_budget(self, extra_ram=0, extra_vram=0, keep=None):
+        candidates = [
+            ns for ns in self._entries if ns != keep and ns not in self._pinned
+        ]
+        for victim in candidates:
+            if not self._over_budget(extra_ram, extra_vram):
+                return
+            print(f"Model cache over budget, unloading namespace '{victim}'")
+            self._evict(victim)
+
+    def _evict(self, namespace):
+        # unload_fn returns False when the model is busy and was not unloaded
+        if self.unload_fn(namespace) is False:
+            return False
+        self._entries.pop(namespace, None)
+        self.evictions += 1
+        return True
+
+    def evict_idle(self):
+        if not self.idle_timeout:
+            return []
+        now = time.time()
+        with self._lock:
+            idle = [
+                ns
+                for ns, e in self._entries.items()
+                if now - e.last_used > self.idle_timeout and ns not in self._pinned
+            ]
+            evicted = []
+            for namespace in idle:
+                print(
+                    f"Unloading idle model in namespace '{namespace}' "
+                    f"(unused for {now - self._entries[namespace].last_used:.0f}s)"
+                )
+                if self._evict(namespace):
+                    self.idle_evictions += 1
+                    evicted.append(namespace)
+        return evicted
+
+    def _ensure_reaper(self):
+        if not self.idle_timeout or (self._reaper and self._reaper.is_alive()):
+            return
+
+        def reap():
+            while self.idle_timeout:
+                time.sleep(max(1.0, min(60.0, self.idle_timeout / 2)))
+                try:
+                    self.evict_idle()
+                except Exception as e:
+                    print(f"Model cache idle eviction failed: {e}")
+
+        self._reaper = threading.Thread(
+            target=reap, daemon=True, name="model-cache-reaper"
+        )
+        self._reaper.start()
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def get_entry(self, namespace) -> Optional[CacheEntry]:
+        return self._entries.get(namespace)
+
+    def stats(self):
+        with self._lock:
+            ram, vram = self._usage()
+            loads = self.loads
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / (self.hits + self.misses)
+                if self.hits + self.misses
+                else 0.0,
+                "evictions": self.evictions,
+                "idle_evictions": self.idle_evictions,
+                "avg_load_seconds": self.total_load_seconds / loads if loads else 0.0,
+                "ram_bytes": ram,
+                "vram_bytes": vram,
+                "ram_budget": self.ram_budget,
+                "vram_budget": self.vram_budget,
+                "idle_timeout": self.idle_timeout,
+            }
+
+    def stats_as_markdown(self):
+        s = self.stats()
+        budget = lambda used, limit: (  # noqa: E731
+            f"{format_bytes(used)} / {format_bytes(limit)}"
+            if limit
+            else f"{format_bytes(used)} (no budget)"
+        )
+        return (
+            f"RAM: {budget(s['ram_bytes'], s['ram_budget'])} | "
+            f"VRAM: {budget(s['vram_bytes'], s['vram_budget'])} | "
+            f"Hits: {s['hits']} | Misses: {s['misses']} | "
+            f"Evictions: {s['evictions']} ({s['idle_evictions']} idle) | "
+            f"Avg load: {s['avg_load_seconds']:.1f}s"
+        )
+
+
+def _gb_to_bytes(value):
+    return int(float(value) * GB) if value else None
+
+
+def create_model_cache(unload_fn) -> ModelCacheManager:
+    """Create a cache manager configured from the 'model_cache' config section."""
+    from tts_webui.config.config_utils import get_config_value
+
+    return ModelCacheManager(
+        unload_fn,
+        ram_budget=_gb_to_bytes(get_config_value("model_cache", "ram_budget_gb")),
+        vram_budget=_gb_to_bytes(get_config_value("model_cache", "vram_budget_gb")),
+        idle_timeout=get_config_value("model_cache", "idle_timeout_seconds"),
+    )
@@ -0,0 +1,214 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, List, Optional
+
+from tts_webui.scheduler import get_scheduler
+from tts_webui.utils.manage_model_state import get_model_cache, model_pools, show
+from tts_webui.utils.model_cache import estimate_model_memory
+from tts_webui.utils.model_preload import register_model_loader
+from tts_webui.utils.torch_clear_memory import torch_clear_memory
+
+
+class ModelPool:
+    """
+    Up to `size` replicas of one model, checked out by one request at a time.
+
+    Replicas are loaded on demand, so an idle pool holds a single replica.
+    Requesting a different model name waits for checked-out replicas of the
+    current model to be returned, then replaces the pool.
+    """
+
+    def __init__(
+        self, model_namespace: str, load_fn: Callable, size: Optional[int] = None
+    ):
+        self.model_namespace = model_namespace
+        self.load_fn = load_fn
+        self.size = size
+
+        self._cond = threading.Condition()
+        self._model_name = None
+        self._replicas: List = []
+        self._idle: List = []
+        self._busy = 0
+        self._loading = 0
+        self._replica_bytes = (0, 0)
+
+    def get_model_name(self):
+        return self._model_name
+
+    def get_size(self) -> int:
+        """Pool size from config, the decorator argument or the memory budget."""
+        from tts_webui.config.config_utils import get_config_value
+
+        size = get_config_value("model_pools", self.model_namespace, self.size)
+        if size:
+            return max(1, int(size))
+
+        # Fit as many replicas as the budget allows, one per core at most
+        model_cache = get_model_cache()
+        limits = [
+            budget // used
+            for budget, used in zip(
+                (model_cache.ram_budget, model_cache.vram_budget), self._replica_bytes
+            )
+            if budget and used
+        ]
+        if not limits:
+            return 1
+        return max(1, min(os.cpu_count() or 1, *limits))
+
+    def stats(self):
+        with self._cond:
+            return {
+                "model_name": self._model_name,
+                "replicas": len(self._replicas),
+                "busy": self._busy,
+                "loading": self._loading,
+                "size": self.get_size(),
+            }
+
+    def _acquire(self, model_name, args, kwargs):
+        # The model cache hooks are called without holding _cond: the cache
+        # calls clear() with its own lock held when it evicts the pool
+        model_cache = get_model_cache()
+        discarded = False
+        replica = None
+        with self._cond:
+            while True:
+                if self._model_name != model_name:
+                    if self._busy or self._loading:
+                        self._cond.wait()
+                        continue
+                    discarded = self._discard() or discarded
+                    self._model_name = model_name
+                if self._idle:
+                    self._busy += 1
+                    replica = self._idle.pop()
+                    break
+                if len(self._replicas) + self._loading < self.get_size():
+                    self._loading += 1
+                    replica_number = len(self._replicas) + self._loading
+                    break
+                self._cond.wait()
+
+        if discarded:
+            self._unloaded()
+        if replica is not None:
+            model_cache.record_hit(self.model_namespace)
+            return replica
+
+        try:
+            show(f"Loading model '{model_name}' (replica {replica_number})...")
+            model_cache.record_miss(self.model_namespace, model_name)
+            start_time = time.time()
+            replica = self.load_fn(model_name, *args, **kwargs)
+            load_seconds = time.time() - start_time
+        except BaseException:
+            with self._cond:
+                self._loading -= 1
+                self._cond.notify_all()
+            raise
+
+        try:
+            self._replica_bytes = estimate_model_memory(replica)
+        except Exception:
+            pass
+        with self._cond:
+            self._loading -= 1
+            self._busy += 1
+            self._replicas.append(replica)
+            replicas = list(self._replicas)
+        model_cache.record_load(
+            self.model_namespace, model_name, replicas, load_seconds
+        )
+        return replica
+
+    def _release(self, replica):
+        with self._cond:
+            self._busy -= 1
+            if any(r is replica for r in self._replicas):
+                self._idle.append(replica)
+            self._cond.notify_all()
+
+    @contextmanager
+    def checkout(self, model_name="default", *args, **kwargs):
+        """Check out a replica for the duration of the block."""
+        replica = self._acquire(model_name, args, kwargs)
+        get_model_cache().pin(self.model_namespace)
+        try:
+            yield replica
+        finally:
+            get_model_cache().unpin(self.model_namespace)
+            self._release(replica)
+
+    def _discard(self):
+        had_replicas = bool(self._replicas)
+        self._replicas = []
+        self._idle = []
+        self._model_name = None
+        return had_replicas
+
+    def _unloaded(self):
+        get_model_cache().record_unload(self.model_namespace)
+        torch_clear_memory()
+
+    def clear(self, wait=True) -> bool:
+        """
+        Unload all replicas; returns whether any were loaded.
+
+        With wait=False nothing is unloaded if replicas are in use or the
+        pool is locked by another thread.
+        """
+        if not self._cond.acquire(blocking=wait):
+            return False
+        try:
+            if not wait and (self._busy or self._loading):
+                return False
+            while self._busy or self._loading:
+                self._cond.wait()
+            unloaded = self._discard()
+        finally:
+            self._cond.release()
+        if unloaded:
+            self._unloaded()
+        return unloaded
+
+
+def manage_model_pool(model_namespace, size: Optional[int] = None):
+    """
+    Decorator to manage a pool of model replicas for parallel inference.
+
+    The decorated loader becomes a context manager that checks out a replica::
+
+        @manage_model_pool("whisper-pipe-cpu")
+        def get_cpu_pipe(model_name):
+            ...
+
+        with get_cpu_pipe(model_name) as pipe:
+            pipe(audio)
+
+    The pool size comes from the "model_pools" config section (keyed by
+    namespace), then *size*, then the model cache memory budget.
+    """
+
+    def decorator(func):
+        pool = ModelPool(model_namespace, func, size)
+        model_pools[model_namespace] = pool
+
+        def wrapper(model_name="default", *args, **kwargs):
+            return pool.checkout(model_name, *args, **kwargs)
+
+        def load(model_name="default", *args, **kwargs):
+            # Preloading fills one replica
+            with pool.checkout(model_name, *args, **kwargs):
+                pass
+
+        wrapper.pool = pool
+        register_model_loader(model_namespace, load)
+        # Scheduled jobs in the pool's namespace run one per replica
+        get_scheduler().set_queue_limit(model_namespace, pool.get_size)
+        return wrapper
+
+    return decorator
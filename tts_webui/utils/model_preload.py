@@ -0,0 +1,191 @@
+import importlib
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# namespace -> loader created by manage_model_state, called as loader(model_name)
+model_loaders: Dict[str, Callable] = {}
+# namespace -> warmup function, called as warmup(model_name) after loading
+model_warmups: Dict[str, Callable] = {}
+# namespace -> {"model_name", "status", "seconds", "error"}
+preload_status: Dict[str, dict] = {}
+
+_preload_lock = threading.Lock()
+
+
+def register_model_loader(model_namespace, loader):
+    model_loaders[model_namespace] = loader
+
+
+def register_warmup(model_namespace):
+    """
+    Decorator to register a warmup function for a model namespace.
+
+    The function receives the model name and should run a small inference so
+    that kernels are compiled and caches are filled before the first request.
+    """
+
+    def decorator(func):
+        model_warmups[model_namespace] = func
+        return func
+
+    return decorator
+
+
+def _set_status(model_namespace, model_name, status, **extra):
+    preload_status[model_namespace] = {
+        "model_name": model_name,
+        "status": status,
+        **extra,
+    }
+
+
+def _import_extension(extension):
+    """Import an extension so that its loaders are registered (see lazy_load)."""
+    try:
+        importlib.import_module(f"{extension}.main")
+    except Exception as e:
+        print(f"Preload: could not import extension '{extension}': {e}")
+
+
+def preload_model(model_namespace, model_name="default", warmup=False, extension=None):
+    """
+    Load (and optionally warm up) a model. Returns True on success.
+
+    *extension* is the package that registers the namespace, imported first
+    in case its tab has not been built yet.
+    """
+    if extension and model_namespace not in model_loaders:
+        _import_extension(extension)
+    loader = model_loaders.get(model_namespace)
+    if loader is None:
+        print(f"Preload: no model loader registered for namespace '{model_namespace}'")
+        _set_status(model_namespace, model_name, "unknown namespace")
+        return False
+
+    with _preload_lock:
+        start_time = time.time()
+        try:
+            _set_status(model_namespace, model_name, "loading")
+            loader(model_name)
+            if warmup and model_namespace in model_warmups:
+                _set_status(model_namespace, model_name, "warming up")
+                model_warmups[model_namespace](model_name)
+            seconds = time.time() - start_time
+            _set_status(model_namespace, model_name, "ready", seconds=seconds)
+            print(
+                f"Preload: '{model_name}' ({model_namespace}) ready in {seconds:.1f}s"
+            )
+            return True
+        except Exception as e:
+            print(f"Preload: failed to load '{model_name}' ({model_namespace}): {e}")
+            _set_status(model_namespace, model_name, "failed", error=str(e))
+            return False
+
+
+def preload_model_async(
+    model_namespace, model_name="default", warmup=False, extension=None
+):
+    thread = threading.Thread(
+        target=preload_model,
+        args=(model_namespace, model_name, warmup, extension),
+        daemon=True,
+        name=f"preload-{model_namespace}",
+    )
+    thread.start()
+    return thread
+
+
+def _parse_entry(entry):
+    if isinstance(entry, str):
+        namespace, _, model_name = entry.partition(":")
+        return namespace, model_name or "default", False, None
+    return (
+        entry["namespace"],
+        entry.get("model_name", "default"),
+        entry.get("warmup", False),
+        entry.get("extension"),
+    )
+
+
+def start_model_preload(entries: Optional[List] = None):
+    """
+    Preload models listed in the 'model_preload' config section in a background thread.
+
+    Entries are either "namespace:model_name" strings or
+    {"namespace": ..., "model_name": ..., "warmup": true, "extension": ...}
+    objects. Must be called after the extensions (and their loaders) have been
+    imported, or name the "extension" that registers the namespace.
+    """
+    if entries is None:
+        from tts_webui.config.config_utils import get_config_value
+
+        entries = get_config_value("model_preload", "models", [])
+    if not entries:
+        return None
+
+    parsed = [_parse_entry(entry) for entry in entries]
+    for namespace, model_name, _, _ in parsed:
+        _set_status(namespace, model_name, "queued")
+
+    def run():
+        for namespace, model_name, warmup, extension in parsed:
+            preload_model(namespace, model_name, warmup, extension)
+
+    thread = threading.Thread(target=run, daemon=True, name="model-preload")
+    thread.start()
+    return thread
+
+
+def preload_on_select(
+    tab, model_namespace, model_name="default", warmup=False, extension=None
+):
+    """Start loading a model in the background when a tab is selected."""
+
+    def on_select():
+        status = preload_status.get(model_namespace, {})
+        if status.get("status") in ("queued", "loading", "warming up"):
+            return
+        _set_status(model_namespace, model_name, "queued")
+        preload_model_async(model_namespace, model_name, warmup, extension)
+
+    tab.select(fn=on_select, queue=False)
+
+
+def preload_extension_on_select(tab, package_name):
+    """
+    Preload the models configured for an extension when its tab is selected.
+
+    Configured with "model_preload": {"on_select": {"extension_whisper":
+    "whisper-pipe:openai/whisper-large-v3"}}; each value is an entry like in
+    "models", or a list of them.
+    """
+    from tts_webui.config.config_utils import get_config_value
+
+    entries = (get_config_value("model_preload", "on_select", {}) or {}).get(
+        package_name
+    )
+    if not entries:
+        return
+    if not isinstance(entries, list):
+        entries = [entries]
+    for entry in entries:
+        namespace, model_name, warmup, extension = _parse_entry(entry)
+        preload_on_select(tab, namespace, model_name, warmup, extension or package_name)
+
+
+def preload_status_as_markdown():
+    if not preload_status:
+        return ""
+    lines = [
+        "| Preload Namespace | Model Name | Status |",
+        "|-------------------|------------|--------|",
+    ]
+    for namespace, status in preload_status.items():
+        state = status["status"]
+        if "seconds" in status:
+            state += f" ({status['seconds']:.1f}s)"
+        if "error" in status:
+            state += f": {status['error']}"
+        lines.append(f"| {namespace} | {status['model_name']} | {state} |")
+    return "\n".join(lines)
@@ -0,0 +1,389 @@
+"""
+Watches the output directories and reports generations as they come and go.
+
+Watched directories are outputs/, favorites/, outputs-rvc/, collections/ and
+every collection in it. With watchdog installed, filesystem events mark the
+directory they happened in for a check; without it, the modification times
+of the directories are polled, which sees generations being added and
+removed but not files changing inside an existing generation. A check lists
+the directory and compares the names with the previous listing. Once a
+directory has been quiet for "debounce_seconds", its accumulated change is
+passed to the listeners, which update the History tab indexes and the
+collections list, and the database with "sync_database": true.
+
+Enabled by default, configured with
+"output_watcher": {"enabled": true, "debounce_seconds": 2, "poll_interval_seconds": 2}.
+"""
+
+import atexit
+import os
+import sys
+import threading
+import time
+from typing import Callable, Optional
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+WATCHED_DIRECTORIES = ["outputs", "favorites", "outputs-rvc", "collections"]
+# Directories whose subdirectories are watched as well
+NESTED_DIRECTORIES = ["collections"]
+UI_REFRESH_SECONDS = 2.0
+
+
+class OutputChange:
+    def __init__(
+        self,
+        directory: str,
+        added: set[str],
+        removed: set[str],
+        changed: set[str],
+        mtime_ns: Optional[int],
+        previous_mtime_ns: Optional[int],
+    ):
+        self.directory = directory
+        # Names of subdirectories (generations) or files in the directory
+        self.added = added
+        self.removed = removed
+        # Existing entries with files changed inside them (watchdog only)
+        self.changed = changed
+        # Modification time of the directory when it was listed, and at the
+        # listing before
+        self.mtime_ns = mtime_ns
+        self.previous_mtime_ns = previous_mtime_ns
+
+    def paths(self, names: set[str]) -> list[str]:
+        return [os.path.join(self.directory, name) for name in sorted(names)]
+
+    def __repr__(self):
+        return (
+            f"OutputChange({self.directory!r}, added={sorted(self.added)}, "
+            f"removed={sorted(self.removed)}, changed={sorted(self.changed)})"
+        )
+
+
+def _list(directory: str) -> tuple[Optional[int], set[str]]:
+    # Stat before listing: a change after the stat shows up as a newer mtime
+    try:
+        mtime_ns = os.stat(directory).st_mtime_ns
+        with os.scandir(directory) as it:
+            return mtime_ns, {e.name for e in it}
+    except OSError:
+        return None, set()
+
+
+class _Pending:
+    def __init__(self, previous_mtime_ns: Optional[int]):
+        self.added: set[str] = set()
+        self.removed: set[str] = set()
+        self.changed: set[str] = set()
+        self.previous_mtime_ns = previous_mtime_ns
+        self.mtime_ns = previous_mtime_ns
+        self.last_event = time.monotonic()
+
+
+class OutputWatcher:
+    def __init__(
+        self,
+        directories: Optional[list[str]] = None,
+        nested: Optional[list[str]] = None,
+        debounce: float = 2.0,
+        interval: float = 2.0,
+        use_watchdog: bool = True,
+    ):
+        self.directories = list(directories or WATCHED_DIRECTORIES)
+        self.nested = list(NESTED_DIRECTORIES if nested is None else nested)
+        self.debounce = debounce
+        self.interval = interval
+        self.use_watchdog = use_watchdog and Observer is not None
+        # directory -> (mtime_ns, names) of the last listing
+        self._listings: dict[str, tuple[Optional[int], set[str]]] = {}
+        self._pending: dict[str, _Pending] = {}
+        self._dirty: set[str] = set()
+        self._versions: dict[str, int] = {}
+        self._listeners: list[Callable[[OutputChange], None]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._observer = None
+
+    @property
+    def backend(self) -> str:
+        return "watchdog" if self._observer is not None else "polling"
+
+    def add_listener(self, listener: Callable[[OutputChange], None]):
+        self._listeners.append(listener)
+
+    def version(self, directory: str) -> int:
+        """Number of changes reported for *directory*, for UIs to poll."""
+        return self._versions.get(os.path.normpath(directory), 0)
+
+    def _watch(self, directory: str):
+        self._listings[directory] = _list(directory)
+        if directory in self.nested:
+            for name in self._listings[directory][1]:
+                child = os.path.join(directory, name)
+                if os.path.isdir(child):
+                    self._listings[child] = _list(child)
+
+    def start(self):
+        for directory in self.directories:
+            self._watch(os.path.normpath(directory))
+        if self.use_watchdog:
+            try:
+                self._start_observer()
+            except Exception as e:
+                print(f"Output watcher falling back to polling: {e}")
+                self._observer = None
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, daemon=True, name="output-watcher"
+        )
+        self._thread.start()
+
+    def _start_observer(self):
+        watcher = self
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.event_type in ("opened", "closed", "closed_no_write"):
+                    return
+                watcher._on_event(event.src_path)
+                dest_path = getattr(event, "dest_path", "")
+                if dest_path:
+                    watcher._on_event(dest_path)
+
+        observer = Observer()
+        for directory in self.directories:
+            if os.path.isdir(directory):
+                observer.schedule(Handler(), directory, recursive=True)
+        observer.daemon = True
+        observer.start()
+        self._observer = observer
+
+    def _on_event(self, path):
+        """Map an event path to (directory, name) and mark it for a check."""
+        if isinstance(path, bytes):
+            path = os.fsdecode(path)
+        path = os.path.normpath(os.path.relpath(path))
+        parts = path.split(os.sep)
+        if len(parts) < 2 or parts[0] not in self._top_level():
+            return
+        if parts[0] in self.nested and len(parts) > 2:
+            directory, parts = os.path.join(parts[0], parts[1]), parts[2:]
+        else:
+            directory, parts = parts[0], parts[1:]
+        with self._lock:
+            if len(parts) == 1:
+                self._dirty.add(directory)
+            else:
+                mtime_ns = self._listings.get(directory, (None, set()))[0]
+                self._pending_for(directory, mtime_ns).changed.add(parts[0])
+
+    def _top_level(self) -> set[str]:
+        return {os.path.normpath(d) for d in self.directories}
+
+    def _pending_for(
+        self, directory: str, previous_mtime_ns: Optional[int]
+    ) -> _Pending:
+        pending = self._pending.get(directory)
+        if pending is None:
+            pending = self._pending[directory] = _Pending(previous_mtime_ns)
+        pending.last_event = time.monotonic()
+        return pending
+
+    def check(self):
+        """Look for changes, and report the ones that have settled."""
+        if self._observer is not None:
+            with self._lock:
+                dirty, self._dirty = self._dirty, set()
+        else:
+            dirty = set()
+            for directory, (mtime_ns, _) in list(self._listings.items()):
+                try:
+                    if os.stat(directory).st_mtime_ns != mtime_ns:
+                        dirty.add(directory)
+                except OSError:
+                    if mtime_ns is not None:
+                        dirty.add(directory)
+        for directory in dirty:
+            self._check(directory)
+        self._flush()
+
+    def _check(self, directory: str):
+        previous_mtime_ns, previous = self._listings.get(directory, (None, set()))
+        mtime_ns, names = _list(directory)
+        self._listings[directory] = (mtime_ns, names)
+        added, removed = names - previous, previous - names
+        if directory in self.nested:
+            for name in added:
+                child = os.path.join(directory, name)
+                if os.path.isdir(child):
+                    self._listings[child] = _list(child)
+            for name in removed:
+                self._listings.pop(os.path.join(directory, name), None)
+        with self._lock:
+            if not added and not removed and directory not in self._pending:
+                return
+            pending = self._pending_for(directory, previous_mtime_ns)
+            # A name added and removed again within the debounce cancels out
+            pending.added, pending.removed = (
+                (pending.added - removed) | (added - pending.removed),
+                (pending.removed - added) | (removed - pending.added),
+            )
+            pending.mtime_ns = mtime_ns
+
+    def _flush(self):
+        now = time.monotonic()
+        with self._lock:
+            ready = [
+                (directory, pending)
+                for directory, pending in self._pending.items()
+                if now - pending.last_event >= self.debounce
+            ]
+            for directory, _ in ready:
+                del self._pending[directory]
+        for directory, pending in ready:
+            if not (pending.added or pending.removed or pending.changed):
+                continue
+            change = OutputChange(
+                directory,
+                pending.added,
+                pending.removed,
+                pending.changed - pending.added - pending.removed,
+                pending.mtime_ns,
+                pending.previous_mtime_ns,
+            )
+            for listener in self._listeners:
+                try:
+                    listener(change)
+                except Exception as e:
+                    print(f"Output watcher listener failed for {directory}: {e}")
+            self._versions[directory] = self._versions.get(directory, 0) + 1
+
+    def _run(self):
+        # Events are checked often, the debounce decides when they are reported
+        while not self._stop.wait(min(self.interval, self.debounce / 2 or 0.1)):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"Output watcher check failed: {e}")
+
+    def stop(self):
+        self._stop.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=5)
+            self._observer = None
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+def update_history_index(change: OutputChange):
+    from tts_webui.history_tab.history_index import find_history_index
+
+    index = find_history_index(change.directory)
+    if index is not None and (change.added or change.removed):
+        # The index lists generation directories, not loose files
+        added = {n for n in change.added if os.path.isdir(change.paths({n})[0])}
+        index.apply(added, change.removed, change.mtime_ns, change.previous_mtime_ns)
+
+
+def update_collections(change: OutputChange):
+    from tts_webui.history_tab.collections_directories_atom import (
+        list_collections,
+        set_collections,
+    )
+
+    if change.directory in NESTED_DIRECTORIES:
+        set_collections(list_collections())
+
+
+def update_database(change: OutputChange):
+    from tts_webui.database.rescan import sync_paths
+
+    sync_paths(
+        change.paths(change.added | change.changed), change.paths(change.removed)
+    )
+
+
+_watcher: Optional[OutputWatcher] = None
+
+
+def get_output_watcher() -> Optional[OutputWatcher]:
+    """The running watcher, or None if it is disabled."""
+    return _watcher
+
+
+def start_output_watcher() -> Optional[OutputWatcher]:
+    global _watcher
+    from tts_webui.config.config_utils import get_config_value
+    from tts_webui.history_tab.collections_directories_atom import (
+        list_collections,
+        set_collections,
+    )
+
+    if _watcher is not None or not get_config_value("output_watcher", "enabled", True):
+        return _watcher
+
+    watcher = OutputWatcher(
+        debounce=get_config_value("output_watcher", "debounce_seconds", 2.0),
+        interval=get_config_value("output_watcher", "poll_interval_seconds", 2.0),
+    )
+    watcher.add_listener(update_history_index)
+    watcher.add_listener(update_collections)
+    # Off by default like the database itself, see start_database_and_api
+    if get_config_value("output_watcher", "sync_database", False) and not (
+        "--no-database" in sys.argv or "--docker" in sys.argv
+    ):
+        from tts_webui.database.connection import init_db
+
+        init_db()
+        watcher.add_listener(update_database)
+    set_collections(list_collections())
+    watcher.start()
+    atexit.register(watcher.stop)
+    print(f"Watching outputs for changes ({watcher.backend})")
+    _watcher = watcher
+    return watcher
+
+
+def refresh_on_output_change(fn, directory, inputs, outputs):
+    """
+    Re-run *fn(*inputs)* into *outputs* after the watcher reports a change
+    in *directory* (a path or a component holding one), from a gr.Timer.
+    """
+    import gradio as gr
+
+    watcher = get_output_watcher()
+    if watcher is None:
+        return
+
+    directory_inputs = [] if isinstance(directory, str) else [directory]
+    initial = directory if isinstance(directory, str) else directory.value
+    seen = gr.State(watcher.version(initial) if initial else 0)
+
+    def tick(seen_version, *values):
+        if directory_inputs:
+            current, values = values[0], values[1:]
+        else:
+            current = directory
+        version = watcher.version(current)
+        if version == seen_version:
+            return [seen_version, *[gr.skip() for _ in outputs]]
+        result = fn(*values)
+        if not isinstance(result, (list, tuple)):
+            result = [result]
+        return [version, *result]
+
+    gr.Timer(UI_REFRESH_SECONDS).tick(
+        fn=tick,
+        inputs=[seen, *directory_inputs, *inputs],
+        outputs=[seen, *outputs],
+        show_progress="hidden",
+    )
@@ -17,6 +17,15 @@ def write_log(output, name, type):
         outfile.write("\n".join(output))
 
 
+def _invalidate_extension_discovery():
+    # Installed extensions and their versions may have changed
+    from tts_webui.extensions_loader.extension_discovery import (
+        invalidate_extension_discovery,
+    )
+
+    invalidate_extension_discovery()
+
+
 def pip_install_wrapper(requirements, name, include_gradio=True):
     def fn():
         output = []
@@ -26,6 +35,8 @@ def pip_install_wrapper(requirements, name, include_gradio=True):
             yield "<br />".join(output)
 
         write_log(output, name, type="pip-install")
+        if "--dry-run" not in requirements:
+            _invalidate_extension_discovery()
         return line
         # verify installation by importing the package or drying run install
 
@@ -66,6 +77,7 @@ def venv_setup_wrapper(requirements, name, package_name):
         output.append(message)
 
         write_log(output, name, type="uv-venv-install")
+        _invalidate_extension_discovery()
         return line
 
     return fn
@@ -79,6 +91,7 @@ def pip_uninstall_wrapper(package_name, name):
             yield "<br />".join(output)
 
         write_log(output, name, type="pip-uninstall")
+        _invalidate_extension_discovery()
 
     return fn
 
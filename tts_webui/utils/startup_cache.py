@@ -0,0 +1,136 @@
+"""
+Experimental extension discovery cache, enabled with
+"startup_cache": {"enabled": true}.
+
+Persists the extension discovery results (which extensions are installed,
+and their versions) across restarts, in data/cache/startup_cache.json
+together with a fingerprint of what they depend on: the Python version, the
+extension catalogs, the "extensions" section of config.json (disabled,
+autostart and lazily loaded extensions) and the installed packages
+(site-packages and .venvs modification times). When the fingerprint
+changes, the cache is discarded; other settings keep it.
+
+The Gradio layout itself is not cached: its event handlers are closures
+created while the tabs are built, which cannot be restored from a
+serialized config, so the UI is always built from the extensions.
+"""
+
+import hashlib
+import json
+import os
+import site
+import sys
+import threading
+from typing import Any, Dict, Optional
+
+CACHE_FILE = os.path.join("data", "cache", "startup_cache.json")
+VENVS_DIR = ".venvs"
+
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _package_dirs():
+    dirs = []
+    try:
+        dirs += site.getsitepackages()
+    except AttributeError:
+        pass
+    user_site = site.getusersitepackages() if site.ENABLE_USER_SITE else None
+    if user_site:
+        dirs.append(user_site)
+    dirs += [p for p in sys.path if p.endswith("site-packages")]
+    dirs.append(VENVS_DIR)
+    return sorted(set(dirs))
+
+
+def compute_fingerprint() -> str:
+    """
+    Fingerprint of the inputs to extension discovery.
+
+    Installing, upgrading or removing a package adds or replaces its
+    *.dist-info directory, which changes the site-packages modification time.
+    """
+    from tts_webui.config.config_utils import get_config_value
+    from tts_webui.extensions_loader.extensions_data_loader import (
+        get_catalog_files_key,
+    )
+
+    parts = {
+        "python": sys.version,
+        "catalogs": list(get_catalog_files_key()),
+        "extensions": {
+            key: get_config_value("extensions", key) or []
+            for key in ("disabled", "disabled_decorators", "autostart", "eager")
+        },
+        "packages": {d: _mtime(d) for d in _package_dirs()},
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+class StartupCache:
+    def __init__(self, path: str = CACHE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data: Optional[Dict[str, Any]] = None
+        self._fingerprint: Optional[str] = None
+        self._dirty = False
+
+    def is_enabled(self) -> bool:
+        from tts_webui.config.config_utils import get_config_value
+
+        return bool(get_config_value("startup_cache", "enabled", False))
+
+    def _load(self):
+        if self._data is not None:
+            return
+        self._fingerprint = compute_fingerprint()
+        self._data = {}
+        try:
+            with open(self.path) as f:
+                stored = json.load(f)
+            if stored.get("fingerprint") == self._fingerprint:
+                self._data = stored.get("sections", {})
+        except (OSError, ValueError):
+            pass
+
+    def get(self, section: str) -> Optional[Any]:
+        if not self.is_enabled():
+            return None
+        with self._lock:
+            self._load()
+            return self._data.get(section)
+
+    def set(self, section: str, value: Any):
+        if not self.is_enabled():
+            return
+        with self._lock:
+            self._load()
+            self._data[section] = value
+            self._dirty = True
+
+    def save(self):
+        """Write the cache if anything changed; call once startup is done."""
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"fingerprint": self._fingerprint, "sections": self._data}, f)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+    def invalidate(self):
+        with self._lock:
+            self._data = None
+            self._dirty = False
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+startup_cache = StartupCache()
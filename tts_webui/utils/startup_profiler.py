@@ -0,0 +1,273 @@
+"""
+Startup profiler, enabled with `python server.py --profile-startup`.
+
+Records:
+- Import times per module (self and cumulative, like `python -X importtime`)
+- Named phases, such as each extension tab, decorator and Gradio block construction,
+  with the imports that happened during each phase
+- Total time until the server is listening
+
+Reports are written to data/startup_profiles/ as JSON and HTML, and a summary
+of every run is appended to history.jsonl to spot regressions.
+"""
+
+import html
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+PROFILES_DIR = os.path.join("data", "startup_profiles")
+HISTORY_FILE = "history.jsonl"
+TOP_IMPORTS = 40
+
+
+class _ImportTimer:
+    """Meta path finder that times module execution for the modules it finds."""
+
+    def __init__(self, profiler: "StartupProfiler"):
+        self.profiler = profiler
+        self._local = threading.local()
+
+    def find_spec(self, name, path=None, target=None):
+        if getattr(self._local, "finding", False):
+            return None
+        self._local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(name, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._local.finding = False
+
+        loader = spec.loader
+        # Built-in and frozen importers are classes shared by all modules
+        if (
+            loader is None
+            or isinstance(loader, type)
+            or not hasattr(loader, "exec_module")
+        ):
+            return spec
+        try:
+            loader.exec_module = self._timed(name, loader.exec_module)
+        except (AttributeError, TypeError):
+            pass
+        return spec
+
+    def _timed(self, name, exec_module):
+        def timed_exec_module(module):
+            stack = self._stack()
+            parent = stack[-1][0] if stack else None
+            stack.append([name, 0.0])
+            start = time.perf_counter()
+            try:
+                exec_module(module)
+            finally:
+                cumulative = time.perf_counter() - start
+                _, children = stack.pop()
+                if stack:
+                    stack[-1][1] += cumulative
+                self.profiler._record_import(
+                    name, cumulative - children, cumulative, parent
+                )
+
+        return timed_exec_module
+
+    def _stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+
+class StartupProfiler:
+    def __init__(self):
+        self.enabled = False
+        self.start_time = time.time()
+        self.imports: Dict[str, Dict[str, Any]] = {}
+        self.phases: List[Dict[str, Any]] = []
+        self._phase_stack: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._timer: Optional[_ImportTimer] = None
+
+    def start(self):
+        """Start profiling; call as early as possible during startup."""
+        if self.enabled:
+            return
+        self.enabled = True
+        self.start_time = time.time()
+        self._timer = _ImportTimer(self)
+        sys.meta_path.insert(0, self._timer)
+        print("Startup profiling enabled")
+
+    def stop(self):
+        if self._timer in sys.meta_path:
+            sys.meta_path.remove(self._timer)
+        self.enabled = False
+
+    def _record_import(self, name, self_seconds, cumulative_seconds, parent):
+        with self._lock:
+            self.imports[name] = {
+                "self": self_seconds,
+                "cumulative": cumulative_seconds,
+                "parent": parent,
+                "phase": self._phase_stack[-1]["name"] if self._phase_stack else None,
+            }
+
+    @contextmanager
+    def phase(self, name: str, kind: str = "phase"):
+        """Time a named startup phase, e.g. building one extension tab."""
+        if not self.enabled:
+            yield
+            return
+        entry = {"name": name, "kind": kind, "start": time.time() - self.start_time}
+        self._phase_stack.append(entry)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry["seconds"] = time.perf_counter() - start
+            self._phase_stack.remove(entry)
+            self.phases.append(entry)
+
+    def report(self, total_seconds: Optional[float] = None) -> Dict[str, Any]:
+        total = (
+            total_seconds
+            if total_seconds is not None
+            else time.time() - self.start_time
+        )
+        phases = []
+        for phase in self.phases:
+            top_level = [
+                (name, data["cumulative"])
+                for name, data in self.imports.items()
+                if data["phase"] == phase["name"]
+                and self.imports.get(data["parent"], {}).get("phase") != phase["name"]
+            ]
+            phases.append(
+                {
+                    **phase,
+                    "import_seconds": sum(seconds for _, seconds in top_level),
+                    "top_imports": sorted(top_level, key=lambda x: -x[1])[:10],
+                }
+            )
+        imports = sorted(
+            ({"module": name, **data} for name, data in self.imports.items()),
+            key=lambda x: -x["self"],
+        )
+        return {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "time_to_listen": total,
+            "python": sys.version.split()[0],
+            "phases": phases,
+            "imports": imports,
+            "import_count": len(imports),
+        }
+
+    def finish(self, output_dir: str = PROFILES_DIR) -> Optional[str]:
+        """Stop profiling and write the JSON/HTML reports; returns the HTML path."""
+        if not self.enabled:
+            return None
+        total = time.time() - self.start_time
+        self.stop()
+        report = self.report(total)
+
+        os.makedirs(output_dir, exist_ok=True)
+        name = datetime.now().strftime("startup_%Y%m%d_%H%M%S")
+        with open(os.path.join(output_dir, f"{name}.json"), "w") as f:
+            json.dump(report, f, indent=2)
+
+        history = load_history(output_dir)
+        summary = {
+            "timestamp": report["timestamp"],
+            "report": f"{name}.json",
+            "time_to_listen": total,
+            "phases": {p["name"]: p["seconds"] for p in report["phases"]},
+        }
+        with open(os.path.join(output_dir, HISTORY_FILE), "a") as f:
+            f.write(json.dumps(summary) + "\n")
+
+        html_path = os.path.join(output_dir, f"{name}.html")
+        with open(html_path, "w") as f:
+            f.write(render_html(report, history))
+        with open(os.path.join(output_dir, "latest.html"), "w") as f:
+            f.write(render_html(report, history))
+
+        print(f"Startup took {total:.2f}s, profile written to {html_path}")
+        return html_path
+
+
+def load_history(output_dir: str = PROFILES_DIR) -> List[Dict[str, Any]]:
+    path = os.path.join(output_dir, HISTORY_FILE)
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _row(*cells):
+    return "<tr>" + "".join(f"<td>{html.escape(str(c))}</td>" for c in cells) + "</tr>"
+
+
+def render_html(report: Dict[str, Any], history: List[Dict[str, Any]]) -> str:
+    previous = history[-1] if history else None
+    phase_rows = []
+    for phase in sorted(report["phases"], key=lambda p: -p["seconds"]):
+        before = previous["phases"].get(phase["name"]) if previous else None
+        change = f"{phase['seconds'] - before:+.2f}s" if before is not None else ""
+        phase_rows.append(
+            _row(
+                phase["kind"],
+                phase["name"],
+                f"{phase['seconds']:.2f}s",
+                change,
+                f"{phase['import_seconds']:.2f}s",
+                ", ".join(f"{m} ({s:.2f}s)" for m, s in phase["top_imports"][:5]),
+            )
+        )
+    import_rows = [
+        _row(
+            i["module"],
+            f"{i['self'] * 1000:.1f}",
+            f"{i['cumulative'] * 1000:.1f}",
+            i["phase"] or "",
+        )
+        for i in report["imports"][:TOP_IMPORTS]
+    ]
+    history_rows = [
+        _row(h["timestamp"], f"{h['time_to_listen']:.2f}s")
+        for h in [*history[-20:]][::-1]
+    ]
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>TTS WebUI startup profile</title>
+<style>
+body {{ font-family: sans-serif; margin: 2rem; }}
+table {{ border-collapse: collapse; margin-bottom: 2rem; }}
+td, th {{ border: 1px solid #ccc; padding: 0.25rem 0.5rem; text-align: left; }}
+</style></head><body>
+<h1>Startup profile {html.escape(report["timestamp"])}</h1>
+<p>Time to listen: <b>{report["time_to_listen"]:.2f}s</b>
+({report["import_count"]} modules imported)</p>
+<h2>Phases</h2>
+<table><tr><th>Kind</th><th>Name</th><th>Time</th><th>Change vs previous run</th>
+<th>Imports</th><th>Slowest imports</th></tr>
+{"".join(phase_rows)}</table>
+<h2>Slowest imports</h2>
+<table><tr><th>Module</th><th>Self (ms)</th><th>Cumulative (ms)</th><th>Phase</th></tr>
+{"".join(import_rows)}</table>
+<h2>Previous runs</h2>
+<table><tr><th>Run</th><th>Time to listen</th></tr>
+{"".join(history_rows)}</table>
+</body></html>
+"""
+
+
+profiler = StartupProfiler()
@@ -1,16 +1,154 @@
 """
 Utility module to monkeypatch torch.load to always use weights_only=False.
 This addresses the issue with PyTorch 2.6 changing the default value of weights_only from False to True.
+
+Optionally (config section "torch_load"):
+- "mmap": load checkpoint files memory-mapped instead of reading them into RAM
+- "weight_cache_gb": keep recently loaded state dicts in an LRU cache, so models
+  that are unloaded and reloaded do not re-read their weights from disk
+
+Only state dicts whose tensors are all on the CPU are cached; weights loaded
+straight to a GPU would otherwise stay in VRAM after their model is unloaded.
+A cache hit returns new dicts holding the cached tensors themselves, so
+replacing or deleting keys is safe but modifying a tensor in place (e.g.
+`state_dict["w"].mul_(2)`) changes it for later loads too. Loading into a
+model with load_state_dict() copies the tensors and is not affected.
 """
 
 import functools
 import logging
+import os
+import threading
+from collections import OrderedDict
 
 import torch
 
 # Store the original torch.load function
 original_torch_load = torch.load
 
+_options = {"mmap": False, "weight_cache_bytes": 0}
+
+
+class WeightCache:
+    """LRU cache of deserialized state dicts, bounded by total tensor bytes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+            return None
+
+    def put(self, key, value, nbytes, max_bytes):
+        if nbytes > max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, nbytes)
+            self.bytes += nbytes
+            while self.bytes > max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.bytes -= evicted_bytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+weight_cache = WeightCache()
+
+
+def _state_dict_bytes(obj):
+    """
+    Size of a (nested) dict of CPU tensors, or None if it holds anything else.
+    """
+    if isinstance(obj, torch.Tensor):
+        if obj.device.type != "cpu":
+            return None
+        return obj.numel() * obj.element_size()
+    if isinstance(obj, dict):
+        total = 0
+        for value in obj.values():
+            if isinstance(value, (torch.Tensor, dict)):
+                size = _state_dict_bytes(value)
+                if size is None:
+                    return None
+                total += size
+            elif not isinstance(value, (int, float, str, bool, type(None))):
+                return None
+        return total
+    return None
+
+
+def _copy_dicts(obj):
+    """Copy the nested dicts of a state dict, sharing the tensors."""
+    if isinstance(obj, dict):
+        return {k: _copy_dicts(v) for k, v in obj.items()}
+    return obj
+
+
+def _cache_key(f, kind, extra):
+    if not isinstance(f, (str, os.PathLike)):
+        return None
+    try:
+        stat = os.stat(f)
+    except OSError:
+        return None
+    return (kind, os.path.abspath(f), stat.st_mtime_ns, stat.st_size, repr(extra))
+
+
+def _cached_load(f, kind, extra, load):
+    """
+    Load through the weight cache when it is enabled.
+
+    Only plain state dicts of CPU tensors are cached; pickled modules and other
+    objects may be mutated by the caller (e.g. moved to another device), so
+    they are not shared.
+    """
+    max_bytes = _options["weight_cache_bytes"]
+    key = _cache_key(f, kind, extra) if max_bytes else None
+    if key is None:
+        return load()
+
+    cached = weight_cache.get(key)
+    if cached is not None:
+        return _copy_dicts(cached)
+
+    result = load()
+    nbytes = _state_dict_bytes(result)
+    if nbytes is not None and isinstance(result, dict):
+        weight_cache.put(key, result, nbytes, max_bytes)
+        return _copy_dicts(result)
+    return result
+
+
+def _load_mmap(args, kwargs):
+    try:
+        return original_torch_load(*args, **{**kwargs, "mmap": True})
+    except RuntimeError as e:
+        # Legacy (non-zipfile) checkpoints cannot be memory-mapped
+        logging.debug(f"torch.load mmap failed, falling back to a regular load: {e}")
+        return original_torch_load(*args, **kwargs)
+
 
 @functools.wraps(original_torch_load)
 def patched_torch_load(*args, **kwargs):
@@ -22,15 +160,75 @@ def patched_torch_load(*args, **kwargs):
     if "weights_only" not in kwargs:
         kwargs["weights_only"] = False
 
-    return original_torch_load(*args, **kwargs)
+    f = args[0] if args else kwargs.get("f")
+    is_path = isinstance(f, (str, os.PathLike))
+
+    if _options["mmap"] and is_path and "mmap" not in kwargs:
+
+        def load():
+            return _load_mmap(args, kwargs)
+
+    else:
+
+        def load():
+            return original_torch_load(*args, **kwargs)
 
+    extra = (kwargs.get("map_location"), kwargs["weights_only"], kwargs.get("mmap"))
+    return _cached_load(f, "torch", extra, load)
 
-def apply_torch_load_patch():
+
+def _patch_safetensors():
+    try:
+        import safetensors.torch
+    except ImportError:
+        return
+
+    original_load_file = getattr(
+        safetensors.torch, "_original_load_file", safetensors.torch.load_file
+    )
+
+    @functools.wraps(original_load_file)
+    def patched_load_file(filename, device="cpu"):
+        # safetensors.load_file already memory-maps the file
+        return _cached_load(
+            filename,
+            "safetensors",
+            device,
+            lambda: original_load_file(filename, device),
+        )
+
+    safetensors.torch._original_load_file = original_load_file
+    safetensors.torch.load_file = patched_load_file
+
+
+def configure_torch_load(mmap=None, weight_cache_gb=None):
+    """Set the loading options, defaulting to the "torch_load" config section."""
+    if mmap is None or weight_cache_gb is None:
+        from tts_webui.config.config_utils import get_config_value
+
+        if mmap is None:
+            mmap = get_config_value("torch_load", "mmap", False)
+        if weight_cache_gb is None:
+            weight_cache_gb = get_config_value("torch_load", "weight_cache_gb", 0)
+
+    _options["mmap"] = bool(mmap)
+    _options["weight_cache_bytes"] = int(float(weight_cache_gb or 0) * 1024**3)
+    if not _options["weight_cache_bytes"]:
+        weight_cache.clear()
+
+
+def apply_torch_load_patch(mmap=None, weight_cache_gb=None):
     """
     Apply the monkeypatch to torch.load.
     """
+    configure_torch_load(mmap=mmap, weight_cache_gb=weight_cache_gb)
     torch.load = patched_torch_load
     logging.info("Applied monkeypatch to torch.load to always use weights_only=False")
+    if _options["weight_cache_bytes"]:
+        _patch_safetensors()
+        logging.info(
+            f"Caching up to {weight_cache_gb} GB of loaded weights (mmap={_options['mmap']})"
+        )
 
 
 def restore_original_torch_load():
@@ -38,4 +236,11 @@ def restore_original_torch_load():
     Restore the original torch.load function.
     """
     torch.load = original_torch_load
+    try:
+        import safetensors.torch
+
+        if hasattr(safetensors.torch, "_original_load_file"):
+            safetensors.torch.load_file = safetensors.torch._original_load_file
+    except ImportError:
+        pass
     logging.info("Restored original torch.load function")
@@ -0,0 +1,29 @@
+"""
+Process-isolated model workers with shared memory audio transport.
+"""
+
+from tts_webui.workers.model_worker import (
+    ModelWorker,
+    ModelWorkerPool,
+    WorkerError,
+    get_worker_pool,
+    run_in_worker,
+    shutdown_workers,
+)
+from tts_webui.workers.shared_audio import (
+    read_shared_audio,
+    release_segments,
+    write_shared_audio,
+)
+
+__all__ = [
+    "ModelWorker",
+    "ModelWorkerPool",
+    "WorkerError",
+    "get_worker_pool",
+    "read_shared_audio",
+    "release_segments",
+    "run_in_worker",
+    "shutdown_workers",
+    "write_shared_audio",
+]
@@ -0,0 +1,238 @@
+"""
+Model Workers
+
+Long-lived worker processes that run inference functions outside the main
+server process:
+- Targets are "module:function" strings imported inside the worker, so models
+  loaded with manage_model_state stay resident between calls
+- Arrays in results come back through shared memory (see shared_audio); the
+  caller acknowledges a result once it has mapped them
+- A call that gets no answer within the timeout stops the worker
+- A ModelWorkerPool spreads concurrent calls over several processes
+"""
+
+import atexit
+import importlib
+import multiprocessing
+import queue
+import threading
+import traceback
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from tts_webui.workers.shared_audio import (
+    decode_result,
+    encode_result,
+    has_shared_audio,
+    release_segments,
+)
+
+DEFAULT_CALL_TIMEOUT = 600
+
+
+class WorkerError(Exception):
+    """Raised when a worker call fails or the worker process dies."""
+
+
+def _import_target(target: str):
+    module_name, _, function_name = target.partition(":")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def worker_main(conn, target: str):
+    """Entry point of a worker process: serve calls until told to stop."""
+    try:
+        fn = _import_target(target)
+    except Exception:
+        conn.send((False, traceback.format_exc()))
+        return
+    conn.send((True, None))
+
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        if request is None:
+            return
+        args, kwargs = request
+        segments = []
+        try:
+            reply = (True, encode_result(fn(*args, **kwargs), segments))
+        except Exception as e:
+            release_segments(segments, acknowledged=False)
+            reply = (False, f"{type(e).__name__}: {e}\n{traceback.format_exc()}")
+        conn.send(reply)
+        if not segments:
+            continue
+
+        # Keep the segments open until the caller has mapped them
+        try:
+            acknowledged = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            acknowledged = None
+        release_segments(segments, acknowledged=acknowledged is True)
+        if acknowledged is None:
+            return
+
+
+class ModelWorker:
+    """One worker process serving calls to *target*, one at a time."""
+
+    def __init__(
+        self,
+        target: str,
+        start_timeout: float = 120,
+        call_timeout: float = DEFAULT_CALL_TIMEOUT,
+    ):
+        self.target = target
+        self.start_timeout = start_timeout
+        self.call_timeout = call_timeout
+        self._lock = threading.Lock()
+        self._process = None
+        self._conn = None
+
+    def is_alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def start(self):
+        # spawn: CUDA and most model libraries are not fork-safe
+        context = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = context.Pipe()
+        self._process = context.Process(
+            target=worker_main,
+            args=(child_conn, self.target),
+            daemon=True,
+            name=f"model-worker:{self.target}",
+        )
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+
+        if not parent_conn.poll(self.start_timeout):
+            self.stop()
+            raise WorkerError(f"Worker for {self.target} did not start")
+        ok, error = parent_conn.recv()
+        if not ok:
+            self.stop()
+            raise WorkerError(f"Worker for {self.target} failed to start:\n{error}")
+
+    def call(self, *args, **kwargs) -> Any:
+        with self._lock:
+            if not self.is_alive():
+                self.start()
+            try:
+                self._conn.send((args, kwargs))
+                if not self._conn.poll(self.call_timeout):
+                    self.stop(timeout=0)
+                    raise WorkerError(
+                        f"Worker for {self.target} did not answer "
+                        f"within {self.call_timeout} seconds"
+                    )
+                ok, payload = self._conn.recv()
+                if not ok:
+                    raise WorkerError(payload)
+                if not has_shared_audio(payload):
+                    return payload
+                decoded = False
+                try:
+                    result = decode_result(payload)
+                    decoded = True
+                finally:
+                    self._conn.send(decoded)
+                return result
+            except (EOFError, OSError, BrokenPipeError) as e:
+                self.stop()
+                raise WorkerError(f"Worker for {self.target} died: {e}") from e
+
+    def stop(self, timeout: float = 5):
+        if self._conn is not None:
+            try:
+                self._conn.send(None)
+            except (OSError, BrokenPipeError):
+                pass
+            self._conn.close()
+            self._conn = None
+        if self._process is not None:
+            self._process.join(timeout)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process = None
+
+
+class ModelWorkerPool:
+    """Several ModelWorkers for one target; each call uses an idle worker."""
+
+    def __init__(
+        self,
+        target: str,
+        processes: int = 1,
+        call_timeout: float = DEFAULT_CALL_TIMEOUT,
+    ):
+        self.target = target
+        self.workers: List[ModelWorker] = [
+            ModelWorker(target, call_timeout=call_timeout) for _ in range(processes)
+        ]
+        self._idle: "queue.Queue[ModelWorker]" = queue.Queue()
+        for worker in self.workers:
+            self._idle.put(worker)
+
+    @contextmanager
+    def _checkout(self):
+        worker = self._idle.get()
+        try:
+            yield worker
+        finally:
+            self._idle.put(worker)
+
+    def call(self, *args, **kwargs) -> Any:
+        with self._checkout() as worker:
+            return worker.call(*args, **kwargs)
+
+    def start(self):
+        for worker in self.workers:
+            if not worker.is_alive():
+                worker.start()
+
+    def stop(self):
+        for worker in self.workers:
+            worker.stop()
+
+
+_worker_pools: Dict[str, ModelWorkerPool] = {}
+_worker_pools_lock = threading.Lock()
+
+
+def get_worker_pool(target: str, processes: Optional[int] = None) -> ModelWorkerPool:
+    """
+    Get the worker pool for *target*, creating it on first use.
+
+    The number of processes comes from the "model_workers" config section
+    (keyed by target), then *processes*, then 1. Calls time out after
+    "model_workers": {"call_timeout_seconds": 600}.
+    """
+    with _worker_pools_lock:
+        if target not in _worker_pools:
+            from tts_webui.config.config_utils import get_config_value
+
+            count = get_config_value("model_workers", target, processes) or 1
+            call_timeout = get_config_value(
+                "model_workers", "call_timeout_seconds", DEFAULT_CALL_TIMEOUT
+            )
+            _worker_pools[target] = ModelWorkerPool(
+                target, int(count), float(call_timeout)
+            )
+        return _worker_pools[target]
+
+
+def run_in_worker(target: str, *args, **kwargs) -> Any:
+    """Run the "module:function" *target* in a worker process and return its result."""
+    return get_worker_pool(target).call(*args, **kwargs)
+
+
+@atexit.register
+def shutdown_workers():
+    with _worker_pools_lock:
+        for pool in _worker_pools.values():
+            pool.stop()
+        _worker_pools.clear()
@@ -0,0 +1,132 @@
+"""
+Shared Audio
+
+Moves NumPy arrays (PCM audio) between processes through
+multiprocessing.shared_memory segments instead of pickling them:
+- The producer copies the array into a new segment once and sends a small
+  descriptor over the pipe
+- The consumer maps the segment and gets an array backed by it, without copying
+- The producer keeps its handle open until the consumer acknowledges the
+  result (on Windows a segment disappears with its last handle), then
+  releases it; unacknowledged segments are unlinked by the producer, or by
+  the resource tracker if the producer dies
+"""
+
+import os
+import sys
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, List
+
+import numpy as np
+
+DESCRIPTOR_KEY = "__shared_audio__"
+
+
+class _AttachedSharedMemory(shared_memory.SharedMemory):
+    # The mapping must outlive this object: arrays returned by
+    # read_shared_audio() keep it alive and it is unmapped when the last of
+    # them is garbage collected. SharedMemory.__del__ would try to close it
+    # while those arrays still exist.
+    def __del__(self):
+        pass
+
+
+def write_shared_audio(
+    array: np.ndarray, segments: List[shared_memory.SharedMemory]
+) -> Dict[str, Any]:
+    """
+    Copy *array* into a new shared memory segment and return its descriptor.
+
+    The open segment is appended to *segments*; pass them to
+    release_segments() once the reader has mapped them.
+    """
+    array = np.ascontiguousarray(array)
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    segments.append(shm)
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+    return {
+        DESCRIPTOR_KEY: True,
+        "name": shm.name,
+        "shape": list(array.shape),
+        "dtype": array.dtype.str,
+    }
+
+
+def release_segments(
+    segments: List[shared_memory.SharedMemory], acknowledged: bool = True
+):
+    """
+    Close segments written by write_shared_audio().
+
+    Acknowledged segments were unlinked by the reader and only need to be
+    forgotten by the resource tracker; the others are unlinked here.
+    """
+    for shm in segments:
+        shm.close()
+        # On Windows the segment is gone once its last handle is closed
+        if os.name != "posix":
+            continue
+        if not acknowledged:
+            try:
+                shared_memory._posixshmem.shm_unlink(shm._name)  # type: ignore
+            except FileNotFoundError:
+                pass
+        resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore
+    segments.clear()
+
+
+def read_shared_audio(descriptor: Dict[str, Any]) -> np.ndarray:
+    """Map a segment written by write_shared_audio() as an array, without copying."""
+    if sys.version_info >= (3, 13):
+        shm = _AttachedSharedMemory(name=descriptor["name"], track=False)
+    else:
+        shm = _AttachedSharedMemory(name=descriptor["name"])
+    if os.name == "posix":
+        # The mapping stays valid after unlinking; the memory is freed once
+        # unmapped. The writer unregisters the name once acknowledged.
+        shared_memory._posixshmem.shm_unlink(shm._name)  # type: ignore
+        os.close(shm._fd)  # type: ignore
+        shm._fd = -1  # type: ignore
+    return np.ndarray(
+        tuple(descriptor["shape"]), dtype=np.dtype(descriptor["dtype"]), buffer=shm.buf
+    )
+
+
+def is_shared_audio(value) -> bool:
+    return isinstance(value, dict) and value.get(DESCRIPTOR_KEY) is True
+
+
+def encode_result(value, segments: List[shared_memory.SharedMemory]):
+    """
+    Replace numeric arrays inside a result with shared memory descriptors,
+    appending the segments written to *segments*.
+    """
+    if isinstance(value, np.ndarray) and value.dtype.kind in "biuf":
+        return write_shared_audio(value, segments)
+    if isinstance(value, dict):
+        return {k: encode_result(v, segments) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(encode_result(v, segments) for v in value)
+    return value
+
+
+def has_shared_audio(value) -> bool:
+    """Whether a result holds descriptors, i.e. needs to be acknowledged."""
+    if is_shared_audio(value):
+        return True
+    if isinstance(value, dict):
+        return any(has_shared_audio(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(has_shared_audio(v) for v in value)
+    return False
+
+
+def decode_result(value):
+    """Inverse of encode_result(), mapping descriptors back to arrays."""
+    if is_shared_audio(value):
+        return read_shared_audio(value)
+    if isinstance(value, dict):
+        return {k: decode_result(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(decode_result(v) for v in value)
+    return value